@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Any, Dict
+from typing import Iterable, List, Optional, Any, Dict
 from .entities import Question, Vote
 
 class IQuestionRepository(ABC):
@@ -7,6 +7,14 @@ class IQuestionRepository(ABC):
     def get_by_id(self, question_id: int) -> Optional[Question]:
         pass
 
+    def get_many(self, question_ids: List[int]) -> List[Question]:
+        """
+        Returns the questions found for question_ids, in the same order.
+        Implementations should override this to load a page in bulk.
+        """
+        questions = (self.get_by_id(question_id) for question_id in question_ids)
+        return [q for q in questions if q is not None]
+
     @abstractmethod
     def get_by_blockchain_id(self, blockchain_id: int) -> Optional[Question]:
         pass
@@ -28,15 +36,36 @@ class IVoteRepository(ABC):
     def exists(self, transaction_hash: str, log_index: int) -> bool:
         pass
 
+    def add_if_absent(self, vote: Vote) -> bool:
+        """
+        Stores the vote unless its (transaction_hash, log_index) is already known.
+        Returns True if it was inserted. Implementations backed by a unique
+        constraint should override this with a single insert-or-ignore.
+        """
+        if self.exists(vote.transaction_hash, vote.log_index):
+            return False
+        self.save(vote)
+        return True
+
     @abstractmethod
     def get_votes_for_question(self, question_id: int) -> List[Vote]:
         pass
 
+    def get_tallies_for_question(self, question_id: int) -> Dict[int, int]:
+        """
+        Returns the number of votes per choice index of a question.
+        Implementations should override this to count without loading votes.
+        """
+        tallies: Dict[int, int] = {}
+        for vote in self.get_votes_for_question(question_id):
+            tallies[vote.choice_index] = tallies.get(vote.choice_index, 0) + 1
+        return tallies
+
 class IBlockchainGateway(ABC):
     @abstractmethod
-    def fetch_vote_events(self, from_block: int) -> List[Dict[str, Any]]:
+    def fetch_vote_events(self, from_block: int) -> Iterable[Dict[str, Any]]:
         """
-        Returns a list of event data dicts.
+        Returns the event data dicts in chain order (may be streamed; iterate once).
         Each dict should contain: question_id, choice_index, voter, tx_hash, block_number, log_index
         """
         pass
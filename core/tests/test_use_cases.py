@@ -2,7 +2,7 @@
 Tests unitarios para Use Cases de Clean Architecture
 
 Estos tests validan la lógica de negocio pura sin dependencias de Django.
-Utilizan implementaciones in-memory de los repositorios.
+Utilizan los repositorios in-memory de polls.adapters.memory.
 """
 
 from django.test import TestCase
@@ -11,53 +11,7 @@ from core.domain.entities import Question, Choice, Vote
 from core.use_cases.sync import SyncVotesUseCase
 from core.use_cases.voting import GetQuestionResultsUseCase
 from polls.adapters.blockchain import MockBlockchainGateway
-
-
-class InMemoryQuestionRepository:
-    """Repositorio de preguntas en memoria para testing"""
-    
-    def __init__(self):
-        self.questions = {}
-        self._next_id = 1
-    
-    def get_by_id(self, question_id: int):
-        return self.questions.get(question_id)
-    
-    def get_by_blockchain_id(self, blockchain_id: int):
-        for q in self.questions.values():
-            if q.blockchain_id == blockchain_id:
-                return q
-        return None
-    
-    def save(self, question):
-        if question.id is None:
-            question.id = self._next_id
-            self._next_id += 1
-        self.questions[question.id] = question
-        return question
-    
-    def get_pending_sync(self):
-        return [q for q in self.questions.values() if not q.is_synced]
-
-
-class InMemoryVoteRepository:
-    """Repositorio de votos en memoria para testing"""
-    
-    def __init__(self):
-        self.votes = []
-    
-    def exists(self, tx_hash: str, log_index: int):
-        return any(
-            v.transaction_hash == tx_hash and v.log_index == log_index 
-            for v in self.votes
-        )
-    
-    def save(self, vote):
-        self.votes.append(vote)
-        return vote
-    
-    def get_votes_for_question(self, question_id: int):
-        return [v for v in self.votes if v.question_id == question_id]
+from polls.adapters.memory import InMemoryQuestionRepository, InMemoryVoteRepository
 
 
 class TestSyncVotesUseCase(TestCase):
@@ -147,6 +101,7 @@ class TestSyncVotesUseCase(TestCase):
         # Assert
         assert count == 0, "No debe crear votos sin pregunta asociada"
         assert len(vote_repo.votes) == 0, "No debe haber votos"
+        assert use_case.first_skipped_block == 1, "Debe indicar desde qué bloque releer"
     
     def test_sync_votes_multiple_events(self):
         """Test sincronización de múltiples eventos"""
@@ -174,6 +129,7 @@ class TestSyncVotesUseCase(TestCase):
         # Assert
         assert count == 3, "Debe sincronizar 3 votos"
         assert len(vote_repo.votes) == 3, "Debe haber 3 votos"
+        assert use_case.first_skipped_block is None, "No se omitió ningún voto"
     
     def test_sync_votes_from_specific_block(self):
         """Test sincronización desde un bloque específico"""
@@ -202,6 +158,83 @@ class TestSyncVotesUseCase(TestCase):
         assert count == 2, "Debe sincronizar solo votos desde bloque 2"
 
 
+class TestInMemoryRepositories(TestCase):
+    """Tests para los índices de los repositorios in-memory"""
+
+    def test_blockchain_id_index_follows_resave(self):
+        """Test que el índice por blockchain_id se actualiza al volver a guardar"""
+        # Arrange
+        repo = InMemoryQuestionRepository()
+        question = repo.save(Question(id=None, text="Q", pub_date=datetime.now()))
+
+        # Act
+        question.blockchain_id = 7
+        question.is_synced = True
+        repo.save(question)
+        question.blockchain_id = 8
+        repo.save(question)
+
+        # Assert
+        assert question.id == 1
+        assert repo.get_by_blockchain_id(7) is None
+        assert repo.get_by_blockchain_id(8) is question
+        assert repo.get_pending_sync() == []
+
+    def test_pending_sync_keeps_insertion_order(self):
+        """Test que las preguntas pendientes se devuelven en orden de creación"""
+        # Arrange
+        repo = InMemoryQuestionRepository()
+        first = repo.save(Question(id=None, text="A", pub_date=datetime.now()))
+        repo.save(Question(id=None, text="B", pub_date=datetime.now(), is_synced=True))
+        third = repo.save(Question(id=None, text="C", pub_date=datetime.now()))
+
+        # Act & Assert
+        assert repo.get_pending_sync() == [first, third]
+        assert repo.get_many([3, 99, 1]) == [third, first]
+
+    def test_vote_identity_and_question_index(self):
+        """Test que add_if_absent usa la identidad (tx_hash, log_index)"""
+        # Arrange
+        repo = InMemoryVoteRepository()
+        vote = Vote(question_id=1, choice_index=0, voter_address="0xa",
+                    transaction_hash="0x1", block_number=1, log_index=0)
+
+        # Act
+        inserted = [
+            repo.add_if_absent(vote),
+            repo.add_if_absent(Vote(**{**vote.__dict__})),
+            repo.add_if_absent(Vote(**{**vote.__dict__, 'log_index': 1, 'question_id': 2})),
+        ]
+
+        # Assert
+        assert inserted == [True, False, True]
+        assert repo.exists("0x1", 1)
+        assert repo.count_for_question(1) == 1
+        assert [v.log_index for v in repo.get_votes_for_question(2)] == [1]
+        assert len(repo) == 2
+
+    def test_sync_at_scale(self):
+        """Test que la sincronización de muchos eventos no depende de escaneos lineales"""
+        # Arrange
+        mock_gateway = MockBlockchainGateway()
+        question_repo = InMemoryQuestionRepository()
+        vote_repo = InMemoryVoteRepository()
+        for blockchain_id in range(50):
+            question_repo.save(Question(id=None, text=f"Q{blockchain_id}", pub_date=datetime.now(),
+                                        blockchain_id=blockchain_id, is_synced=True))
+        for i in range(5000):
+            mock_gateway.add_mock_vote_event(i % 50, i % 3, f"0x{i:x}", tx_hash=f"0x{i:064x}")
+        use_case = SyncVotesUseCase(vote_repo, question_repo, mock_gateway)
+
+        # Act
+        first = use_case.execute(from_block=0)
+        second = use_case.execute(from_block=0)
+
+        # Assert
+        assert (first, second) == (5000, 0)
+        assert vote_repo.count_for_question(question_repo.get_by_blockchain_id(0).id) == 100
+
+
 class TestGetQuestionResultsUseCase(TestCase):
     """Tests para el caso de uso de obtención de resultados"""
     
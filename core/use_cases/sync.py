@@ -1,4 +1,4 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import logging
 from core.domain.interfaces import IVoteRepository, IQuestionRepository, IBlockchainGateway
 from core.domain.entities import Vote
@@ -13,16 +13,23 @@ class SyncVotesUseCase:
         self.vote_repo = vote_repo
         self.question_repo = question_repo
         self.blockchain_gateway = blockchain_gateway
+        # Lowest block of the last run holding a vote for a question not mirrored locally yet
+        self.first_skipped_block: Optional[int] = None
 
     def execute(self, from_block: int = 0) -> int:
         """
         Syncs votes from blockchain starting from from_block.
-        Returns the number of new votes synced.
+        Returns the number of new votes synced. Votes for questions not yet
+        mirrored locally are skipped; first_skipped_block then holds the
+        block a later run must resume from to pick them up.
         """
         logger.info(f"Starting vote sync from block {from_block}")
+        self.first_skipped_block = None
 
         events = self.blockchain_gateway.fetch_vote_events(from_block)
         new_votes_count = 0
+        # Local question per blockchain ID, resolved once per run
+        questions = {}
 
         for event in events:
             # Event data expected:
@@ -31,16 +38,17 @@ class SyncVotesUseCase:
             tx_hash = event['tx_hash']
             log_index = event['log_index']
 
-            # Idempotency check
-            if self.vote_repo.exists(tx_hash, log_index):
-                logger.debug(f"Vote {tx_hash}-{log_index} already exists. Skipping.")
-                continue
-
             blockchain_question_id = event['question_id']
-            question = self.question_repo.get_by_blockchain_id(blockchain_question_id)
+            if blockchain_question_id not in questions:
+                questions[blockchain_question_id] = self.question_repo.get_by_blockchain_id(blockchain_question_id)
+                if not questions[blockchain_question_id]:
+                    logger.warning(f"Question with blockchain ID {blockchain_question_id} not found locally. Skipping vote.")
+            question = questions[blockchain_question_id]
 
             if not question:
-                logger.warning(f"Question with blockchain ID {blockchain_question_id} not found locally. Skipping vote.")
+                block_number = event['block_number']
+                if self.first_skipped_block is None or block_number < self.first_skipped_block:
+                    self.first_skipped_block = block_number
                 continue
 
             vote = Vote(
@@ -52,7 +60,11 @@ class SyncVotesUseCase:
                 log_index=log_index
             )
 
-            self.vote_repo.save(vote)
+            # Idempotency: insert-or-ignore on the (tx_hash, log_index) identity
+            if not self.vote_repo.add_if_absent(vote):
+                logger.debug(f"Vote {tx_hash}-{log_index} already exists. Skipping.")
+                continue
+
             new_votes_count += 1
             logger.info(f"Synced new vote for Question {question.id} from {event['voter']}")
 
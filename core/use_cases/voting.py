@@ -12,25 +12,12 @@ class GetQuestionResultsUseCase:
         if not question:
             raise ValueError(f"Question {question_id} not found")
 
-        votes = self.vote_repo.get_votes_for_question(question_id)
+        # Counts per choice index, without loading every vote
+        tallies = self.vote_repo.get_tallies_for_question(question_id)
 
-        # Aggregate results
-        # Initialize counts
-        results = {choice.id: 0 for choice in question.choices} if question.choices else {}
-        # We might need to handle choice by index if ID is not available or consistent
-
-        # If choices are just strings in the entity or handled by index in blockchain
-        # The blockchain uses index.
-
-        # Let's map choice index to choice text/object
-        choice_map = {i: c for i, c in enumerate(question.choices)}
-        vote_counts = {i: 0 for i in range(len(question.choices))}
-
-        total_votes = 0
-        for vote in votes:
-            if vote.choice_index in vote_counts:
-                vote_counts[vote.choice_index] += 1
-                total_votes += 1
+        # The blockchain identifies choices by index
+        vote_counts = {i: tallies.get(i, 0) for i in range(len(question.choices))}
+        total_votes = sum(vote_counts.values())
 
         # Format output
         formatted_choices = []
@@ -14,6 +14,8 @@ from pathlib import Path
 import os
 from dotenv import load_dotenv
 
+from .database import database_config, sqlite_profile
+
 load_dotenv()
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -53,6 +55,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'polls.routing.ReadYourWritesMiddleware',
+    'polls.metrics.QueryTimingMiddleware',
 ]
 
 ROOT_URLCONF = 'encuestas.urls'
@@ -79,13 +83,32 @@ WSGI_APPLICATION = 'encuestas.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
+# Profiles are built from the environment (see encuestas/database.py):
+# DATABASE_URL for PostgreSQL, otherwise a tuned single-node SQLite file.
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'encuestas_db.sqlite3',
-    }
+    'default': database_config(os.environ, BASE_DIR / 'encuestas_db.sqlite3'),
 }
 
+# Read replicas (see polls/routing.py). DATABASE_REPLICA_URLS takes
+# comma-separated database URLs; DATABASE_REPLICA_PATHS takes SQLite files that
+# are copies of the primary, refreshed with `manage.py refresh_sqlite_replicas`.
+DATABASE_REPLICAS = []
+_replica_configs = [
+    database_config(os.environ, None, url=url.strip())
+    for url in os.getenv('DATABASE_REPLICA_URLS', '').split(',') if url.strip()
+] + [
+    sqlite_profile(path.strip(), os.environ)
+    for path in os.getenv('DATABASE_REPLICA_PATHS', '').split(',') if path.strip()
+]
+for _index, _config in enumerate(_replica_configs, start=1):
+    DATABASES[f'replica{_index}'] = {**_config, 'TEST': {'MIRROR': 'default'}}
+    DATABASE_REPLICAS.append(f'replica{_index}')
+
+DATABASE_ROUTERS = ['polls.routing.PrimaryReplicaRouter']
+
+# Seconds a client reads from the primary after writing (e.g. voting)
+READ_YOUR_WRITES_SECONDS = int(os.getenv('READ_YOUR_WRITES_SECONDS', '10'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -140,3 +163,17 @@ LOGOUT_REDIRECT_URL = '/'
 # Blockchain Configuration
 BLOCKCHAIN_PRIVATE_KEY = os.getenv('BLOCKCHAIN_PRIVATE_KEY', '0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80')
 BLOCKCHAIN_CONTRACT_ADDRESS = os.getenv('BLOCKCHAIN_CONTRACT_ADDRESS', '0x5FbDB2315678afecb367f032d93F642f64180aa3')
+
+# Cold storage for votes of closed questions (see polls/blockchain/archive.py)
+VOTE_ARCHIVE_DIR = os.getenv('VOTE_ARCHIVE_DIR', str(BASE_DIR / 'var' / 'vote_archive'))
+
+# On-disk cache of fetched VoteCast logs, on by default; set it empty to disable
+# (see polls/blockchain/logstore.py)
+VOTE_LOG_DIR = os.getenv('VOTE_LOG_DIR', str(BASE_DIR / 'var' / 'vote_logs'))
+
+# Admin bulk actions run in a background thread; set to False to run them inline
+# (see polls/blockchain/jobs.py)
+BLOCKCHAIN_JOBS_BACKGROUND = os.getenv('BLOCKCHAIN_JOBS_BACKGROUND', 'true').lower() == 'true'
+
+# Optional bearer token required by /metrics (see polls/metrics.py)
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
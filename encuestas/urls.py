@@ -16,10 +16,12 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import include, path
+from polls.metrics import metrics_view
 from . import views
 
 urlpatterns = [
     path('polls/', include('polls.urls')),
     path('admin/', admin.site.urls),
+    path('metrics', metrics_view, name='metrics'),
     path('', views.index, name='index'),
 ]
\ No newline at end of file
@@ -1,14 +1,23 @@
-from typing import List, Dict, Any
+from typing import Iterable, List, Dict, Any, Optional
 import logging
 from django.conf import settings
 from core.domain.interfaces import IBlockchainGateway
 from polls.blockchain.config import get_web3, get_contract, is_web3_connected, web3_manager
+from polls.blockchain.fees import fee_oracle, create_question_gas_key
+from polls.blockchain.receipts import receipt_tracker
+from polls.blockchain.services import send_contract_transaction
+from polls.blockchain.logstore import SegmentedLogStore, fetch_with_cache, vote_log_dir
+from web3.exceptions import BlockNotFound
 
 logger = logging.getLogger(__name__)
 
 class Web3BlockchainGateway(IBlockchainGateway):
-    def __init__(self):
-        pass
+    def __init__(self, log_store: Optional[SegmentedLogStore] = None):
+        # VoteCast logs are cached on disk per contract unless VOTE_LOG_DIR is empty
+        directory = vote_log_dir()
+        if log_store is None and directory is not None:
+            log_store = SegmentedLogStore(directory / settings.BLOCKCHAIN_CONTRACT_ADDRESS.lower())
+        self.log_store = log_store
 
     @property
     def web3(self):
@@ -21,33 +30,46 @@ class Web3BlockchainGateway(IBlockchainGateway):
     def _is_available(self):
         return is_web3_connected() and self.contract is not None
 
-    def fetch_vote_events(self, from_block: int) -> List[Dict[str, Any]]:
+    def _get_vote_logs(self, from_block: int, to_block: Optional[int] = None) -> List[Dict[str, Any]]:
+        events = self.contract.events.VoteCast().get_logs(from_block=from_block, to_block=to_block)
+        return [{
+            'question_id': event['args']['questionId'],
+            'choice_index': event['args']['choiceIndex'],
+            'voter': event['args']['voter'],
+            'tx_hash': event['transactionHash'].hex(),
+            'block_number': event['blockNumber'],
+            'log_index': event['logIndex']
+        } for event in events]
+
+    def _block_hash(self, block_number: int) -> Optional[str]:
+        try:
+            return self.web3.eth.get_block(block_number)['hash'].hex()
+        except BlockNotFound:
+            return None
+
+    def fetch_vote_events(self, from_block: int) -> Iterable[Dict[str, Any]]:
         if not self._is_available():
             logger.warning("Blockchain not available for fetching events")
             return []
 
         try:
-            # Fetch logs
-            # We use get_logs from the contract event
-            events = self.contract.events.VoteCast().get_logs(fromBlock=from_block)
-
-            results = []
-            for event in events:
-                results.append({
-                    'question_id': event['args']['questionId'],
-                    'choice_index': event['args']['choiceIndex'],
-                    'voter': event['args']['voter'],
-                    'tx_hash': event['transactionHash'].hex(),
-                    'block_number': event['blockNumber'],
-                    'log_index': event['logIndex']
-                })
-
-            logger.info(f"Fetched {len(results)} vote events from block {from_block}")
-            return results
+            if self.log_store is None:
+                results = self._get_vote_logs(from_block)
+                logger.info(f"Fetched {len(results)} vote events from block {from_block}")
+                return results
+
+            # Served from disk (streamed as consumed); only blocks the store lacks hit the node.
+            # A store left by another chain or deployment at this address is discarded first.
+            logger.info(f"Fetching vote events from block {from_block} through the log cache")
+            return fetch_with_cache(
+                self.log_store, from_block, self.web3.eth.block_number, self._get_vote_logs,
+                chain_id=self.web3.eth.chain_id, block_hash=self._block_hash,
+            )
 
         except Exception as e:
+            # Raise rather than return []: the sync checkpoint must not advance past a failed fetch
             logger.error(f"Error fetching vote events: {e}")
-            return []
+            raise
 
     def create_question(self, text: str, choices: List[str]) -> Dict[str, Any]:
         if not self._is_available():
@@ -66,26 +88,16 @@ class Web3BlockchainGateway(IBlockchainGateway):
         try:
             default_account = web3_manager.get_default_account()
 
-            # Build transaction
-            transaction = self.contract.functions.createQuestion(
-                text,
-                choices
-            ).build_transaction({
-                'from': default_account,
-                'gas': 2000000,
-                'gasPrice': self.web3.eth.gas_price,
-                'nonce': self.web3.eth.get_transaction_count(default_account),
-            })
-
-            # Sign and send (using Hardhat account #0 private key for dev)
-            private_key = getattr(settings, 'BLOCKCHAIN_PRIVATE_KEY', "0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80")
-            signed_txn = self.web3.eth.account.sign_transaction(
-                transaction,
-                private_key=private_key
+            gas_key = create_question_gas_key(text, choices)
+            # Same send path as the voting service: shared nonce allocator, release on failure
+            tx_hash = send_contract_transaction(
+                self.web3,
+                self.contract.functions.createQuestion(text, choices),
+                default_account,
+                fee_oracle.gas_limit(gas_key),
             )
-
-            tx_hash = self.web3.eth.send_raw_transaction(signed_txn.rawTransaction)
-            receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = receipt_tracker.wait(tx_hash)
+            fee_oracle.record_gas_used(gas_key, receipt['gasUsed'], receipt.get('status', 1))
 
             # Extract ID
             question_created_events = self.contract.events.QuestionCreated().process_receipt(receipt)
@@ -0,0 +1,115 @@
+"""
+In-memory repositories with hash indexes
+
+Drop-in ``IQuestionRepository`` / ``IVoteRepository`` implementations that
+keep every lookup the use cases make O(1): questions are indexed by id and
+blockchain id, votes by their ``(transaction_hash, log_index)`` identity and
+by question. They back the use-case tests, serve as a cache tier in front of
+a slower store and let ``SyncVotesUseCase`` be benchmarked at millions of
+events without a database.
+
+Entities are stored by reference (re-save a question after changing its
+blockchain id or sync state so the indexes follow). Writes take a lock so
+one repository can be shared between threads.
+"""
+
+from collections import Counter
+from typing import Dict, List, Optional, Set, Tuple
+import threading
+
+from core.domain.entities import Question, Vote
+from core.domain.interfaces import IQuestionRepository, IVoteRepository
+
+
+class InMemoryQuestionRepository(IQuestionRepository):
+    """Questions indexed by id and blockchain id"""
+
+    def __init__(self):
+        self.questions: Dict[int, Question] = {}
+        self._by_blockchain_id: Dict[int, int] = {}
+        # Blockchain id each question was indexed under, to re-key on save
+        self._indexed_blockchain_id: Dict[int, Optional[int]] = {}
+        # Insertion-ordered set of unsynced question ids
+        self._pending: Dict[int, None] = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def get_by_id(self, question_id: int) -> Optional[Question]:
+        return self.questions.get(question_id)
+
+    def get_many(self, question_ids: List[int]) -> List[Question]:
+        questions = self.questions
+        return [questions[pk] for pk in question_ids if pk in questions]
+
+    def get_by_blockchain_id(self, blockchain_id: int) -> Optional[Question]:
+        question_id = self._by_blockchain_id.get(blockchain_id)
+        return self.questions.get(question_id) if question_id is not None else None
+
+    def save(self, question: Question) -> Question:
+        with self._lock:
+            if question.id is None:
+                question.id = self._next_id
+            self._next_id = max(self._next_id, question.id + 1)
+            self.questions[question.id] = question
+
+            previous = self._indexed_blockchain_id.get(question.id)
+            if previous is not None and previous != question.blockchain_id:
+                self._by_blockchain_id.pop(previous, None)
+            if question.blockchain_id is not None:
+                self._by_blockchain_id[question.blockchain_id] = question.id
+            self._indexed_blockchain_id[question.id] = question.blockchain_id
+
+            if question.is_synced:
+                self._pending.pop(question.id, None)
+            else:
+                self._pending[question.id] = None
+        return question
+
+    def get_pending_sync(self) -> List[Question]:
+        return [self.questions[pk] for pk in list(self._pending)]
+
+    def __len__(self):
+        return len(self.questions)
+
+
+class InMemoryVoteRepository(IVoteRepository):
+    """Votes indexed by ``(transaction_hash, log_index)`` and by question"""
+
+    def __init__(self):
+        self.votes: List[Vote] = []
+        self._identities: Set[Tuple[str, int]] = set()
+        self._by_question: Dict[int, List[Vote]] = {}
+        self._lock = threading.Lock()
+
+    def _store(self, vote: Vote):
+        self.votes.append(vote)
+        self._identities.add((vote.transaction_hash, vote.log_index))
+        self._by_question.setdefault(vote.question_id, []).append(vote)
+
+    def save(self, vote: Vote) -> Vote:
+        with self._lock:
+            self._store(vote)
+        return vote
+
+    def exists(self, transaction_hash: str, log_index: int) -> bool:
+        return (transaction_hash, log_index) in self._identities
+
+    def add_if_absent(self, vote: Vote) -> bool:
+        # Check and insert under one lock, like the database's ON CONFLICT
+        with self._lock:
+            if (vote.transaction_hash, vote.log_index) in self._identities:
+                return False
+            self._store(vote)
+        return True
+
+    def get_votes_for_question(self, question_id: int) -> List[Vote]:
+        return list(self._by_question.get(question_id, ()))
+
+    def get_tallies_for_question(self, question_id: int) -> Dict[int, int]:
+        return dict(Counter(v.choice_index for v in self._by_question.get(question_id, ())))
+
+    def count_for_question(self, question_id: int) -> int:
+        return len(self._by_question.get(question_id, ()))
+
+    def __len__(self):
+        return len(self.votes)
@@ -1,35 +1,46 @@
-from typing import List, Optional
+from typing import Dict, List, Optional, Set, Tuple
+from django.core.exceptions import ObjectDoesNotExist
 from django.db import transaction
+from django.db.models import Count, Prefetch
+from django.utils import timezone
 from core.domain.interfaces import IQuestionRepository, IVoteRepository
 from core.domain.entities import Question as QuestionEntity, Vote as VoteEntity, Choice as ChoiceEntity
-from polls.blockchain.models import BlockchainQuestion, BlockchainVote, BlockchainChoice
-from polls.models import Question as DjangoQuestion
+from polls.blockchain.archive import archived_event_keys, archived_tallies, iter_archived_votes
+from polls.blockchain.models import BlockchainQuestion, BlockchainVote, BlockchainChoice, VoteArchive
+from polls.models import Question as DjangoQuestion, Choice as DjangoChoice
+from polls.metrics import VOTES_INGESTED, record_cache
 
 class DjangoQuestionRepository(IQuestionRepository):
+    """
+    Loads both question kinds through the base ``Question`` table
+
+    The ``BlockchainQuestion`` child row is joined with ``select_related`` and
+    choices are prefetched, so any number of entities costs two queries.
+    Reads follow the caller's routing: the sync path reads the primary, and
+    only views wrapped in ``read_only_view`` reach a replica.
+    """
+
+    def _queryset(self):
+        return DjangoQuestion.objects.select_related('blockchainquestion').prefetch_related(
+            Prefetch('choice_set', queryset=DjangoChoice.objects.order_by('ordinal', 'pk'))
+        )
+
     def get_by_id(self, question_id: int) -> Optional[QuestionEntity]:
-        try:
-            # Try to get as BlockchainQuestion first
-            q = BlockchainQuestion.objects.get(pk=question_id)
+        for q in self._queryset().filter(pk=question_id):
             return self._to_entity(q)
-        except BlockchainQuestion.DoesNotExist:
-            try:
-                # Fallback to standard Question
-                q = DjangoQuestion.objects.get(pk=question_id)
-                # Check if it's actually a BlockchainQuestion instance but we caught exception because of how get works?
-                # No, standard get on Child model raises DoesNotExist if record is only in Parent table (unlikely)
-                # or if record doesn't exist.
-                # If we are here, it might be a plain Question.
-                # We can return a QuestionEntity with no blockchain info.
-                return self._to_entity(q)
-            except DjangoQuestion.DoesNotExist:
-                return None
+        return None
+
+    def get_many(self, question_ids: List[int]) -> List[QuestionEntity]:
+        ids = list(question_ids)
+        if not ids:
+            return []
+        by_id = {q.pk: q for q in self._queryset().filter(pk__in=ids)}
+        return [self._to_entity(by_id[pk]) for pk in ids if pk in by_id]
 
     def get_by_blockchain_id(self, blockchain_id: int) -> Optional[QuestionEntity]:
-        try:
-            q = BlockchainQuestion.objects.get(blockchain_id=blockchain_id)
+        for q in self._queryset().filter(blockchainquestion__blockchain_id=blockchain_id)[:1]:
             return self._to_entity(q)
-        except BlockchainQuestion.DoesNotExist:
-            return None
+        return None
 
     @transaction.atomic
     def save(self, question: QuestionEntity) -> QuestionEntity:
@@ -75,37 +86,48 @@ class DjangoQuestionRepository(IQuestionRepository):
         return question
 
     def get_pending_sync(self) -> List[QuestionEntity]:
-        qs = BlockchainQuestion.objects.pending_blockchain_sync()
+        qs = self._queryset().filter(
+            blockchainquestion__use_blockchain=True,
+            blockchainquestion__is_blockchain_synced=False
+        ).order_by('-pub_date')
         return [self._to_entity(q) for q in qs]
 
+    @staticmethod
+    def _blockchain_part(model) -> Optional[BlockchainQuestion]:
+        """Child row of a base Question (already joined, so no query)"""
+        if isinstance(model, BlockchainQuestion):
+            return model
+        try:
+            return model.blockchainquestion
+        except ObjectDoesNotExist:
+            return None
+
     def _to_entity(self, model) -> QuestionEntity:
         # Handle both BlockchainQuestion and regular Question
-        is_blockchain = isinstance(model, BlockchainQuestion) or hasattr(model, 'blockchainquestion')
-
-        if hasattr(model, 'blockchainquestion'):
-            model = model.blockchainquestion
-            is_blockchain = True
+        bq = self._blockchain_part(model)
 
         choices = [
             ChoiceEntity(id=c.id, text=c.choice_text, votes=c.votes)
             for c in model.choice_set.all()
         ]
 
-        blockchain_id = model.blockchain_id if is_blockchain else None
-        is_synced = model.is_blockchain_synced if is_blockchain else False
-        tx_hash = model.blockchain_tx_hash if is_blockchain else None
-
         return QuestionEntity(
             id=model.id,
             text=model.question_text,
             pub_date=model.pub_date,
             choices=choices,
-            blockchain_id=blockchain_id,
-            is_synced=is_synced,
-            tx_hash=tx_hash
+            blockchain_id=bq.blockchain_id if bq else None,
+            is_synced=bq.is_blockchain_synced if bq else False,
+            tx_hash=bq.blockchain_tx_hash if bq else None
         )
 
 class DjangoVoteRepository(IVoteRepository):
+    def __init__(self, using: Optional[str] = None):
+        # Explicit alias for writes (benchmarks); None lets the router decide
+        self.using = using
+        self._archived_blocks = {}
+        self._archived_event_keys = {}
+
     @transaction.atomic
     def save(self, vote: VoteEntity) -> VoteEntity:
         # Find related question
@@ -129,17 +151,80 @@ class DjangoVoteRepository(IVoteRepository):
         )
         return vote
 
+    def add_if_absent(self, vote: VoteEntity) -> bool:
+        """
+        Single-statement insert-or-ignore against the ``uniq_vote_event``
+        constraint (and one-vote-per-address); safe under concurrent syncs.
+        Events already moved to cold storage are not inserted again; a
+        late-synced event in the archived block range still is.
+        """
+        if vote.block_number is not None and vote.block_number <= self._archived_through(vote.question_id):
+            if (vote.transaction_hash, vote.log_index) in self._archived_keys(vote.question_id):
+                return False
+        inserted = BlockchainVote.objects.db_manager(self.using).insert_if_absent(
+            question=vote.question_id,
+            choice_index=vote.choice_index,
+            voter_address=vote.voter_address,
+            transaction_hash=vote.transaction_hash,
+            block_number=vote.block_number,
+            log_index=vote.log_index,
+            timestamp=vote.timestamp or timezone.now(),
+        )
+        if inserted:
+            VOTES_INGESTED.inc()
+        return inserted
+
+    def _archived_through(self, question_id: int) -> int:
+        """Highest archived block of a question (-1 if none), cached per repository"""
+        record_cache('archived_blocks', question_id in self._archived_blocks)
+        if question_id not in self._archived_blocks:
+            last_block = VoteArchive.objects.db_manager(self.using).filter(
+                question_id=question_id
+            ).values_list('last_block', flat=True).first()
+            self._archived_blocks[question_id] = -1 if last_block is None else last_block
+        return self._archived_blocks[question_id]
+
+    def _archived_keys(self, question_id: int) -> Set[Tuple[str, int]]:
+        """Event keys of a question's archive, read once per repository (only for replays)"""
+        if question_id not in self._archived_event_keys:
+            self._archived_event_keys[question_id] = archived_event_keys(question_id)
+        return self._archived_event_keys[question_id]
+
     def exists(self, transaction_hash: str, log_index: int) -> bool:
         return BlockchainVote.objects.filter(
             transaction_hash=transaction_hash,
             log_index=log_index
         ).exists()
 
+    def get_tallies_for_question(self, question_id: int) -> Dict[int, int]:
+        # Archive counters plus one GROUP BY over the hot rows; the file stays closed
+        tallies = archived_tallies(question_id)
+        hot = BlockchainVote.objects.filter(question_id=question_id).values('choice_index').annotate(
+            n=Count('pk')
+        ).order_by()
+        for row in hot:
+            tallies[row['choice_index']] = tallies.get(row['choice_index'], 0) + row['n']
+        return tallies
+
     def get_votes_for_question(self, question_id: int) -> List[VoteEntity]:
+        # Every vote, archived ones decompressed first: for export, audit and
+        # restore; results go through get_tallies_for_question
+        archived = [
+            VoteEntity(
+                question_id=question_id,
+                choice_index=r['choice_index'],
+                voter_address=r['voter_address'],
+                transaction_hash=r['transaction_hash'],
+                block_number=r['block_number'] or 0,
+                log_index=r['log_index'],
+                timestamp=r['timestamp']
+            )
+            for r in iter_archived_votes(question_id)
+        ]
         votes = BlockchainVote.objects.filter(question_id=question_id)
-        return [
+        return archived + [
             VoteEntity(
-                question_id=v.question.id,
+                question_id=v.question_id,
                 choice_index=v.choice_index,
                 voter_address=v.voter_address,
                 transaction_hash=v.transaction_hash,
@@ -147,5 +232,6 @@ class DjangoVoteRepository(IVoteRepository):
                 log_index=v.log_index,
                 timestamp=v.timestamp
             )
-            for v in votes
+            # Streams (server-side cursor on PostgreSQL) instead of caching rows
+            for v in votes.iterator(chunk_size=2000)
         ]
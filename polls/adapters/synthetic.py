@@ -0,0 +1,78 @@
+"""
+Synthetic chain gateway for benchmarks
+
+``SyntheticChainGateway`` plays back a deterministic ``VoteCast`` history of
+any size without a node: ``events`` votes spread over ``questions`` questions
+(blockchain ids ``first_question_id`` onwards) with ``choices`` options each,
+``events_per_block`` logs per block. The same seed always yields the same
+chain, so benchmark runs are comparable.
+
+Events are generated lazily by ``fetch_vote_events`` instead of being held
+in a list, so a benchmark's peak memory is the use case's own footprint and
+not the fixture's. Every event has a distinct voter and transaction hash.
+"""
+
+from typing import Any, Dict, Iterator, List
+import hashlib
+import random
+
+from core.domain.interfaces import IBlockchainGateway
+
+
+class SyntheticChainGateway(IBlockchainGateway):
+    """Deterministic, generated VoteCast history"""
+
+    def __init__(self, events: int, questions: int, choices: int = 4,
+                 events_per_block: int = 10, seed: int = 0, first_question_id: int = 0):
+        if events < 0 or questions < 1 or choices < 1 or events_per_block < 1:
+            raise ValueError("events must be >= 0 and questions, choices, events_per_block >= 1")
+        self.events = events
+        self.questions = questions
+        self.choices = choices
+        self.events_per_block = events_per_block
+        self.seed = seed
+        self.first_question_id = first_question_id
+        self._created = 0
+
+    def fetch_vote_events(self, from_block: int) -> Iterator[Dict[str, Any]]:
+        rng = random.Random(self.seed)
+        first, questions, choices, per_block = (
+            self.first_question_id, self.questions, self.choices, self.events_per_block
+        )
+        for number in range(self.events):
+            # Draw for every event so the chain does not depend on from_block
+            question_id, choice_index = rng.randrange(questions), rng.randrange(choices)
+            block_number = number // per_block
+            if block_number < from_block:
+                continue
+            yield {
+                'question_id': first + question_id,
+                'choice_index': choice_index,
+                'voter': f"0x{number:040x}",
+                'tx_hash': f"0x{number:064x}",
+                'block_number': block_number,
+                'log_index': number % per_block,
+            }
+
+    def question_ids(self) -> range:
+        """Blockchain ids of the questions the votes go to"""
+        return range(self.first_question_id, self.first_question_id + self.questions)
+
+    def expected_tallies(self) -> Dict[int, List[int]]:
+        """Votes per choice of every question, as the contract would report them"""
+        tallies = {question_id: [0] * self.choices for question_id in self.question_ids()}
+        for event in self.fetch_vote_events(0):
+            tallies[event['question_id']][event['choice_index']] += 1
+        return tallies
+
+    def create_question(self, text: str, choices: List[str]) -> Dict[str, Any]:
+        question_id = self.first_question_id + self.questions + self._created
+        self._created += 1
+        return {
+            "success": True,
+            "question_id": question_id,
+            "transaction_hash": "0x" + hashlib.sha256(f"{self.seed}:{question_id}".encode()).hexdigest(),
+        }
+
+    def get_current_block_number(self) -> int:
+        return max(0, (self.events - 1) // self.events_per_block)
@@ -42,6 +42,7 @@ class QuestionAdmin(admin.ModelAdmin):
 @admin.register(Choice)
 class ChoiceAdmin(admin.ModelAdmin):
     list_display = ('choice_text', 'question', 'votes')
+    list_select_related = ['question']
     list_filter = ['question']
     search_fields = ['choice_text']
 
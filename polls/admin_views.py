@@ -4,18 +4,17 @@ from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
 from django.utils import timezone
 from django.db import models
-from .models import Question, Choice
+from .models import Question, Choice, QuestionListing
+from .blockchain.maintenance import purge_question
 
 def admin_dashboard(request):
     """Vista personalizada del dashboard administrativo"""
-    questions = Question.objects.all().order_by('-pub_date')
+    questions = QuestionListing.objects.order_by('-pub_date')
     
-    # Estadísticas generales
-    total_questions = questions.count()
-    total_votes = 0
-    for q in questions:
-        for choice in q.choice_set.all():
-            total_votes += choice.votes
+    # Estadísticas generales (tabla de listado desnormalizada)
+    stats = questions.aggregate(total_questions=models.Count('id'), total_votes=models.Sum('total_votes'))
+    total_questions = stats['total_questions']
+    total_votes = stats['total_votes'] or 0
     
     # Verificar si el usuario es administrador
     is_admin = request.user.is_authenticated and request.user.is_staff
@@ -117,7 +116,8 @@ def delete_question(request, question_id):
     
     if request.method == 'POST':
         question_text = question.question_text
-        question.delete()
+        # Votes go in chunks first instead of one cascading delete
+        purge_question(question.pk)
         messages.success(request, f'Encuesta "{question_text}" eliminada exitosamente!')
         return redirect('polls:admin_dashboard')
     
@@ -7,7 +7,14 @@ class PollsConfig(AppConfig):
     
     def ready(self):
         """Called when app is ready - import blockchain models"""
+        from django.db.backends.signals import connection_created
+        from encuestas.database import apply_sqlite_pragmas
+        from . import listing  # Registers QuestionListing maintenance handlers
+        
+        connection_created.connect(apply_sqlite_pragmas, dispatch_uid='sqlite_profile_pragmas')
+        
         try:
             from .blockchain import models as blockchain_models
+            listing.connect_blockchain_handlers()
         except ImportError:
             pass  # Blockchain models not available
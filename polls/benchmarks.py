@@ -0,0 +1,227 @@
+"""
+Use-Case Benchmark Suite
+
+Measures the two hot paths of the core layer against a synthetic chain
+(``polls.adapters.synthetic``):
+
+- ``SyncVotesUseCase``: events ingested per second and peak Python memory
+  (``tracemalloc``) of one full sync from block 0;
+- ``GetQuestionResultsUseCase``: latency percentiles over a sample of the
+  synced questions.
+
+Each run uses one backend: ``memory`` (the in-memory repositories) or
+``django`` (the Django repositories, which the run fills and then purges).
+``run_suite`` gives Django runs a throwaway database, migrated for the
+suite and dropped afterwards, unless ``use_default_db`` asks for the live
+one. ``tracemalloc`` slows every run by a similar factor,
+so throughput is comparable between runs of this suite, not with production
+figures. ``run_suite`` returns a JSON-serialisable report.
+"""
+
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import math
+import platform
+import random
+import time
+import tracemalloc
+
+import django
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from core.domain.entities import Choice, Question
+from core.use_cases.sync import SyncVotesUseCase
+from core.use_cases.voting import GetQuestionResultsUseCase
+from polls.adapters.memory import InMemoryQuestionRepository, InMemoryVoteRepository
+from polls.adapters.repositories import DjangoQuestionRepository, DjangoVoteRepository
+from polls.adapters.synthetic import SyntheticChainGateway
+from polls.blockchain.bulk import bulk_create_inherited
+from polls.blockchain.maintenance import purge_question
+from polls.blockchain.models import BlockchainChoice, BlockchainQuestion
+from polls.routing import primary_only
+
+BACKENDS = ('memory', 'django')
+DEFAULT_EVENT_COUNTS = (10_000, 100_000)
+DEFAULT_QUESTIONS = 1000
+DEFAULT_CHOICES = 4
+RESULTS_SAMPLES = 200
+SUITE_VERSION = 1
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of already sorted ``values``"""
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(values)))
+    return values[min(rank, len(values)) - 1]
+
+
+def latency_summary(seconds: Iterable[float]) -> Dict[str, Any]:
+    """Sample count, mean and p50/p95/p99/max of latencies, in milliseconds"""
+    values = sorted(s * 1000 for s in seconds)
+    return {
+        'samples': len(values),
+        'mean_ms': round(sum(values) / len(values), 3) if values else 0.0,
+        'p50_ms': round(percentile(values, 0.50), 3),
+        'p95_ms': round(percentile(values, 0.95), 3),
+        'p99_ms': round(percentile(values, 0.99), 3),
+        'max_ms': round(values[-1], 3) if values else 0.0,
+    }
+
+
+# ----------------------------------------------------------------------
+# Backends
+# ----------------------------------------------------------------------
+
+@contextmanager
+def _memory_backend(gateway: SyntheticChainGateway) -> Iterator[Tuple[Any, Any, List[int]]]:
+    questions, votes = InMemoryQuestionRepository(), InMemoryVoteRepository()
+    for blockchain_id in gateway.question_ids():
+        questions.save(Question(
+            id=None,
+            text=f"Benchmark Q{blockchain_id}",
+            pub_date=datetime.now(),
+            choices=[Choice(id=None, text=f"Option {i}") for i in range(gateway.choices)],
+            blockchain_id=blockchain_id,
+            is_synced=True,
+        ))
+    yield questions, votes, list(questions.questions)
+
+
+@contextmanager
+def _django_backend(gateway: SyntheticChainGateway) -> Iterator[Tuple[Any, Any, List[int]]]:
+    # Fresh blockchain ids, after any real question in the database
+    last = BlockchainQuestion.objects.aggregate(last=Max('blockchain_id'))['last']
+    gateway.first_question_id = 0 if last is None else last + 1
+    now = timezone.now()
+    with transaction.atomic():
+        questions = bulk_create_inherited([
+            BlockchainQuestion(
+                question_text=f"Benchmark Q{blockchain_id}",
+                pub_date=now,
+                blockchain_id=blockchain_id,
+                is_blockchain_synced=True,
+                use_blockchain=True,
+            ) for blockchain_id in gateway.question_ids()
+        ])
+        bulk_create_inherited([
+            BlockchainChoice(question_id=question.pk, choice_text=f"Option {i}", ordinal=i)
+            for question in questions
+            for i in range(gateway.choices)
+        ])
+    question_ids = [q.pk for q in questions]
+    try:
+        yield DjangoQuestionRepository(), DjangoVoteRepository(), question_ids
+    finally:
+        for question_id in question_ids:
+            purge_question(question_id)
+
+
+BACKEND_FACTORIES = {'memory': _memory_backend, 'django': _django_backend}
+
+
+@contextmanager
+def throwaway_database() -> Iterator[None]:
+    """Point the default connection at a freshly migrated test database, dropped on exit"""
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+# ----------------------------------------------------------------------
+# Runs
+# ----------------------------------------------------------------------
+
+def run_benchmark(backend: str, events: int, questions: int = DEFAULT_QUESTIONS,
+                  choices: int = DEFAULT_CHOICES, samples: int = RESULTS_SAMPLES,
+                  seed: int = 0) -> Dict[str, Any]:
+    """
+    Sync a synthetic chain of ``events`` votes and sample result reads
+
+    The ``django`` backend writes to the current default database; use
+    ``run_suite`` (or ``throwaway_database``) to keep it off a live one.
+
+    Returns:
+        Dict[str, Any]: Run parameters plus ``sync`` and ``results`` figures
+
+    Raises:
+        ValueError: If the backend is unknown or not every event was synced
+    """
+    if backend not in BACKEND_FACTORIES:
+        raise ValueError(f"Unknown backend {backend!r}; choose from {', '.join(BACKENDS)}")
+    gateway = SyntheticChainGateway(events, questions, choices, seed=seed)
+
+    # Replica reads could miss the questions the backend just inserted
+    with primary_only(), BACKEND_FACTORIES[backend](gateway) as (question_repo, vote_repo, question_ids):
+        sync = SyncVotesUseCase(vote_repo, question_repo, gateway)
+        tracemalloc.start()
+        try:
+            started = time.perf_counter()
+            synced = sync.execute(from_block=0)
+            elapsed = time.perf_counter() - started
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        if synced != events:
+            raise ValueError(f"Synced {synced} of {events} synthetic events")
+
+        results = GetQuestionResultsUseCase(question_repo, vote_repo)
+        latencies = []
+        for question_id in random.Random(seed).sample(question_ids, min(samples, len(question_ids))):
+            started = time.perf_counter()
+            results.execute(question_id)
+            latencies.append(time.perf_counter() - started)
+
+    return {
+        'backend': backend,
+        'events': events,
+        'questions': questions,
+        'choices': choices,
+        'sync': {
+            'seconds': round(elapsed, 3),
+            'events_per_second': round(synced / elapsed, 1) if elapsed else 0.0,
+            'peak_memory_bytes': peak,
+        },
+        'results': latency_summary(latencies),
+    }
+
+
+def run_suite(backends: Iterable[str] = BACKENDS, event_counts: Iterable[int] = DEFAULT_EVENT_COUNTS,
+              questions: int = DEFAULT_QUESTIONS, choices: int = DEFAULT_CHOICES,
+              samples: int = RESULTS_SAMPLES, seed: int = 0, use_default_db: bool = False,
+              on_run: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    One ``run_benchmark`` per backend and event count
+
+    Django runs share one ``throwaway_database`` unless ``use_default_db``.
+
+    Returns:
+        Dict[str, Any]: Environment details and the list of ``runs``
+    """
+    report = {
+        'suite': 'use_cases',
+        'version': SUITE_VERSION,
+        'created_at': timezone.now().isoformat(),
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'default_db': use_default_db,
+        'seed': seed,
+        'runs': [],
+    }
+    backends = list(backends)
+    isolated = 'django' in backends and not use_default_db
+    with throwaway_database() if isolated else nullcontext():
+        for backend in backends:
+            for events in event_counts:
+                run = run_benchmark(backend, events, questions, choices, samples, seed)
+                report['runs'].append(run)
+                if on_run:
+                    on_run(run)
+    return report
@@ -5,18 +5,28 @@ This admin interface provides comprehensive management of blockchain-enabled
 questions, votes, and synchronization with smart contracts.
 """
 
+from django import forms
 from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ChangeList, PAGE_VAR
+from django.contrib.admin.widgets import AutocompleteSelect
 from django.http import HttpResponseRedirect, JsonResponse
-from django.shortcuts import render
+from django.shortcuts import get_object_or_404, render
 from django.urls import path, reverse
 from django.utils.html import format_html
 from django.contrib import messages
 from django.utils import timezone
 from django.db.models import Count, Sum
 
-from .models import BlockchainQuestion, BlockchainChoice, BlockchainVote
+from .jobs import enqueue_job
+from .models import (
+    BlockchainQuestion, BlockchainChoice, BlockchainVote, BlockchainOutbox, BlockchainJob, VoteArchive
+)
 from .services import blockchain_service
 from .config import is_web3_connected
+from polls.pagination import EstimatedCountPaginator, encode_cursor, keyset_filter
+
+CURSOR_VAR = 'cursor'
 
 import logging
 
@@ -57,7 +67,7 @@ class BlockchainQuestionAdmin(admin.ModelAdmin):
             'classes': ['collapse']
         }),
         ('Blockchain Status', {
-            'fields': ['blockchain_created_at'],
+            'fields': ['blockchain_created_at', 'closed_at'],
             'classes': ['collapse']
         })
     ]
@@ -109,6 +119,11 @@ class BlockchainQuestionAdmin(admin.ModelAdmin):
                 self.admin_site.admin_view(self.sync_from_blockchain_view),
                 name='polls_blockchainquestion_sync_from_blockchain',
             ),
+            path(
+                'jobs/<int:job_id>/',
+                self.admin_site.admin_view(self.job_progress_view),
+                name='polls_blockchainjob_progress',
+            ),
             path(
                 'blockchain-dashboard/',
                 self.admin_site.admin_view(self.blockchain_dashboard_view),
@@ -153,11 +168,15 @@ class BlockchainQuestionAdmin(admin.ModelAdmin):
             return format_html('<span style="color: orange;">⏳ Pending</span>')
     blockchain_status.short_description = 'Blockchain Status'
     
+    def get_queryset(self, request):
+        """Total Django votes are summed in the changelist query"""
+        return super().get_queryset(request).annotate(django_votes=Sum('choice__votes'))
+    
     def total_django_votes(self, obj):
         """Display total votes in Django database"""
-        total = sum(choice.votes for choice in obj.choice_set.all())
-        return format_html('<strong>{}</strong>', total)
+        return format_html('<strong>{}</strong>', obj.django_votes or 0)
     total_django_votes.short_description = 'Django Votes'
+    total_django_votes.admin_order_field = 'django_votes'
     
     def blockchain_actions(self, obj):
         """Display action buttons for blockchain operations"""
@@ -194,7 +213,16 @@ class BlockchainQuestionAdmin(admin.ModelAdmin):
     blockchain_actions.allow_tags = True
     
     def sync_to_blockchain(self, request, queryset):
-        """Admin action to sync questions to blockchain"""
+        """Admin action to sync questions to blockchain (runs as a background job)"""
+        return self._enqueue_job(request, queryset, BlockchainJob.KIND_SYNC_TO)
+    sync_to_blockchain.short_description = "📤 Sync selected questions to blockchain"
+    
+    def sync_from_blockchain(self, request, queryset):
+        """Admin action to sync questions from blockchain (runs as a background job)"""
+        return self._enqueue_job(request, queryset, BlockchainJob.KIND_SYNC_FROM)
+    sync_from_blockchain.short_description = "📥 Sync selected questions from blockchain"
+    
+    def _enqueue_job(self, request, queryset, kind):
         if not is_web3_connected():
             self.message_user(
                 request,
@@ -203,54 +231,16 @@ class BlockchainQuestionAdmin(admin.ModelAdmin):
             )
             return
         
-        success_count = 0
-        for question in queryset:
-            if not question.use_blockchain:
-                question.use_blockchain = True
-                question.save()
-            
-            if not question.is_blockchain_synced:
-                result = question.create_on_blockchain()
-                if result.get('success'):
-                    success_count += 1
-        
-        if success_count > 0:
-            self.message_user(
-                request,
-                f"Successfully synced {success_count} question(s) to blockchain.",
-                level=messages.SUCCESS
-            )
+        job, created = enqueue_job(kind, queryset.values_list('pk', flat=True), user=request.user)
+        if created:
+            self.message_user(request, f"Job #{job.pk} started for {job.total} question(s).", level=messages.INFO)
         else:
             self.message_user(
                 request,
-                "No questions were synced. Check blockchain connection.",
+                f"These questions are already being processed by job #{job.pk}.",
                 level=messages.WARNING
             )
-    sync_to_blockchain.short_description = "📤 Sync selected questions to blockchain"
-    
-    def sync_from_blockchain(self, request, queryset):
-        """Admin action to sync questions from blockchain"""
-        if not is_web3_connected():
-            self.message_user(
-                request,
-                "Blockchain not connected. Cannot sync questions.",
-                level=messages.ERROR
-            )
-            return
-        
-        success_count = 0
-        for question in queryset:
-            if question.is_blockchain_synced:
-                result = question.sync_from_blockchain()
-                if result.get('success'):
-                    success_count += 1
-        
-        self.message_user(
-            request,
-            f"Checked {success_count} question(s) against blockchain.",
-            level=messages.INFO
-        )
-    sync_from_blockchain.short_description = "📥 Sync selected questions from blockchain"
+        return HttpResponseRedirect(reverse('admin:polls_blockchainjob_progress', args=[job.pk]))
     
     def check_blockchain_status(self, request, queryset):
         """Admin action to check blockchain status"""
@@ -328,6 +318,38 @@ class BlockchainQuestionAdmin(admin.ModelAdmin):
         
         return HttpResponseRedirect("../")
     
+    def job_progress_view(self, request, job_id):
+        """Progress of a background bulk action with per-question outcomes"""
+        job = get_object_or_404(BlockchainJob, pk=job_id)
+        texts = dict(
+            BlockchainQuestion.objects.filter(pk__in=job.question_ids).values_list('pk', 'question_text')
+        )
+        outcomes = [
+            {'question_id': pk, 'question_text': texts.get(pk, ''), **job.results.get(str(pk), {})}
+            for pk in job.question_ids
+        ]
+        
+        if request.GET.get('format') == 'json':
+            return JsonResponse({
+                'id': job.pk,
+                'status': job.status,
+                'total': job.total,
+                'processed': job.processed,
+                'succeeded': job.succeeded,
+                'error': job.error,
+                'results': outcomes,
+            })
+        
+        context = {
+            **self.admin_site.each_context(request),
+            'title': f'Job #{job.pk}: {job.get_kind_display()}',
+            'job': job,
+            'outcomes': outcomes,
+            'percent': int(job.processed * 100 / job.total) if job.total else 100,
+            'opts': self.model._meta,
+        }
+        return render(request, 'admin/polls/blockchainjob/progress.html', context)
+    
     def blockchain_dashboard_view(self, request):
         """Custom dashboard view for blockchain operations"""
         # Get statistics
@@ -370,6 +392,10 @@ class BlockchainChoiceAdmin(admin.ModelAdmin):
     search_fields = ['choice_text', 'question__question_text']
     readonly_fields = ['votes']
     
+    def get_queryset(self, request):
+        """Join the question and its blockchain child row for the status column"""
+        return super().get_queryset(request).select_related('question__blockchainquestion')
+    
     def question_blockchain_status(self, obj):
         """Show blockchain status of the parent question"""
         # Check if the question is a BlockchainQuestion instance
@@ -391,6 +417,83 @@ class BlockchainChoiceAdmin(admin.ModelAdmin):
     question_blockchain_status.short_description = 'Blockchain Status'
 
 
+class QuestionAutocompleteFilter(admin.SimpleListFilter):
+    """
+    Question filter backed by the admin autocomplete view
+    
+    Unlike ``list_filter = ['question']`` it never loads every question;
+    only the selected one is rendered.
+    """
+    title = 'question'
+    parameter_name = 'question'
+    template = 'admin/polls/question_autocomplete_filter.html'
+    
+    def __init__(self, request, params, model, model_admin):
+        super().__init__(request, params, model, model_admin)
+        question_field = model._meta.get_field('question')
+        # A form field supplies the widget's choices; rendering only fetches the selected row
+        self.field = forms.ModelChoiceField(
+            queryset=question_field.remote_field.model._default_manager.all(),
+            required=False,
+            widget=AutocompleteSelect(
+                question_field, model_admin.admin_site,
+                attrs={'id': 'question-autocomplete-filter', 'data-filter-param': self.parameter_name}
+            ),
+        )
+    
+    def lookups(self, request, model_admin):
+        return ()
+    
+    def has_output(self):
+        return True
+    
+    def queryset(self, request, queryset):
+        value = self.value()
+        if value and value.isdigit():
+            return queryset.filter(question_id=int(value))
+        return queryset
+    
+    def rendered_widget(self):
+        value = self.value()
+        return self.field.widget.render(self.parameter_name, value if value and value.isdigit() else None)
+
+
+class VoteKeysetChangeList(ChangeList):
+    """
+    Vote changelist paged with a (timestamp, id) cursor instead of OFFSET
+    """
+    
+    def __init__(self, request, *args, **kwargs):
+        # The cursor is not a lookup; hide it from the filter machinery
+        self.cursor = request.GET.get(CURSOR_VAR) or None
+        if CURSOR_VAR in request.GET:
+            request.GET = request.GET.copy()
+            del request.GET[CURSOR_VAR]
+        super().__init__(request, *args, **kwargs)
+    
+    def get_queryset(self, request, *args, **kwargs):
+        queryset = super().get_queryset(request, *args, **kwargs)
+        try:
+            return keyset_filter(queryset, self.cursor)
+        except ValueError:
+            raise IncorrectLookupParameters("Invalid cursor")
+    
+    def get_results(self, request):
+        super().get_results(request)
+        rows = self.result_list
+        self.result_count_is_estimate = self.result_count > self.paginator.threshold
+        self.next_cursor = None
+        if rows and self.result_count > self.list_per_page:
+            last = rows[len(rows) - 1]
+            self.next_cursor = encode_cursor(last.timestamp, last.pk)
+    
+    def next_page_url(self):
+        return self.get_query_string({CURSOR_VAR: self.next_cursor}, [PAGE_VAR])
+    
+    def first_page_url(self):
+        return self.get_query_string(remove=[PAGE_VAR])
+
+
 @admin.register(BlockchainVote)
 class BlockchainVoteAdmin(admin.ModelAdmin):
     """Admin for BlockchainVote (readonly)"""
@@ -401,13 +504,31 @@ class BlockchainVoteAdmin(admin.ModelAdmin):
         'transaction_hash_short', 
         'timestamp'
     ]
-    list_filter = ['timestamp', 'question']
+    list_filter = ['timestamp', QuestionAutocompleteFilter]
     search_fields = ['voter_address', 'transaction_hash', 'question__question_text']
     readonly_fields = [
         'question', 'choice_index', 'voter_address', 
         'transaction_hash', 'block_number', 'timestamp'
     ]
     
+    # Keyset paging needs the fixed (timestamp, id) order and no full COUNT(*)
+    ordering = ['-timestamp', '-id']
+    sortable_by = ()
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    
+    def get_changelist(self, request, **kwargs):
+        return VoteKeysetChangeList
+    
+    @property
+    def media(self):
+        autocomplete = AutocompleteSelect(BlockchainVote._meta.get_field('question'), self.admin_site)
+        return super().media + autocomplete.media
+    
+    def get_queryset(self, request):
+        """Resolve question and choice text in the changelist query"""
+        return super().get_queryset(request).select_related('question').with_choice_text()
+    
     def has_add_permission(self, request):
         """Disable adding votes through admin"""
         return False
@@ -435,5 +556,61 @@ class BlockchainVoteAdmin(admin.ModelAdmin):
     choice_text_display.short_description = 'Choice'
 
 
+@admin.register(BlockchainOutbox)
+class BlockchainOutboxAdmin(admin.ModelAdmin):
+    """Admin for pending on-chain creations (readonly, with retry)"""
+    list_display = ['id', 'question', 'status', 'attempts', 'next_attempt_at', 'last_error']
+    list_filter = ['status']
+    list_select_related = ['question']
+    readonly_fields = ['question', 'status', 'attempts', 'next_attempt_at', 'last_error', 'created_at', 'updated_at']
+    actions = ['retry_entries']
+    
+    def has_add_permission(self, request):
+        """Entries are created with their question"""
+        return False
+    
+    def retry_entries(self, request, queryset):
+        """Admin action to requeue failed entries"""
+        updated = queryset.exclude(status=BlockchainOutbox.STATUS_DONE).update(
+            status=BlockchainOutbox.STATUS_PENDING,
+            attempts=0,
+            next_attempt_at=timezone.now()
+        )
+        self.message_user(request, f"Requeued {updated} outbox entr(y/ies).", level=messages.SUCCESS)
+    retry_entries.short_description = "🔁 Retry selected entries"
+
+
+@admin.register(BlockchainJob)
+class BlockchainJobAdmin(admin.ModelAdmin):
+    """Admin for background bulk-action jobs (readonly)"""
+    list_display = ['id', 'kind', 'status', 'progress', 'created_by', 'created_at', 'finished_at']
+    list_filter = ['kind', 'status']
+    list_select_related = ['created_by']
+    exclude = ['results', 'question_ids', 'fingerprint']
+    readonly_fields = ['kind', 'status', 'total', 'processed', 'succeeded', 'error',
+                       'created_by', 'created_at', 'finished_at', 'progress']
+    
+    def has_add_permission(self, request):
+        """Jobs are created by the question admin actions"""
+        return False
+    
+    def progress(self, obj):
+        url = reverse('admin:polls_blockchainjob_progress', args=[obj.pk])
+        return format_html('<a href="{}">{}/{} ({} ok)</a>', url, obj.processed, obj.total, obj.succeeded)
+    progress.short_description = 'Progress'
+
+
+@admin.register(VoteArchive)
+class VoteArchiveAdmin(admin.ModelAdmin):
+    """Admin for cold-storage vote archives (readonly)"""
+    list_display = ['question', 'vote_count', 'tallies', 'last_block', 'size_bytes', 'archived_at']
+    list_select_related = ['question']
+    readonly_fields = ['question', 'path', 'vote_count', 'tallies', 'last_block', 'size_bytes', 'archived_at']
+    
+    def has_add_permission(self, request):
+        """Archives are written by the archive_votes command"""
+        return False
+
+
 # Register the blockchain models in the main admin
 # This ensures they appear in the Django admin interface
\ No newline at end of file
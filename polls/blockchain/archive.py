@@ -0,0 +1,264 @@
+"""
+Cold-Storage Archival of Blockchain Votes
+
+Votes of closed questions are moved out of ``BlockchainVote`` into one
+append-only gzip JSONL file per question, keeping the hot table and its
+indexes small. Each archival batch appends a gzip member and then, in one
+transaction, records the new committed file size and tallies on the
+``VoteArchive`` row and deletes the archived rows. A member written by a
+batch whose transaction failed lies past the committed size; readers ignore
+it and the next batch truncates it away.
+
+Archived votes stay readable: ``iter_archived_votes`` streams them back
+(repositories merge them into results) and ``restore_question_votes``
+rehydrates them into the table.
+"""
+
+from collections import Counter
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+import gzip
+import io
+import json
+import logging
+import os
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, Max, OuterRef
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import BlockchainQuestion, BlockchainVote, VoteArchive
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_BATCH_SIZE = 5000
+CLOSED_GRACE_DAYS = 7
+
+
+def archive_dir() -> Path:
+    return Path(getattr(settings, 'VOTE_ARCHIVE_DIR', Path(settings.BASE_DIR) / 'var' / 'vote_archive'))
+
+
+def archive_path(archive: VoteArchive) -> Path:
+    return archive_dir() / archive.path
+
+
+def _vote_record(vote: BlockchainVote) -> Dict[str, Any]:
+    return {
+        'choice_index': vote.choice_index,
+        'voter_address': vote.voter_address,
+        'transaction_hash': vote.transaction_hash,
+        'block_number': vote.block_number,
+        'log_index': vote.log_index,
+        'timestamp': vote.timestamp.isoformat() if vote.timestamp else None,
+    }
+
+
+class _BoundedReader(io.RawIOBase):
+    """Read-only view of the first ``limit`` bytes of a file"""
+
+    def __init__(self, raw, limit: int):
+        self._raw = raw
+        self._remaining = limit
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        size = min(len(buffer), self._remaining)
+        if size <= 0:
+            return 0
+        data = self._raw.read(size)
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+
+# ----------------------------------------------------------------------
+# Selection
+# ----------------------------------------------------------------------
+
+def inactive_questions(inactive_days: int):
+    """Open questions whose latest vote is older than ``inactive_days`` days"""
+    return (
+        BlockchainQuestion.objects.filter(closed_at__isnull=True)
+        .annotate(last_vote=Max('blockchainvote__timestamp'))
+        .filter(last_vote__lt=timezone.now() - timedelta(days=inactive_days))
+        .order_by('pk')
+    )
+
+
+def archivable_questions(closed_days: int = CLOSED_GRACE_DAYS, inactive_days: Optional[int] = None):
+    """
+    Questions whose hot votes can be archived
+
+    Args:
+        closed_days (int): Grace period after ``closed_at`` for late syncs
+        inactive_days (int, optional): Also close questions whose latest vote
+            is older than this many days; like any closed question they are
+            archived once the grace period has passed
+    """
+    now = timezone.now()
+    if inactive_days is not None:
+        stale = list(inactive_questions(inactive_days).values_list('pk', flat=True))
+        closed = BlockchainQuestion.objects.filter(pk__in=stale).update(closed_at=now)
+        if closed:
+            logger.info(f"Closed {closed} inactive questions")
+
+    return BlockchainQuestion.objects.filter(
+        Exists(BlockchainVote.objects.filter(question=OuterRef('pk'))),
+        closed_at__lte=now - timedelta(days=closed_days),
+    ).order_by('pk')
+
+
+# ----------------------------------------------------------------------
+# Archival
+# ----------------------------------------------------------------------
+
+def _append_member(archive: VoteArchive, records: List[Dict[str, Any]]) -> int:
+    """Write ``records`` as one gzip member after the committed size; returns the new size"""
+    path = archive_path(archive)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'ab') as raw:
+        # Drop anything a failed batch left past the committed size
+        raw.truncate(archive.size_bytes)
+        with gzip.GzipFile(fileobj=raw, mode='wb') as member:
+            for record in records:
+                member.write((json.dumps(record) + '\n').encode())
+        raw.flush()
+        os.fsync(raw.fileno())
+        return raw.tell()
+
+
+def _account_member(archive: VoteArchive, records: List[Dict[str, Any]], size: int) -> None:
+    """Add a written member's votes to ``archive``'s counters (saved by the caller)"""
+    tallies = Counter({int(k): v for k, v in archive.tallies.items()})
+    tallies.update(record['choice_index'] for record in records)
+    blocks = [record['block_number'] for record in records if record['block_number'] is not None]
+    archive.vote_count += len(records)
+    archive.tallies = {str(k): v for k, v in sorted(tallies.items())}
+    archive.last_block = max([archive.last_block or 0, *blocks]) if blocks else archive.last_block
+    archive.size_bytes = size
+
+
+def append_archived_records(question_id: int, records: List[Dict[str, Any]],
+                            using: Optional[str] = None) -> VoteArchive:
+    """
+    Append already-archived vote records to a question's archive
+
+    Used to rebuild archives elsewhere (e.g. from a snapshot); the records
+    have the archive file's fields. The row is saved in the caller's
+    transaction, so a rollback leaves the member past the committed size.
+    """
+    archive, _ = VoteArchive.objects.using(using).get_or_create(
+        question_id=question_id, defaults={'path': f'question_{question_id}.jsonl.gz'}
+    )
+    size = _append_member(archive, records)
+    _account_member(archive, records, size)
+    archive.save(using=using)
+    return archive
+
+
+def archive_question_votes(question: BlockchainQuestion, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+    """
+    Move all hot votes of ``question`` into its archive file
+
+    Returns:
+        int: Number of votes archived
+    """
+    archive, _ = VoteArchive.objects.get_or_create(
+        question=question, defaults={'path': f'question_{question.pk}.jsonl.gz'}
+    )
+
+    archived = 0
+    while True:
+        votes = list(
+            BlockchainVote.objects.filter(question=question)
+            .order_by('block_number', 'log_index', 'pk')[:batch_size]
+        )
+        if not votes:
+            break
+
+        records = [_vote_record(vote) for vote in votes]
+        size = _append_member(archive, records)
+
+        with transaction.atomic():
+            _account_member(archive, records, size)
+            archive.save()
+            BlockchainVote.objects.filter(pk__in=[vote.pk for vote in votes]).delete()
+
+        archived += len(votes)
+
+    if archived:
+        logger.info(f"Archived {archived} votes of Q{question.pk} to {archive_path(archive)}")
+    return archived
+
+
+# ----------------------------------------------------------------------
+# Rehydration
+# ----------------------------------------------------------------------
+
+def get_archive(question_id: int) -> Optional[VoteArchive]:
+    return VoteArchive.objects.filter(question_id=question_id).first()
+
+
+def iter_archived_votes(question_id: int, archive: Optional[VoteArchive] = None) -> Iterator[Dict[str, Any]]:
+    """Stream the archived vote records of a question (committed part only)"""
+    archive = archive or get_archive(question_id)
+    if archive is None or not archive.size_bytes:
+        return
+    with open(archive_path(archive), 'rb') as raw:
+        reader = io.BufferedReader(_BoundedReader(raw, archive.size_bytes))
+        with gzip.GzipFile(fileobj=reader, mode='rb') as members:
+            for line in members:
+                record = json.loads(line)
+                record['question_id'] = question_id
+                record['timestamp'] = parse_datetime(record['timestamp']) if record['timestamp'] else None
+                yield record
+
+
+def archived_event_keys(question_id: int) -> Set[Tuple[str, int]]:
+    """``(transaction_hash, log_index)`` of every archived vote of a question"""
+    return {(r['transaction_hash'], r['log_index']) for r in iter_archived_votes(question_id)}
+
+
+def archived_tallies(question_id: int) -> Dict[int, int]:
+    """Archived votes per choice index, without opening the file"""
+    archive = get_archive(question_id)
+    return {int(k): v for k, v in archive.tallies.items()} if archive else {}
+
+
+def restore_question_votes(question_id: int) -> int:
+    """
+    Put a question's archived votes back into ``BlockchainVote``
+
+    The archive file and row are removed once the rows are committed.
+
+    Returns:
+        int: Number of votes restored
+    """
+    archive = get_archive(question_id)
+    if archive is None:
+        return 0
+
+    restored = 0
+    with transaction.atomic():
+        for record in iter_archived_votes(question_id, archive):
+            # Keeps the original timestamps, unlike create()/bulk_create()
+            restored += BlockchainVote.objects.insert_if_absent(
+                question=question_id,
+                choice_index=record['choice_index'],
+                voter_address=record['voter_address'],
+                transaction_hash=record['transaction_hash'],
+                block_number=record['block_number'],
+                log_index=record['log_index'],
+                timestamp=record['timestamp'] or timezone.now(),
+            )
+        archive.delete()
+
+    archive_path(archive).unlink(missing_ok=True)
+    logger.info(f"Restored {restored} archived votes of Q{question_id}")
+    return restored
@@ -0,0 +1,184 @@
+"""
+Three-Way Vote Consistency Audit
+
+Votes are represented three times: the contract's ``getVotes`` tallies, the
+local ``BlockchainVote`` rows (plus archived tallies) and ``Choice.votes``.
+``audit_votes`` compares them for every synced question:
+
+- on-chain tallies are read in JSON-RPC batches of ``batch_size`` questions,
+  ``concurrency`` batches at a time;
+- local tallies come from one ``GROUP BY question, choice_index`` query per
+  batch, and ``Choice.votes`` from one query over the batch's choices.
+
+A question has *vote drift* when its chain and ``BlockchainVote`` tallies
+differ; ``repair_question_votes`` fixes it by re-reading only that
+question's ``VoteCast`` events (indexed by question ID) from its creation
+block. ``Choice.votes`` also counts Django-only fallback votes, so a
+difference there is reported as *choice drift* but never repaired.
+"""
+
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+from django.db.models import Count
+
+from core.domain.entities import Vote
+from polls.adapters.repositories import DjangoVoteRepository
+from polls.models import Choice
+from .logstore import LOG_FETCH_SPAN
+from .models import BlockchainQuestion, BlockchainVote, VoteArchive
+from .services import blockchain_service
+
+logger = logging.getLogger(__name__)
+
+AUDIT_BATCH_SIZE = 100
+AUDIT_CONCURRENCY = 4
+
+
+def _local_tallies(question_ids: List[int]) -> Dict[int, Counter]:
+    tallies = defaultdict(Counter)
+    rows = BlockchainVote.objects.filter(question_id__in=question_ids).values(
+        'question_id', 'choice_index'
+    ).annotate(n=Count('pk')).order_by()
+    for row in rows:
+        tallies[row['question_id']][row['choice_index']] += row['n']
+    for archive in VoteArchive.objects.filter(question_id__in=question_ids):
+        for index, n in archive.tallies.items():
+            tallies[archive.question_id][int(index)] += n
+    return tallies
+
+
+def _choice_tallies(question_ids: List[int]) -> Dict[int, Counter]:
+    tallies = defaultdict(Counter)
+    for question_id, ordinal, votes in Choice.objects.filter(
+        question_id__in=question_ids
+    ).values_list('question_id', 'ordinal', 'votes').order_by():
+        tallies[question_id][ordinal] += votes
+    return tallies
+
+
+def _as_list(tallies: Counter, size: int) -> List[int]:
+    return [tallies.get(index, 0) for index in range(size)]
+
+
+def audit_votes(question_ids: Optional[List[int]] = None, batch_size: int = AUDIT_BATCH_SIZE,
+                concurrency: int = AUDIT_CONCURRENCY,
+                on_progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Compare chain, ``BlockchainVote`` and ``Choice.votes`` tallies
+
+    Args:
+        question_ids (list, optional): Questions to audit; all synced by default
+        batch_size (int): Questions per JSON-RPC batch and local query
+        concurrency (int): JSON-RPC batches in flight
+        on_progress (callable, optional): Called with the report after each batch
+
+    Returns:
+        Dict[str, Any]: Counts (audited, in_sync, vote_drift, choice_drift),
+        ``drift`` with one entry per question whose tallies differ (tallies
+        as lists indexed by choice) and ``errors`` as ``{question_id: message}``
+    """
+    questions = BlockchainQuestion.objects.filter(
+        is_blockchain_synced=True, blockchain_id__isnull=False
+    )
+    if question_ids is not None:
+        questions = questions.filter(pk__in=question_ids)
+    rows = list(
+        questions.annotate(choice_count=Count('choice')).order_by('pk')
+        .values_list('pk', 'blockchain_id', 'question_text', 'choice_count')
+    )
+    batches = [rows[start:start + batch_size] for start in range(0, len(rows), batch_size)]
+    report = {"audited": 0, "in_sync": 0, "vote_drift": 0, "choice_drift": 0, "drift": [], "errors": {}}
+
+    def fetch(batch):
+        return blockchain_service.get_vote_tallies({bid: count for _, bid, _, count in batch})
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency), thread_name_prefix='vote-audit') as pool:
+        # Database reads stay on this thread; only the RPC batches run in the pool
+        for batch, result in zip(batches, pool.map(fetch, batches)):
+            ids = [pk for pk, _, _, _ in batch]
+            local, django = _local_tallies(ids), _choice_tallies(ids)
+            for pk, bid, text, count in batch:
+                if not result.get("success"):
+                    report["errors"][pk] = result.get("error", "Unknown error")
+                    continue
+                _compare(report, pk, bid, text, result["tallies"][bid],
+                         _as_list(local[pk], count), _as_list(django[pk], count))
+            if on_progress:
+                on_progress(report)
+    return report
+
+
+def _compare(report, pk, bid, text, chain, local, django):
+    report["audited"] += 1
+    vote_drift, choice_drift = chain != local, chain != django
+    if not (vote_drift or choice_drift):
+        report["in_sync"] += 1
+        return
+    report["vote_drift"] += vote_drift
+    report["choice_drift"] += choice_drift
+    report["drift"].append({
+        "question_id": pk,
+        "blockchain_id": bid,
+        "question_text": text,
+        "chain": chain,
+        "local": local,
+        "django": django,
+        "vote_drift": vote_drift,
+        "choice_drift": choice_drift,
+    })
+
+
+def repair_question_votes(question_id: int, to_block: Optional[int] = None,
+                          span: int = LOG_FETCH_SPAN) -> Dict[str, Any]:
+    """
+    Re-sync one question's votes from its creation block to ``to_block``
+
+    Missing events are inserted; hot rows in the range that the chain does
+    not have are removed. Rows without a block number are left alone.
+
+    Returns:
+        Dict[str, Any]: The block range, ``inserted`` and ``removed`` counts
+    """
+    question = BlockchainQuestion.objects.get(pk=question_id)
+    if not question.is_blockchain_synced or question.blockchain_id is None:
+        return {"success": False, "error": "Question not synced with blockchain"}
+
+    from_block = blockchain_service.get_transaction_block(question.blockchain_tx_hash) or 0
+    if to_block is None:
+        to_block = blockchain_service.get_current_block()
+
+    events = []
+    for start in range(from_block, to_block + 1, span):
+        fetched = blockchain_service.get_question_vote_events(
+            question.blockchain_id, start, min(to_block, start + span - 1)
+        )
+        if not fetched.get("success"):
+            return fetched
+        events.extend(fetched["events"])
+
+    repository = DjangoVoteRepository()
+    inserted = sum(repository.add_if_absent(Vote(
+        question_id=question.pk,
+        choice_index=event['choice_index'],
+        voter_address=event['voter'],
+        transaction_hash=event['tx_hash'],
+        block_number=event['block_number'],
+        log_index=event['log_index'],
+    )) for event in events)
+
+    on_chain = {(event['tx_hash'], event['log_index']) for event in events}
+    phantoms = [
+        pk for pk, tx_hash, log_index in BlockchainVote.objects.filter(
+            question=question, block_number__gte=from_block, block_number__lte=to_block
+        ).values_list('pk', 'transaction_hash', 'log_index')
+        if (tx_hash, log_index) not in on_chain
+    ]
+    removed = BlockchainVote.objects.filter(pk__in=phantoms).delete()[0] if phantoms else 0
+
+    logger.info(f"Repaired votes of Q{question.pk} in blocks {from_block}-{to_block}: "
+                f"{inserted} inserted, {removed} removed")
+    return {"success": True, "from_block": from_block, "to_block": to_block,
+            "inserted": inserted, "removed": removed}
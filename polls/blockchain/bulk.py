@@ -0,0 +1,261 @@
+"""
+Bulk Import of Questions and Choices
+
+``import_questions`` loads questions from CSV or JSONL with a handful of
+multi-row INSERTs per batch instead of one INSERT per question and choice.
+Each batch commits in its own transaction, so a failed import keeps the
+batches before it.
+
+Blockchain questions are multi-table-inheritance rows, which
+``bulk_create()`` refuses: the parent ``Question``/``Choice`` rows are bulk
+created first and the child rows are then inserted with one ``executemany``
+per table. Nothing is written on chain during the import; the questions are
+left pending for ``blockchain_sync sync_all`` or, with ``queue=True``, get
+an outbox entry for the ``process_outbox`` worker.
+
+File formats (one question per row/line):
+
+- CSV with a header: ``question_text``, ``choices`` (separated by ``|``)
+  and optionally ``pub_date`` (ISO 8601)
+- JSONL: ``{"question_text": ..., "choices": [...], "pub_date": ...}``
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import csv
+import json
+import logging
+
+from django.db import connections, router, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from polls.models import Choice, Question, QuestionListing
+from .models import BlockchainChoice, BlockchainOutbox, BlockchainQuestion
+from .services import MAX_CHOICES
+
+logger = logging.getLogger(__name__)
+
+IMPORT_BATCH_SIZE = 1000
+CSV_CHOICE_SEPARATOR = '|'
+
+# (line number, raw record)
+ImportRow = Tuple[int, Dict[str, Any]]
+
+
+def read_import_file(path, file_format: Optional[str] = None) -> Iterator[ImportRow]:
+    """
+    Stream the records of a CSV or JSONL file
+
+    The format defaults to the file extension (``.csv``, ``.jsonl``/``.json``).
+    CSV ``choices`` cells are split on ``|``. Lines that are not valid JSON
+    are yielded as ``{'error': ...}`` so the import can report them.
+    """
+    path = Path(path)
+    file_format = file_format or ('csv' if path.suffix.lower() == '.csv' else 'jsonl')
+    with open(path, newline='', encoding='utf-8') as handle:
+        if file_format == 'csv':
+            for line, row in enumerate(csv.DictReader(handle), start=2):
+                row['choices'] = (row.get('choices') or '').split(CSV_CHOICE_SEPARATOR)
+                yield line, row
+            return
+
+        for line, text in enumerate(handle, start=1):
+            if not text.strip():
+                continue
+            try:
+                record = json.loads(text)
+            except ValueError as e:
+                record = {'error': f"Invalid JSON: {e}"}
+            yield line, record if isinstance(record, dict) else {'error': "Expected a JSON object"}
+
+
+def _clean_record(record: Dict[str, Any], blockchain: bool) -> Tuple[Optional[Dict[str, Any]], str]:
+    if record.get('error'):
+        return None, record['error']
+
+    text = (record.get('question_text') or '').strip()
+    if not text:
+        return None, "question_text is required"
+    max_text = Question._meta.get_field('question_text').max_length
+    if len(text) > max_text:
+        return None, f"question_text longer than {max_text} characters"
+
+    choices = [str(c).strip() for c in record.get('choices') or [] if str(c).strip()]
+    minimum = 2 if blockchain else 1
+    if len(choices) < minimum:
+        return None, f"At least {minimum} choices required"
+    if blockchain and len(choices) > MAX_CHOICES:
+        return None, f"At most {MAX_CHOICES} choices allowed on chain"
+    max_choice = Choice._meta.get_field('choice_text').max_length
+    if any(len(c) > max_choice for c in choices):
+        return None, f"Choice longer than {max_choice} characters"
+
+    pub_date = timezone.now()
+    if record.get('pub_date'):
+        pub_date = parse_datetime(str(record['pub_date']))
+        if pub_date is None:
+            return None, f"Invalid pub_date: {record['pub_date']}"
+        if timezone.is_naive(pub_date):
+            pub_date = timezone.make_aware(pub_date)
+
+    return {'question_text': text, 'choices': choices, 'pub_date': pub_date}, ''
+
+
+def insert_rows(model, fields, rows: List, using: str) -> None:
+    """
+    INSERT prepared rows into ``model``'s own table with one executemany
+
+    Unlike ``bulk_create()`` it works on multi-table-inheritance children and
+    skips ``pre_save``, so ``auto_now_add`` values (e.g. vote timestamps) are
+    kept as given.
+    """
+    if not rows:
+        return
+    connection = connections[using]
+    columns = ', '.join(connection.ops.quote_name(f.column) for f in fields)
+    placeholders = ', '.join(['%s'] * len(fields))
+    table = connection.ops.quote_name(model._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.executemany(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})", rows)
+
+
+def _insert_child_rows(model, parents: List, using: str, **values) -> None:
+    """Insert child-table rows that differ only in their parent link"""
+    connection = connections[using]
+    fields = model._meta.local_concrete_fields
+    template = model(**values)
+    pk_field = model._meta.pk
+    row = [f.get_db_prep_save(getattr(template, f.attname), connection) for f in fields]
+    pk_position = fields.index(pk_field)
+    rows = []
+    for parent in parents:
+        row[pk_position] = pk_field.get_db_prep_save(parent.pk, connection)
+        rows.append(tuple(row))
+    insert_rows(model, fields, rows, using)
+
+
+def _create_parents(model, objs: List, using: str) -> List:
+    if connections[using].features.can_return_rows_from_bulk_insert:
+        return model.objects.using(using).bulk_create(objs)
+    # Backends that cannot return the new keys (MySQL) insert one row at a time
+    for obj in objs:
+        obj.save(using=using)
+    return objs
+
+
+def bulk_create_inherited(objs: List, using: Optional[str] = None) -> List:
+    """
+    ``bulk_create()`` for a multi-table-inheritance child model
+
+    The parent rows are bulk created first, then the child rows (with every
+    local field as set on ``objs``) in one executemany. Like
+    ``bulk_create()``, no ``save()`` or signals run.
+    """
+    if not objs:
+        return objs
+    model = type(objs[0])
+    using = using or router.db_for_write(model)
+    link = model._meta.pk
+    parent_model = link.remote_field.model
+    parent_fields = parent_model._meta.concrete_fields
+    parents = _create_parents(parent_model, [
+        parent_model(**{f.attname: getattr(obj, f.attname) for f in parent_fields}) for obj in objs
+    ], using)
+
+    connection = connections[using]
+    fields = model._meta.local_concrete_fields
+    rows = []
+    for obj, parent in zip(objs, parents):
+        setattr(obj, parent_model._meta.pk.attname, parent.pk)
+        setattr(obj, link.attname, parent.pk)
+        rows.append(tuple(f.get_db_prep_save(getattr(obj, f.attname), connection) for f in fields))
+    insert_rows(model, fields, rows, using)
+    return objs
+
+
+def _import_batch(records: List[Dict[str, Any]], blockchain: bool, queue: bool, using: str) -> Tuple[int, int]:
+    questions = _create_parents(Question, [
+        Question(question_text=r['question_text'], pub_date=r['pub_date']) for r in records
+    ], using)
+
+    choices = [
+        # Dense ordinals, as the chain indexes choices by position
+        Choice(question_id=question.pk, choice_text=text, ordinal=position)
+        for question, record in zip(questions, records)
+        for position, text in enumerate(record['choices'])
+    ]
+    if blockchain:
+        choices = _create_parents(Choice, choices, using)
+        _insert_child_rows(BlockchainQuestion, questions, using, use_blockchain=True)
+        _insert_child_rows(BlockchainChoice, choices, using)
+        if queue:
+            BlockchainOutbox.objects.using(using).bulk_create(
+                [BlockchainOutbox(question_id=q.pk) for q in questions]
+            )
+    else:
+        Choice.objects.using(using).bulk_create(choices)
+
+    # Bulk inserts bypass the signals that maintain the read model; the new
+    # rows are fully known, so write them instead of recomputing them
+    QuestionListing.objects.using(using).bulk_create([
+        QuestionListing(
+            id=question.pk,
+            question_type=QuestionListing.TYPE_BLOCKCHAIN if blockchain else QuestionListing.TYPE_DJANGO,
+            question_text=question.question_text,
+            pub_date=question.pub_date,
+            use_blockchain=blockchain,
+            choice_count=len(record['choices']),
+        )
+        for question, record in zip(questions, records)
+    ], update_conflicts=True, unique_fields=['id'],
+        # Rows saved one at a time (MySQL) already got a listing from the signals
+        update_fields=['question_type', 'use_blockchain', 'choice_count'])
+    return len(questions), len(choices)
+
+
+def import_questions(rows: Iterable[ImportRow], blockchain: bool = False, queue: bool = False,
+                     batch_size: int = IMPORT_BATCH_SIZE,
+                     on_progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Bulk insert questions with their choices
+
+    Args:
+        rows: ``(line, record)`` pairs, e.g. from ``read_import_file``
+        blockchain (bool): Import as blockchain questions pending chain creation
+        queue (bool): Also add an outbox entry per blockchain question
+        batch_size (int): Questions inserted per transaction
+        on_progress (callable, optional): Called with the stats after each batch
+
+    Returns:
+        Dict[str, Any]: Counts (total, imported, choices, skipped) and
+        ``errors`` as ``{line: message}`` for the skipped records
+    """
+    stats = {"total": 0, "imported": 0, "choices": 0, "skipped": 0, "errors": {}}
+    using = router.db_for_write(Question)
+    batch = []
+
+    def flush():
+        with transaction.atomic(using=using):
+            imported, choice_count = _import_batch(batch, blockchain, queue, using)
+        stats["imported"] += imported
+        stats["choices"] += choice_count
+        batch.clear()
+        if on_progress:
+            on_progress(stats)
+
+    for line, record in rows:
+        stats["total"] += 1
+        cleaned, error = _clean_record(record, blockchain)
+        if cleaned is None:
+            stats["skipped"] += 1
+            stats["errors"][line] = error
+            continue
+        batch.append(cleaned)
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    logger.info(f"Imported {stats['imported']} questions ({stats['skipped']} skipped)")
+    return stats
@@ -0,0 +1,157 @@
+"""
+Pipelined Bulk Creation of Pending Questions on Chain
+
+``sync_pending_questions`` keeps up to ``concurrency`` ``createQuestion``
+transactions in flight instead of waiting for each receipt before sending
+the next one. Transactions are sent from one thread, so the nonce manager
+hands out consecutive nonces; receipts are awaited through the shared
+``receipt_tracker`` and each ``QuestionCreated`` event is mapped back to the
+row whose transaction emitted it.
+
+The transaction hash is stored on the row as soon as it is sent. An
+interrupted run therefore resumes by waiting for those transactions rather
+than sending duplicates; hashes the node no longer knows are sent again.
+"""
+
+from collections import deque
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+from .models import BlockchainQuestion
+from .outbox import complete_entries_for
+from .receipts import RECEIPT_TIMEOUT_SECONDS, receipt_tracker
+from .services import blockchain_service
+
+logger = logging.getLogger(__name__)
+
+SYNC_BATCH_SIZE = 100
+SYNC_CONCURRENCY = 16
+
+
+def pending_question_ids() -> List[int]:
+    return list(
+        BlockchainQuestion.objects.filter(use_blockchain=True, is_blockchain_synced=False)
+        .order_by('pk').values_list('pk', flat=True)
+    )
+
+
+def sync_pending_questions(question_ids: Optional[List[int]] = None,
+                           batch_size: int = SYNC_BATCH_SIZE,
+                           concurrency: int = SYNC_CONCURRENCY,
+                           timeout: float = RECEIPT_TIMEOUT_SECONDS,
+                           on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+                           on_result: Optional[Callable[[BlockchainQuestion, Dict[str, Any]], None]] = None
+                           ) -> Dict[str, Any]:
+    """
+    Create pending questions on chain with bounded concurrency
+
+    Args:
+        question_ids (list, optional): Questions to sync; all pending by default
+        batch_size (int): Questions loaded from the database at a time
+        concurrency (int): Maximum unconfirmed transactions in flight
+        timeout (float): Seconds to wait for each receipt; unmined
+            transactions keep their hash and are resumed by the next run
+        on_progress (callable, optional): Called with the stats after each
+            submission and confirmation
+        on_result (callable, optional): Called with each question and its
+            creation result
+
+    Returns:
+        Dict[str, Any]: Counts (total, synced, failed, resumed, in_flight) and
+        ``errors`` as ``{question_id: message}``
+    """
+    ids = pending_question_ids() if question_ids is None else list(question_ids)
+    stats = {"total": len(ids), "synced": 0, "failed": 0, "resumed": 0, "in_flight": 0, "errors": {}}
+    live = blockchain_service.is_available()
+    # Spans batches, so the pipeline does not drain at every batch boundary
+    in_flight = deque()
+
+    def report(question=None, result=None):
+        if on_result and question is not None:
+            on_result(question, result)
+        if on_progress:
+            on_progress(stats)
+
+    try:
+        for start in range(0, len(ids), batch_size):
+            questions = list(
+                BlockchainQuestion.objects.filter(
+                    pk__in=ids[start:start + batch_size], is_blockchain_synced=False
+                ).order_by('pk')
+            )
+            if live:
+                _submit_batch(questions, in_flight, concurrency, timeout, stats, report)
+            else:
+                # Mock mode has nothing to wait for
+                for question in questions:
+                    _record(question, question.create_on_blockchain(), stats, report)
+
+        while in_flight:
+            _confirm(in_flight, timeout, stats, report)
+    finally:
+        # An aborted run must not leave the poller watching its hashes
+        for question, future, _ in in_flight:
+            receipt_tracker.untrack(question.blockchain_tx_hash, future)
+    return stats
+
+
+def _submit_batch(questions, in_flight, concurrency, timeout, stats, report):
+    for question in questions:
+        if question.blockchain_tx_hash and blockchain_service.is_transaction_known(question.blockchain_tx_hash):
+            stats["resumed"] += 1
+            tx_hash, gas_key = question.blockchain_tx_hash, None
+        else:
+            choices = question.blockchain_choice_texts()
+            if len(choices) < 2:
+                _record(question, {"success": False, "error": "Minimum 2 choices required for blockchain"},
+                        stats, report)
+                continue
+            submitted = blockchain_service.submit_question_creation(question.question_text, choices)
+            if not submitted.get("success"):
+                _record(question, submitted, stats, report)
+                continue
+            tx_hash, gas_key = submitted["transaction_hash"], submitted["gas_key"]
+            # Persist before waiting so an interrupted run can resume this transaction
+            BlockchainQuestion.objects.filter(pk=question.pk).update(blockchain_tx_hash=tx_hash)
+            question.blockchain_tx_hash = tx_hash
+
+        in_flight.append((question, receipt_tracker.track(tx_hash), gas_key))
+        stats["in_flight"] = len(in_flight)
+        report()
+
+        while len(in_flight) >= concurrency:
+            _confirm(in_flight, timeout, stats, report)
+
+
+def _confirm(in_flight, timeout, stats, report):
+    """Wait for the oldest in-flight creation and record its outcome"""
+    question, future, gas_key = in_flight.popleft()
+    stats["in_flight"] = len(in_flight)
+    try:
+        receipt = future.result(timeout=timeout)
+    except FutureTimeoutError:
+        # Keep the hash: the next run waits for this transaction again.
+        # Stop polling for it meanwhile, it may have been dropped
+        receipt_tracker.untrack(question.blockchain_tx_hash, future)
+        _record(question, {"success": False, "error": f"Not mined after {timeout} seconds"}, stats, report)
+        return
+
+    result = blockchain_service.question_creation_result(receipt, gas_key)
+    if not result.get("success"):
+        # Reverted: clear the hash so the next run sends a new transaction
+        BlockchainQuestion.objects.filter(pk=question.pk).update(blockchain_tx_hash=None)
+    _record(question, result, stats, report)
+
+
+def _record(question, result, stats, report):
+    if result.get("success"):
+        if not question.is_blockchain_synced:
+            question.record_blockchain_creation(result)
+        complete_entries_for([question.pk])
+        stats["synced"] += 1
+    else:
+        stats["failed"] += 1
+        stats["errors"][question.pk] = result.get("error", "Unknown error")
+        logger.error(f"Bulk sync of question {question.pk} failed: {stats['errors'][question.pk]}")
+    report(question, result)
@@ -0,0 +1,94 @@
+"""
+Sync Checkpoints for Vote Reconciliation
+
+``run_reconciliation`` reads the block to resume from here and records each
+run's head block and totals, which also feed ``/metrics``.
+
+The checkpoint only covers blocks a later run has no reason to read again:
+it stays ``LOG_CONFIRMATIONS`` blocks behind the head (a reorg could still
+change those) and, while some local question is still waiting for its blockchain id (an
+open outbox entry or a sent creation transaction), before the first vote
+skipped because its question was not mirrored. Votes for questions this
+database will never mirror do not hold it back. Re-reading blocks is
+harmless, since vote ingestion is idempotent.
+"""
+
+from typing import Optional
+
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from .logstore import LOG_CONFIRMATIONS
+from .models import BlockchainOutbox, BlockchainQuestion, SyncCheckpoint
+
+VOTES_STREAM = 'votes'
+
+
+def get_checkpoint(name: str = VOTES_STREAM) -> Optional[SyncCheckpoint]:
+    return SyncCheckpoint.objects.filter(name=name).first()
+
+
+def next_from_block(name: str = VOTES_STREAM) -> int:
+    """First block not yet covered by the stream"""
+    checkpoint = get_checkpoint(name)
+    return checkpoint.last_block + 1 if checkpoint else 0
+
+
+def awaiting_mirror() -> bool:
+    """Whether a local question may still receive its blockchain id"""
+    unsynced = BlockchainQuestion.objects.filter(use_blockchain=True, is_blockchain_synced=False)
+    if unsynced.exclude(blockchain_tx_hash__isnull=True).exclude(blockchain_tx_hash='').exists():
+        return True
+    return BlockchainOutbox.objects.filter(
+        question__in=unsynced,
+        status__in=[BlockchainOutbox.STATUS_PENDING, BlockchainOutbox.STATUS_PROCESSING],
+    ).exists()
+
+
+def skipped_block_to_hold(first_skipped_block: Optional[int]) -> Optional[int]:
+    """
+    The skipped block the checkpoint must stay before, if any
+
+    A skipped vote is only worth reading again while some local question is
+    waiting for its blockchain id; otherwise it belongs to a question this
+    database will never mirror and must not pin the checkpoint.
+    """
+    if first_skipped_block is None or not awaiting_mirror():
+        return None
+    return first_skipped_block
+
+
+def covered_block(head_block: int, first_skipped_block: Optional[int] = None,
+                  confirmations: int = LOG_CONFIRMATIONS) -> int:
+    """Last block a run through ``head_block`` may mark as synced"""
+    block = head_block - confirmations
+    if first_skipped_block is not None:
+        block = min(block, first_skipped_block - 1)
+    return block
+
+
+def record_sync_run(head_block: int, votes: int, seconds: float, first_skipped_block: Optional[int] = None,
+                    confirmations: int = LOG_CONFIRMATIONS, name: str = VOTES_STREAM) -> SyncCheckpoint:
+    """
+    Advance the checkpoint after a successful run
+
+    Args:
+        head_block (int): Chain head read before fetching events; every
+            event up to it has been ingested
+        votes (int): Votes inserted by the run
+        seconds (float): Run duration
+        first_skipped_block (Optional[int]): Lowest block with a vote skipped
+            because its question is not mirrored locally yet
+        confirmations (int): Unconfirmed blocks behind the head to read again
+    """
+    last_block = covered_block(head_block, first_skipped_block, confirmations)
+    SyncCheckpoint.objects.get_or_create(name=name)
+    # Never move backwards (e.g. a run against an unavailable node reports head 0)
+    SyncCheckpoint.objects.filter(name=name).update(
+        last_block=Greatest(F('last_block'), last_block),
+        head_block=Greatest(F('head_block'), head_block),
+        votes_ingested=F('votes_ingested') + votes,
+        last_run_votes=votes,
+        last_run_seconds=seconds,
+    )
+    return get_checkpoint(name)
@@ -4,6 +4,7 @@ Web3 Configuration for Django-Blockchain Integration
 
 from web3 import Web3
 from django.conf import settings
+from polls.metrics import RPC_LATENCY
 import json
 import os
 
@@ -160,6 +161,18 @@ VOTING_CONTRACT_ABI = [
 ]
 
 
+class InstrumentedHTTPProvider(Web3.HTTPProvider):
+    """HTTP provider that records the latency of every JSON-RPC call"""
+    
+    def make_request(self, method, params):
+        with RPC_LATENCY.labels(method=method).time():
+            return super().make_request(method, params)
+    
+    def make_batch_request(self, requests):
+        with RPC_LATENCY.labels(method='batch').time():
+            return super().make_batch_request(requests)
+
+
 class Web3Manager:
     """
     Singleton manager for Web3 connections and contract interactions
@@ -189,7 +202,7 @@ class Web3Manager:
                 return
             
             # Connect to Hardhat local network
-            self._web3 = Web3(Web3.HTTPProvider(HARDHAT_RPC_URL))
+            self._web3 = Web3(InstrumentedHTTPProvider(HARDHAT_RPC_URL))
             
             # Verify connection
             if not self._web3.is_connected():
@@ -0,0 +1,175 @@
+"""
+Cached Fee Oracle for Transaction Building
+
+Keeps the current fee parameters (EIP-1559 base/priority fee, or legacy gas
+price on pre-London chains) fresh from a background thread, and learns gas
+limits from the ``gasUsed`` of past successful receipts. Building a
+transaction then needs no extra RPC calls.
+
+Learned limits only ever lower the static default, with a wide margin: a
+call that writes a cold storage slot (a choice's first vote, a longer
+question within the same size bucket) costs far more than the warm calls
+that usually fill the sample window.
+"""
+
+from collections import defaultdict, deque
+from typing import Any, Callable, Dict, Hashable, Optional
+import logging
+import threading
+import time
+
+from .config import get_web3
+
+logger = logging.getLogger(__name__)
+
+# Fallback gas limits used until a receipt for the function has been seen
+DEFAULT_GAS_LIMITS = {
+    'createQuestion': 2000000,
+    'vote': 200000,
+}
+
+FEE_TTL_SECONDS = 10
+GAS_HEADROOM = 2.0          # Margin on top of the largest observed gasUsed
+GAS_SAMPLES = 20            # Recent receipts remembered per key
+BASE_FEE_MULTIPLIER = 2     # maxFeePerGas survives this many base fee doublings
+
+
+class FeeOracle:
+    """
+    Fee parameters and gas limits served from memory
+    """
+
+    def __init__(self, web3_getter: Callable = get_web3, ttl: float = FEE_TTL_SECONDS,
+                 background: bool = True):
+        self._web3_getter = web3_getter
+        self.ttl = ttl
+        self.background = background
+        self._fees: Optional[Dict[str, int]] = None
+        self._fetched_at = 0.0
+        self._gas_used = defaultdict(lambda: deque(maxlen=GAS_SAMPLES))
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Fees
+    # ------------------------------------------------------------------
+
+    def refresh(self) -> Dict[str, int]:
+        """Fetch fee parameters from the node and cache them"""
+        web3 = self._web3_getter()
+        if web3 is None:
+            raise ConnectionError("Blockchain not available")
+
+        latest = web3.eth.get_block('latest')
+        base_fee = latest.get('baseFeePerGas') if hasattr(latest, 'get') else None
+
+        if base_fee is not None:
+            priority_fee = web3.eth.max_priority_fee
+            fees = {
+                'maxFeePerGas': base_fee * BASE_FEE_MULTIPLIER + priority_fee,
+                'maxPriorityFeePerGas': priority_fee,
+            }
+        else:
+            fees = {'gasPrice': web3.eth.gas_price}
+
+        with self._lock:
+            self._fees = fees
+            self._fetched_at = time.monotonic()
+        return dict(fees)
+
+    def is_fresh(self) -> bool:
+        return self._fees is not None and time.monotonic() - self._fetched_at < self.ttl
+
+    def fee_params(self) -> Dict[str, int]:
+        """
+        Fee fields to merge into a transaction dict
+
+        Served from cache while fresh; the background refresher keeps it so.
+        """
+        self.ensure_started()
+        with self._lock:
+            if self.is_fresh():
+                self.hits += 1
+                return dict(self._fees)
+            self.misses += 1
+        return self.refresh()
+
+    # ------------------------------------------------------------------
+    # Gas limits
+    # ------------------------------------------------------------------
+
+    def gas_limit(self, key: Hashable, default: Optional[int] = None) -> int:
+        """
+        Gas limit for a function call
+
+        Args:
+            key: Function name, or a (name, size bucket) tuple for calls whose
+                cost grows with their input
+            default (int, optional): Upper limit instead of the static default
+
+        Returns:
+            int: The static default, lowered to ``GAS_HEADROOM`` times the
+            largest learned ``gasUsed`` when that is smaller
+        """
+        if default is None:
+            name = key[0] if isinstance(key, tuple) else key
+            default = DEFAULT_GAS_LIMITS.get(name, DEFAULT_GAS_LIMITS['createQuestion'])
+        samples = self._gas_used.get(key)
+        if samples:
+            return min(default, int(max(samples) * GAS_HEADROOM))
+        return default
+
+    def record_gas_used(self, key: Hashable, gas_used: int, status: int = 1) -> None:
+        """Learn from a mined receipt's ``gasUsed``; reverted receipts are ignored"""
+        if gas_used and status != 0:
+            self._gas_used[key].append(int(gas_used))
+
+    # ------------------------------------------------------------------
+    # Background refresh
+    # ------------------------------------------------------------------
+
+    def ensure_started(self) -> None:
+        """Start the background refresher once a node is reachable"""
+        if not self.background or self._thread is not None or self._web3_getter() is None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name='fee-oracle', daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.warning(f"Fee refresh failed: {e}")
+            self._stop.wait(self.ttl / 2)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'fees': dict(self._fees) if self._fees else None,
+            'hits': self.hits,
+            'misses': self.misses,
+            'learned_gas_keys': len(self._gas_used),
+        }
+
+
+def create_question_gas_key(question_text: str, choices) -> tuple:
+    """Gas cache key for createQuestion, bucketed by payload size"""
+    payload = len(question_text.encode()) + sum(len(c.encode()) for c in choices)
+    return ('createQuestion', len(choices), payload // 128)
+
+
+# Global fee oracle
+fee_oracle = FeeOracle()
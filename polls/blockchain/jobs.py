@@ -0,0 +1,205 @@
+"""
+Background Jobs for Admin Bulk Actions
+
+Admin actions over many questions record a ``BlockchainJob`` and return
+immediately; the chain round-trips run in a background thread that stores
+each question's outcome on the job as it goes, so the progress page can
+show them live. Submitting a selection that an active job already covers
+joins that job instead of starting a duplicate.
+"""
+
+from datetime import timedelta
+from typing import Any, Dict, Iterable, Optional, Tuple
+import hashlib
+import logging
+import threading
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from polls.listing import refresh_question_listings
+from .bulk_sync import sync_pending_questions
+from .models import BlockchainJob, BlockchainQuestion
+
+logger = logging.getLogger(__name__)
+
+# Running jobs not updated for this long were lost with their process
+JOB_LEASE = timedelta(minutes=10)
+
+# Inserts tried when competing requests keep finishing their identical job first
+ENQUEUE_ATTEMPTS = 3
+
+
+def job_fingerprint(kind: str, question_ids: Iterable[int]) -> str:
+    ids = ','.join(str(pk) for pk in sorted(set(question_ids)))
+    return hashlib.sha256(f"{kind}:{ids}".encode()).hexdigest()
+
+
+def abandon_stale_jobs() -> int:
+    """Fail running jobs whose worker stopped reporting, so they stop coalescing"""
+    return BlockchainJob.objects.filter(
+        status=BlockchainJob.STATUS_RUNNING,
+        updated_at__lt=timezone.now() - JOB_LEASE
+    ).update(
+        status=BlockchainJob.STATUS_FAILED,
+        error='Abandoned: no progress within the lease',
+        finished_at=timezone.now()
+    )
+
+
+def enqueue_job(kind: str, question_ids: Iterable[int], user=None) -> Tuple[BlockchainJob, bool]:
+    """
+    Record a job over ``question_ids`` and start it once the transaction commits
+
+    Questions already queued in an active job of the same kind are left to
+    that job; if none remain, that job is returned instead.
+
+    Returns:
+        Tuple[BlockchainJob, bool]: The job and whether it was created
+    """
+    ids = sorted(set(int(pk) for pk in question_ids))
+    abandon_stale_jobs()
+    active = BlockchainJob.objects.filter(kind=kind, status__in=BlockchainJob.ACTIVE_STATUSES)
+
+    existing = active.filter(fingerprint=job_fingerprint(kind, ids)).first()
+    if existing:
+        return existing, False
+
+    covering = {}
+    for job in active.order_by('created_at'):
+        for pk in job.question_ids:
+            covering.setdefault(pk, job)
+    remaining = [pk for pk in ids if pk not in covering]
+    if not remaining:
+        return covering[ids[0]], False
+
+    fingerprint = job_fingerprint(kind, remaining)
+    for attempt in range(ENQUEUE_ATTEMPTS):
+        try:
+            with transaction.atomic():
+                job = BlockchainJob.objects.create(
+                    kind=kind,
+                    fingerprint=fingerprint,
+                    question_ids=remaining,
+                    total=len(remaining),
+                    created_by=user if user is not None and user.is_authenticated else None,
+                )
+        except IntegrityError:
+            # Another request enqueued the same selection concurrently; join its
+            # job, or insert again if that job already finished
+            competing = active.filter(fingerprint=fingerprint).first()
+            if competing is not None:
+                return competing, False
+            if attempt == ENQUEUE_ATTEMPTS - 1:
+                raise
+            continue
+        transaction.on_commit(lambda: start_job(job.pk))
+        return job, True
+
+
+def start_job(job_id: int) -> None:
+    """Run the job in a background thread (inline if BLOCKCHAIN_JOBS_BACKGROUND is off)"""
+    if not getattr(settings, 'BLOCKCHAIN_JOBS_BACKGROUND', True):
+        run_job(job_id)
+        return
+    threading.Thread(
+        target=_run_in_thread, args=(job_id,), name=f'blockchain-job-{job_id}', daemon=True
+    ).start()
+
+
+def _run_in_thread(job_id: int) -> None:
+    try:
+        run_job(job_id)
+    finally:
+        # Worker threads own their DB connection
+        connection.close()
+
+
+def run_job(job_id: int) -> Optional[BlockchainJob]:
+    """
+    Claim and execute a pending job
+
+    Returns:
+        Optional[BlockchainJob]: The finished job, or None if it was already claimed
+    """
+    claimed = BlockchainJob.objects.filter(
+        pk=job_id, status=BlockchainJob.STATUS_PENDING
+    ).update(status=BlockchainJob.STATUS_RUNNING, updated_at=timezone.now())
+    if not claimed:
+        return None
+
+    job = BlockchainJob.objects.get(pk=job_id)
+    try:
+        if job.kind == BlockchainJob.KIND_SYNC_TO:
+            _sync_to_blockchain(job)
+        else:
+            _sync_from_blockchain(job)
+        job.status = BlockchainJob.STATUS_DONE
+    except Exception as e:
+        logger.error(f"Blockchain job {job.pk} failed: {e}")
+        job.status = BlockchainJob.STATUS_FAILED
+        job.error = str(e)
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'finished_at', 'updated_at'])
+    return job
+
+
+def _record_outcome(job: BlockchainJob, question_id: int, result: Dict[str, Any]) -> None:
+    success = bool(result.get('success'))
+    job.results[str(question_id)] = {
+        'success': success,
+        'error': '' if success else result.get('error', 'Unknown error'),
+        'detail': result.get('detail') or result.get('transaction_hash') or '',
+    }
+    job.processed += 1
+    job.succeeded += success
+    job.save(update_fields=['results', 'processed', 'succeeded', 'updated_at'])
+
+
+def _record_missing(job: BlockchainJob, found) -> None:
+    for pk in job.question_ids:
+        if pk not in found:
+            _record_outcome(job, pk, {'success': False, 'error': 'Question not found'})
+
+
+def _sync_to_blockchain(job: BlockchainJob) -> None:
+    questions = BlockchainQuestion.objects.filter(pk__in=job.question_ids)
+    enabled = list(questions.filter(use_blockchain=False).values_list('pk', flat=True))
+    if enabled:
+        questions.filter(pk__in=enabled).update(use_blockchain=True)
+        refresh_question_listings(enabled)
+
+    states = dict(questions.values_list('pk', 'is_blockchain_synced'))
+    _record_missing(job, states)
+    pending = []
+    for pk in job.question_ids:
+        if states.get(pk):
+            _record_outcome(job, pk, {'success': True, 'detail': 'Already synced'})
+        elif pk in states:
+            pending.append(pk)
+
+    sync_pending_questions(
+        pending,
+        on_result=lambda question, result: _record_outcome(job, question.pk, result)
+    )
+    # Rows synced meanwhile by another worker are skipped by the bulk sync
+    for pk in pending:
+        if str(pk) not in job.results:
+            _record_outcome(job, pk, {'success': True, 'detail': 'Already synced'})
+
+
+def _sync_from_blockchain(job: BlockchainJob) -> None:
+    questions = {q.pk: q for q in BlockchainQuestion.objects.filter(pk__in=job.question_ids)}
+    _record_missing(job, questions)
+    for pk in job.question_ids:
+        question = questions.get(pk)
+        if question is None:
+            continue
+        if not question.is_blockchain_synced:
+            result = {'success': False, 'error': 'Question not synced with blockchain'}
+        else:
+            result = question.sync_from_blockchain()
+            if result.get('success'):
+                result = {'success': True, 'detail': f"On-chain ID {question.blockchain_id} checked"}
+        _record_outcome(job, pk, result)
@@ -0,0 +1,320 @@
+"""
+Segmented On-Disk Cache of Raw VoteCast Logs
+
+Fetching the VoteCast history is the slowest call we make to the node, and
+every re-sync, rebuild or fresh environment used to repeat it from block 0.
+The Web3 gateway now keeps the logs it fetches in a local append-only store
+and asks the node only for blocks the store does not cover yet.
+
+Layout of a store directory::
+
+    index.json          chain id, covered block range (and the hash of its last
+                        block) and the ordered segment list
+    00000000.seg        fixed-size binary records, ordered by (block, log index)
+    00000001.seg        a new segment starts every SEGMENT_MAX_RECORDS records
+    ...
+
+The index is the commit point: it records how many records of each segment
+are valid and is replaced atomically after the segment data is flushed.
+Bytes past a segment's committed length (from an interrupted write) are
+ignored by readers and truncated by the next write. Reads memory-map each
+segment and binary-search its first block, so replaying a range never
+parses the records before it.
+
+Only blocks at least ``confirmations`` behind the head are stored; the
+unconfirmed tail, which a reorg could still change, is always fetched live.
+
+A store is keyed by contract address, which a restarted Hardhat node hands
+out again to a fresh deployment. ``open()`` therefore checks the recorded
+chain id and the hash of the last covered block against the node and
+discards the whole store when either no longer matches.
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+from itertools import chain
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import json
+import logging
+import mmap
+import os
+import struct
+import threading
+
+from django.conf import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process lock applies
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# question_id, choice_index, block_number, log_index, voter, tx_hash
+RECORD = struct.Struct('<QIQI42s66s')
+SEGMENT_MAX_RECORDS = 65536
+INDEX_NAME = 'index.json'
+
+# Blocks behind the head before their logs are cached (reorg safety)
+LOG_CONFIRMATIONS = 12
+# Largest block range requested from the node in one get_logs call
+LOG_FETCH_SPAN = 10000
+
+FetchRange = Callable[[int, int], List[Dict[str, Any]]]
+# Hash of a block as the node reports it, or None if it has no such block
+BlockHash = Callable[[int], Optional[str]]
+
+
+def _encode(event: Dict[str, Any]) -> bytes:
+    return RECORD.pack(
+        event['question_id'], event['choice_index'], event['block_number'], event['log_index'],
+        str(event['voter']).encode(), str(event['tx_hash']).encode(),
+    )
+
+
+def _decode(record: Tuple) -> Dict[str, Any]:
+    question_id, choice_index, block_number, log_index, voter, tx_hash = record
+    return {
+        'question_id': question_id,
+        'choice_index': choice_index,
+        'voter': voter.rstrip(b'\0').decode(),
+        'tx_hash': tx_hash.rstrip(b'\0').decode(),
+        'block_number': block_number,
+        'log_index': log_index,
+    }
+
+
+def _block_at(buffer, position: int) -> int:
+    return RECORD.unpack_from(buffer, position * RECORD.size)[2]
+
+
+class SegmentedLogStore:
+    """Append-only, block-ordered store of VoteCast logs for one contract"""
+
+    def __init__(self, directory, segment_max_records: int = SEGMENT_MAX_RECORDS):
+        self.directory = Path(directory)
+        self.segment_max_records = segment_max_records
+        self.chain_id: Optional[int] = None
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def _load_index(self) -> Dict[str, Any]:
+        try:
+            with open(self.directory / INDEX_NAME, encoding='utf-8') as handle:
+                return json.load(handle)
+        except FileNotFoundError:
+            return {'chain_id': None, 'first_block': None, 'last_block': None, 'last_block_hash': None,
+                    'next_segment': 0, 'segments': []}
+
+    def _save_index(self, index: Dict[str, Any]) -> None:
+        tmp = self.directory / f'{INDEX_NAME}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as handle:
+            json.dump(index, handle)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp, self.directory / INDEX_NAME)
+
+    @contextmanager
+    def _locked(self):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(self.directory / '.lock', 'a') as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def open(self, chain_id: Optional[int] = None, block_hash: Optional[BlockHash] = None) -> bool:
+        """
+        Bind the store to the node's chain, discarding it if it is stale
+
+        The store is dropped when it was written for another chain id or
+        when the node no longer has the recorded last covered block (a
+        restarted devnet, a reorg deeper than the confirmations). Checks
+        whose argument is None are skipped.
+
+        Returns:
+            bool: True if the cached logs were discarded
+        """
+        with self._locked():
+            index = self._load_index()
+            self.chain_id = chain_id
+            if index['first_block'] is None:
+                return False
+            stale = chain_id is not None and index.get('chain_id') != chain_id
+            if not stale and block_hash is not None:
+                recorded = index.get('last_block_hash')
+                stale = recorded is None or block_hash(index['last_block']) != recorded
+            if stale:
+                logger.warning(f"Discarding stale VoteCast log cache in {self.directory}")
+                self._discard(index)
+            return stale
+
+    def _discard(self, index: Dict[str, Any]) -> None:
+        # Drop the index first: segments without it are never read
+        (self.directory / INDEX_NAME).unlink(missing_ok=True)
+        for segment in index['segments']:
+            (self.directory / segment['name']).unlink(missing_ok=True)
+
+    def covered_range(self) -> Optional[Tuple[int, int]]:
+        """``(first_block, last_block)`` whose logs are all on disk, or None"""
+        index = self._load_index()
+        if index['first_block'] is None:
+            return None
+        return index['first_block'], index['last_block']
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def store(self, events: List[Dict[str, Any]], from_block: int, to_block: int,
+              to_block_hash: Optional[str] = None) -> None:
+        """
+        Record every log of blocks ``from_block..to_block``
+
+        The range must extend the covered range at either end (or start an
+        empty store); ``events`` are all the logs of that range.
+        ``to_block_hash`` is kept when the range becomes the covered end, for
+        ``open()`` to check.
+        """
+        records = [_encode(e) for e in sorted(events, key=lambda e: (e['block_number'], e['log_index']))]
+        with self._locked():
+            index = self._load_index()
+            first, last = index['first_block'], index['last_block']
+            if first is None:
+                index['chain_id'] = self.chain_id
+                index['first_block'], index['last_block'] = from_block, to_block
+                index['last_block_hash'] = to_block_hash
+                self._append(index, records, events)
+            elif from_block == last + 1:
+                index['last_block'], index['last_block_hash'] = to_block, to_block_hash
+                self._append(index, records, events)
+            elif to_block == first - 1:
+                index['first_block'] = from_block
+                self._prepend(index, records, events)
+            else:
+                raise ValueError(
+                    f"Blocks {from_block}-{to_block} are not adjacent to the cached range {first}-{last}"
+                )
+            self._save_index(index)
+
+    def _new_segment(self, index) -> Dict[str, Any]:
+        segment = {'name': f"{index['next_segment']:08d}.seg", 'records': 0,
+                   'first_block': None, 'last_block': None}
+        index['next_segment'] += 1
+        return segment
+
+    def _write(self, segment, records: List[bytes], blocks: List[int]) -> None:
+        with open(self.directory / segment['name'], 'ab') as handle:
+            # Drop anything an interrupted write left past the committed length
+            handle.truncate(segment['records'] * RECORD.size)
+            handle.write(b''.join(records))
+            handle.flush()
+            os.fsync(handle.fileno())
+        if segment['first_block'] is None:
+            segment['first_block'] = blocks[0]
+        segment['last_block'] = blocks[-1]
+        segment['records'] += len(records)
+
+    def _append(self, index, records: List[bytes], events) -> None:
+        blocks = sorted(e['block_number'] for e in events)
+        segments = index['segments']
+        position = 0
+        while position < len(records):
+            if not segments or segments[-1]['records'] >= self.segment_max_records:
+                segments.append(self._new_segment(index))
+            segment = segments[-1]
+            room = self.segment_max_records - segment['records']
+            end = position + room
+            self._write(segment, records[position:end], blocks[position:end])
+            position = end
+
+    def _prepend(self, index, records: List[bytes], events) -> None:
+        blocks = sorted(e['block_number'] for e in events)
+        front = []
+        for start in range(0, len(records), self.segment_max_records):
+            segment = self._new_segment(index)
+            end = start + self.segment_max_records
+            self._write(segment, records[start:end], blocks[start:end])
+            front.append(segment)
+        index['segments'] = front + index['segments']
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def read(self, from_block: int, to_block: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Yield the stored logs of ``from_block..to_block`` in chain order"""
+        for segment in self._load_index()['segments']:
+            count = segment['records']
+            if not count or segment['last_block'] < from_block:
+                continue
+            if to_block is not None and segment['first_block'] > to_block:
+                break
+            # Records are decoded straight from the map, which stays open while
+            # they are consumed; writers only touch bytes past ``count``
+            with open(self.directory / segment['name'], 'rb') as handle, \
+                    mmap.mmap(handle.fileno(), count * RECORD.size, access=mmap.ACCESS_READ) as mapped:
+                low, high = 0, count
+                while low < high:
+                    middle = (low + high) // 2
+                    if _block_at(mapped, middle) < from_block:
+                        low = middle + 1
+                    else:
+                        high = middle
+                for position in range(low, count):
+                    record = RECORD.unpack_from(mapped, position * RECORD.size)
+                    if to_block is not None and record[2] > to_block:
+                        return
+                    yield _decode(record)
+
+
+def vote_log_dir() -> Optional[Path]:
+    directory = getattr(settings, 'VOTE_LOG_DIR', '')
+    return Path(directory) if directory else None
+
+
+def fetch_with_cache(store: SegmentedLogStore, from_block: int, head: int, fetch_range: FetchRange,
+                     confirmations: int = LOG_CONFIRMATIONS, span: int = LOG_FETCH_SPAN,
+                     chain_id: Optional[int] = None,
+                     block_hash: Optional[BlockHash] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Logs of ``from_block..head``, asking the node only for what is not on disk
+
+    Confirmed blocks missing from the store are fetched in ``span``-sized
+    ranges and stored as they arrive, so an interrupted download resumes
+    where it stopped. Unconfirmed blocks are fetched live and not stored.
+
+    Every node call happens before this returns; the stored logs are then
+    streamed from the segment maps as the result is consumed. ``chain_id``
+    and ``block_hash`` are passed to ``store.open()`` first.
+    """
+    store.open(chain_id, block_hash)
+    confirmed = head - confirmations
+    if confirmed >= from_block:
+        covered = store.covered_range()
+        if covered is None:
+            start = from_block
+        else:
+            first, start = covered[0], covered[1] + 1
+            # Older history than the store holds: prepend it, newest range first
+            end = first - 1
+            while end >= from_block:
+                begin = max(from_block, end - span + 1)
+                store.store(fetch_range(begin, end), begin, end)
+                end = begin - 1
+        while start <= confirmed:
+            end = min(confirmed, start + span - 1)
+            store.store(fetch_range(start, end), start, end, block_hash(end) if block_hash else None)
+            start = end + 1
+        stored = store.read(from_block, confirmed)
+    else:
+        stored, confirmed = iter(()), from_block - 1
+
+    live = fetch_range(confirmed + 1, head) if head > confirmed else []
+    return chain(stored, live)
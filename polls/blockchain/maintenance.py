@@ -0,0 +1,189 @@
+"""
+Chunked, Resumable Maintenance Deletes
+
+Resetting the sync state or purging a question used to delete every vote in
+one statement, and Django's cascade collector loads the rows it deletes.
+Here rows are removed in primary-key order, ``chunk_size`` at a time, each
+chunk in its own short transaction. Tables without cascades or delete
+signals (votes, outbox entries) are deleted with a raw ``DELETE`` that never
+loads the rows.
+
+Every chunk commits on its own, so an interrupted run leaves a consistent
+tree and running it again continues with what is left. ``pause`` sleeps
+between chunks so other writers get the database in production.
+"""
+
+from typing import Callable, Dict, Optional
+import logging
+import time
+
+from django.db import transaction
+from django.db.models.deletion import Collector
+
+from polls.listing import refresh_question_listings
+from polls.models import Question
+from .archive import archive_path
+from .checkpoint import VOTES_STREAM
+from .models import BlockchainOutbox, BlockchainQuestion, BlockchainVote, SyncCheckpoint, VoteArchive
+
+logger = logging.getLogger(__name__)
+
+MAINTENANCE_CHUNK_SIZE = 5000
+
+ProgressCallback = Callable[[str, int], None]
+
+
+def _delete_rows(queryset) -> int:
+    using = queryset.db
+    if Collector(using=using, origin=queryset).can_fast_delete(queryset):
+        # No cascades or delete signals: one DELETE without loading the rows
+        return queryset._raw_delete(using)
+    return queryset.delete()[0]
+
+
+def delete_in_chunks(queryset, chunk_size: int = MAINTENANCE_CHUNK_SIZE, pause: float = 0,
+                     on_progress: Optional[ProgressCallback] = None, label: str = '') -> int:
+    """
+    Delete the rows of ``queryset`` in primary-key chunks
+
+    Args:
+        queryset: Rows to delete
+        chunk_size (int): Rows deleted per transaction
+        pause (float): Seconds to sleep between chunks
+        on_progress (callable, optional): Called with ``label`` and the
+            running total after each chunk
+        label (str): Name passed to ``on_progress``
+
+    Returns:
+        int: Number of rows deleted
+    """
+    model, using = queryset.model, queryset.db
+    pks = queryset.order_by('pk').values_list('pk', flat=True)
+    deleted, last_pk = 0, None
+    while True:
+        page = pks if last_pk is None else pks.filter(pk__gt=last_pk)
+        chunk = list(page[:chunk_size])
+        if not chunk:
+            return deleted
+        with transaction.atomic(using=using):
+            deleted += _delete_rows(model._base_manager.using(using).filter(pk__in=chunk))
+        last_pk = chunk[-1]
+        if on_progress:
+            on_progress(label, deleted)
+        if pause and len(chunk) == chunk_size:
+            time.sleep(pause)
+
+
+def purge_votes(question_id: Optional[int] = None, from_block: Optional[int] = None,
+                to_block: Optional[int] = None, chunk_size: int = MAINTENANCE_CHUNK_SIZE,
+                pause: float = 0, on_progress: Optional[ProgressCallback] = None) -> int:
+    """
+    Delete blockchain votes, optionally limited to a question and a block range
+
+    Block bounds are inclusive. Returns the number of votes deleted.
+    """
+    votes = BlockchainVote.objects.all()
+    if question_id is not None:
+        votes = votes.filter(question_id=question_id)
+    if from_block is not None:
+        votes = votes.filter(block_number__gte=from_block)
+    if to_block is not None:
+        votes = votes.filter(block_number__lte=to_block)
+    return delete_in_chunks(votes, chunk_size, pause, on_progress, label='votes')
+
+
+def purge_question(question_id: int, chunk_size: int = MAINTENANCE_CHUNK_SIZE, pause: float = 0,
+                   on_progress: Optional[ProgressCallback] = None) -> Dict[str, int]:
+    """
+    Delete a question after draining its large dependent tables in chunks
+
+    Votes and outbox entries go first; the final cascade then only touches
+    the question's choices and at most one archive row.
+
+    Returns:
+        Dict[str, int]: Rows deleted per table (votes, outbox, archive, questions)
+    """
+    stats = {
+        'votes': purge_votes(question_id=question_id, chunk_size=chunk_size, pause=pause,
+                             on_progress=on_progress),
+        'outbox': delete_in_chunks(BlockchainOutbox.objects.filter(question_id=question_id),
+                                   chunk_size, pause, on_progress, label='outbox'),
+        'archive': 0,
+        'questions': 0,
+    }
+
+    archive = VoteArchive.objects.filter(question_id=question_id).first()
+    question = Question.objects.filter(pk=question_id).first()
+    if question is not None:
+        # Cascades to choices; signals refresh the listing row
+        question.delete()
+        stats['questions'] = 1
+    if archive is not None:
+        archive_path(archive).unlink(missing_ok=True)
+        stats['archive'] = 1
+
+    logger.info(f"Purged Q{question_id}: {stats}")
+    return stats
+
+
+def purge_archives(chunk_size: int = MAINTENANCE_CHUNK_SIZE, pause: float = 0,
+                   on_progress: Optional[ProgressCallback] = None) -> int:
+    """
+    Delete every ``VoteArchive`` row and its file
+
+    Each file is removed after its row is gone, so readers never find a row
+    whose file is missing. Returns the number of archives deleted.
+    """
+    deleted = 0
+    while True:
+        chunk = list(VoteArchive.objects.order_by('pk')[:chunk_size])
+        if not chunk:
+            return deleted
+        with transaction.atomic():
+            deleted += VoteArchive.objects.filter(pk__in=[a.pk for a in chunk]).delete()[0]
+        for archive in chunk:
+            archive_path(archive).unlink(missing_ok=True)
+        if on_progress:
+            on_progress('archives', deleted)
+        if pause and len(chunk) == chunk_size:
+            time.sleep(pause)
+
+
+def reset_sync_state(chunk_size: int = MAINTENANCE_CHUNK_SIZE, pause: float = 0,
+                     on_progress: Optional[ProgressCallback] = None) -> Dict[str, int]:
+    """
+    Mark every synced question as unsynced and delete all blockchain votes
+
+    The votes checkpoint goes first, so reconciliation reads from block 0
+    again even if the reset is interrupted; archived votes (rows and files)
+    go last, so ``add_if_absent`` no longer skips their blocks.
+
+    Returns:
+        Dict[str, int]: Questions reset, votes and archives deleted
+    """
+    SyncCheckpoint.objects.filter(name=VOTES_STREAM).delete()
+
+    synced = BlockchainQuestion.objects.filter(is_blockchain_synced=True).order_by('pk')
+    reset = 0
+    while True:
+        # Reset rows leave the filter, so each pass picks up the next chunk
+        chunk = list(synced.values_list('pk', flat=True)[:chunk_size])
+        if not chunk:
+            break
+        with transaction.atomic():
+            reset += BlockchainQuestion.objects.filter(pk__in=chunk).update(
+                is_blockchain_synced=False,
+                blockchain_id=None,
+                blockchain_tx_hash='',
+                blockchain_created_at=None
+            )
+            # update() bypasses signals; bring the listing read model up to date
+            refresh_question_listings(chunk)
+        if on_progress:
+            on_progress('questions', reset)
+        if pause and len(chunk) == chunk_size:
+            time.sleep(pause)
+
+    votes = delete_in_chunks(BlockchainVote.objects.all(), chunk_size, pause, on_progress, label='votes')
+    archives = purge_archives(chunk_size, pause, on_progress)
+    return {'questions': reset, 'votes': votes, 'archives': archives}
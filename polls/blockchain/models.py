@@ -5,10 +5,12 @@ These models extend the existing Django models with blockchain functionality,
 allowing questions and votes to be stored both in Django database and on blockchain.
 """
 
-from django.db import models
+from django.conf import settings
+from django.db import connections, models, router, transaction
 from django.utils import timezone
 from django.core.exceptions import ValidationError
 from polls.models import Question as BaseQuestion, Choice as BaseChoice
+from .receipts import receipt_tracker
 from .services import blockchain_service
 from typing import List, Dict, Any, Optional
 import logging
@@ -21,11 +23,12 @@ class BlockchainQuestion(BaseQuestion):
     Extended Question model with blockchain integration
     """
     # Blockchain-specific fields
-    blockchain_id = models.IntegerField(null=True, blank=True, help_text="Question ID on blockchain")
+    blockchain_id = models.IntegerField(null=True, blank=True, unique=True, help_text="Question ID on blockchain")
     blockchain_tx_hash = models.CharField(max_length=66, null=True, blank=True, help_text="Transaction hash of creation")
     is_blockchain_synced = models.BooleanField(default=False, help_text="Is synced with blockchain")
     use_blockchain = models.BooleanField(default=False, help_text="Use blockchain for this question")
     blockchain_created_at = models.DateTimeField(null=True, blank=True, help_text="When created on blockchain")
+    closed_at = models.DateTimeField(null=True, blank=True, help_text="When voting closed (votes may then be archived)")
     
     # Custom manager (will be defined later)
     objects = None  # Will be set after manager class definition
@@ -34,19 +37,32 @@ class BlockchainQuestion(BaseQuestion):
         verbose_name = "Blockchain Question"
         verbose_name_plural = "Blockchain Questions"
         ordering = ['-pub_date']
+        indexes = [
+            # pending_blockchain_sync(): partial, so it stays as small as the backlog
+            models.Index(
+                fields=['use_blockchain', 'is_blockchain_synced'],
+                condition=models.Q(use_blockchain=True, is_blockchain_synced=False),
+                name='bq_sync_state_idx'
+            ),
+        ]
     
     def __str__(self):
         blockchain_status = "🔗" if self.is_blockchain_synced else "💾"
         return f"{blockchain_status} {self.question_text}"
     
     def save(self, *args, **kwargs):
-        """Override save to handle blockchain creation"""
+        """
+        Override save to record blockchain creation intent.
+
+        New blockchain-enabled questions get an outbox entry in the same
+        transaction; the ``process_outbox`` worker performs the chain write.
+        """
         is_new = self.pk is None
-        super().save(*args, **kwargs)
-        
-        # If new question and blockchain is enabled, create on blockchain
-        if is_new and self.use_blockchain and blockchain_service.is_available():
-            self.create_on_blockchain()
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
+            
+            if is_new and self.use_blockchain:
+                BlockchainOutbox.objects.using(self._state.db).create(question=self)
     
     def create_on_blockchain(self) -> Dict[str, Any]:
         """
@@ -61,8 +77,7 @@ class BlockchainQuestion(BaseQuestion):
         if self.is_blockchain_synced:
             return {"success": False, "error": "Question already exists on blockchain"}
         
-        # Get choices as list of strings
-        choices = list(self.choice_set.values_list('choice_text', flat=True))
+        choices = self.blockchain_choice_texts()
         
         if len(choices) < 2:
             return {"success": False, "error": "Minimum 2 choices required for blockchain"}
@@ -74,9 +89,10 @@ class BlockchainQuestion(BaseQuestion):
                 import hashlib
                 import time
                 
-                mock_id = hash(f"{self.question_text}{time.time()}") % 10000
+                # Local primary key keeps mock IDs unique (blockchain_id is unique)
+                mock_id = self.pk
                 mock_tx_hash = "0x" + hashlib.sha256(
-                    f"{self.question_text}{mock_id}".encode()
+                    f"{self.question_text}{mock_id}{time.time()}".encode()
                 ).hexdigest()[:64]
                 
                 result = {
@@ -87,6 +103,11 @@ class BlockchainQuestion(BaseQuestion):
                 }
                 
                 logger.info(f"Mock blockchain creation for '{self.question_text}'")
+            elif self.blockchain_tx_hash and blockchain_service.is_transaction_known(self.blockchain_tx_hash):
+                # A bulk sync was interrupted after sending; finish that transaction instead of duplicating it
+                result = blockchain_service.question_creation_result(
+                    receipt_tracker.wait(self.blockchain_tx_hash)
+                )
             else:
                 result = blockchain_service.create_question_on_blockchain(
                     self.question_text, 
@@ -94,20 +115,7 @@ class BlockchainQuestion(BaseQuestion):
                 )
             
             if result.get("success"):
-                # Update blockchain fields
-                self.blockchain_id = result.get("question_id")
-                self.blockchain_tx_hash = result.get("transaction_hash")
-                self.is_blockchain_synced = True
-                self.blockchain_created_at = timezone.now()
-                
-                # Save without triggering create_on_blockchain again
-                super().save(update_fields=[
-                    'blockchain_id', 'blockchain_tx_hash', 
-                    'is_blockchain_synced', 'blockchain_created_at'
-                ])
-                
-                status = "(mock)" if result.get("mock") else "(real)"
-                logger.info(f"Question '{self.question_text}' created on blockchain {status} with ID {self.blockchain_id}")
+                self.record_blockchain_creation(result)
             
             return result
             
@@ -115,6 +123,26 @@ class BlockchainQuestion(BaseQuestion):
             logger.error(f"Error creating question on blockchain: {e}")
             return {"success": False, "error": str(e)}
     
+    def blockchain_choice_texts(self) -> List[str]:
+        """Choice texts in on-chain order; list position becomes the on-chain index"""
+        return list(self.choice_set.order_by('ordinal').values_list('choice_text', flat=True))
+    
+    def record_blockchain_creation(self, result: Dict[str, Any]) -> None:
+        """Store the outcome of a successful on-chain creation"""
+        self.blockchain_id = result.get("question_id")
+        self.blockchain_tx_hash = result.get("transaction_hash")
+        self.is_blockchain_synced = True
+        self.blockchain_created_at = timezone.now()
+        
+        # Save without triggering create_on_blockchain again
+        super().save(update_fields=[
+            'blockchain_id', 'blockchain_tx_hash', 
+            'is_blockchain_synced', 'blockchain_created_at'
+        ])
+        
+        status = "(mock)" if result.get("mock") else "(real)"
+        logger.info(f"Question '{self.question_text}' created on blockchain {status} with ID {self.blockchain_id}")
+    
     def sync_from_blockchain(self) -> Dict[str, Any]:
         """
         Sync question data from blockchain
@@ -180,6 +208,10 @@ class BlockchainQuestion(BaseQuestion):
             logger.error(f"Error voting on blockchain: {e}")
             return {"success": False, "error": str(e)}
     
+    @property
+    def is_closed(self) -> bool:
+        return self.closed_at is not None and self.closed_at <= timezone.now()
+    
     def is_blockchain_available(self) -> bool:
         """Check if blockchain functionality is available"""
         return self.use_blockchain and blockchain_service.is_available()
@@ -240,19 +272,50 @@ class BlockchainChoice(BaseChoice):
         
         blockchain_question = self.question.blockchainquestion
         
-        # Find choice index
-        choice_index = None
-        choices = list(blockchain_question.choice_set.all())
+        if self.ordinal is None:
+            return {"success": False, "error": "Choice not found"}
+        
+        return blockchain_question.vote_on_blockchain(self.ordinal, voter_address)
+
+
+class BlockchainVoteQuerySet(models.QuerySet):
+    """QuerySet for BlockchainVote"""
+    
+    def insert_if_absent(self, **values) -> bool:
+        """
+        Insert one vote unless it conflicts with an existing row
         
-        for i, choice in enumerate(choices):
-            if choice.id == self.id:
-                choice_index = i
-                break
+        A single INSERT ... ON CONFLICT DO NOTHING (INSERT IGNORE on MySQL);
+        unlike ``create()`` it keeps the given ``timestamp``.
         
-        if choice_index is None:
-            return {"success": False, "error": "Choice not found"}
+        Returns:
+            bool: True if a row was inserted
+        """
+        values.setdefault('timestamp', timezone.now())
+        connection = connections[self._db or router.db_for_write(self.model)]
+        fields = [self.model._meta.get_field(name) for name in values]
+        columns = ', '.join(connection.ops.quote_name(f.column) for f in fields)
+        params = [f.get_db_prep_save(values[f.name], connection) for f in fields]
+        placeholders = ', '.join(['%s'] * len(fields))
+        table = connection.ops.quote_name(self.model._meta.db_table)
         
-        return blockchain_question.vote_on_blockchain(choice_index, voter_address)
+        if connection.vendor == 'mysql':
+            sql = f"INSERT IGNORE INTO {table} ({columns}) VALUES ({placeholders})"
+        else:
+            sql = f"INSERT INTO {table} ({columns}) VALUES ({placeholders}) ON CONFLICT DO NOTHING"
+        
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            return cursor.rowcount == 1
+    
+    def with_choice_text(self):
+        """Annotate each vote with its choice text in the same query"""
+        return self.annotate(choice_label=models.Subquery(
+            BaseChoice.objects.filter(
+                question_id=models.OuterRef('question_id'),
+                ordinal=models.OuterRef('choice_index'),
+            ).values('choice_text')[:1]
+        ))
 
 
 class BlockchainVote(models.Model):
@@ -267,28 +330,247 @@ class BlockchainVote(models.Model):
     log_index = models.IntegerField(default=0, help_text="Event log index for idempotency")
     timestamp = models.DateTimeField(auto_now_add=True)
     
+    objects = BlockchainVoteQuerySet.as_manager()
+    
     class Meta:
         verbose_name = "Blockchain Vote"
         verbose_name_plural = "Blockchain Votes"
         unique_together = ['question', 'voter_address']  # One vote per address per question
+        constraints = [
+            # Event identity: ingestion relies on insert-or-ignore against it
+            models.UniqueConstraint(fields=['transaction_hash', 'log_index'], name='uniq_vote_event'),
+        ]
         indexes = [
-            models.Index(fields=['transaction_hash', 'log_index'], name='tx_log_index_idx'),
+            # Per-choice aggregation (covering for GROUP BY question, choice_index)
+            models.Index(fields=['question', 'choice_index'], name='vote_question_choice_idx'),
+            # Keyset pagination over (timestamp, id), globally and per question
+            models.Index(fields=['-timestamp', '-id'], name='vote_timestamp_id_idx'),
+            models.Index(fields=['question', '-timestamp', '-id'], name='vote_question_ts_idx'),
         ]
         ordering = ['-timestamp']
     
     def __str__(self):
-        return f"Vote by {self.voter_address[:10]}... on Q{self.question.id}"
+        return f"Vote by {self.voter_address[:10]}... on Q{self.question_id}"
     
     @property
     def choice_text(self):
         """Get the choice text for this vote"""
-        try:
-            choices = list(self.question.choice_set.all())
-            if 0 <= self.choice_index < len(choices):
-                return choices[self.choice_index].choice_text
-            return "Unknown choice"
-        except:
-            return "Error getting choice"
+        # Listings use with_choice_text(); single rows do one indexed lookup
+        if hasattr(self, 'choice_label'):
+            label = self.choice_label
+        else:
+            label = BaseChoice.objects.filter(
+                question_id=self.question_id, ordinal=self.choice_index
+            ).values_list('choice_text', flat=True).first()
+        return label if label is not None else "Unknown choice"
+
+
+class BlockchainOutbox(models.Model):
+    """
+    Transactional outbox of pending on-chain question creations
+    
+    Rows are written in the same transaction as the question so the intent
+    survives crashes; ``polls.blockchain.outbox`` drains them.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_PROCESSING = 'processing'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_PROCESSING, 'Processing'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    
+    question = models.ForeignKey(
+        BlockchainQuestion, on_delete=models.CASCADE, related_name='outbox_entries'
+    )
+    status = models.CharField(max_length=12, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now, help_text="Earliest time for the next attempt")
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Blockchain Outbox Entry"
+        verbose_name_plural = "Blockchain Outbox"
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_status_due_idx'),
+        ]
+        ordering = ['created_at']
+    
+    def __str__(self):
+        return f"Outbox #{self.pk} Q{self.question_id} ({self.status})"
+
+
+class VoteArchive(models.Model):
+    """
+    Cold-storage record for the archived votes of one question
+    
+    The votes live in an append-only gzip JSONL file (one gzip member per
+    archival batch); this row keeps the committed file size and the tallies
+    so results never need to read the file. See ``polls.blockchain.archive``.
+    """
+    question = models.OneToOneField(
+        BlockchainQuestion, on_delete=models.CASCADE, related_name='vote_archive'
+    )
+    path = models.CharField(max_length=255, help_text="File path relative to VOTE_ARCHIVE_DIR")
+    vote_count = models.IntegerField(default=0)
+    tallies = models.JSONField(default=dict, help_text="Archived votes per choice index")
+    last_block = models.BigIntegerField(null=True, blank=True, help_text="Highest archived block number")
+    size_bytes = models.BigIntegerField(default=0, help_text="Committed file length; anything after it is discarded")
+    archived_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Vote Archive"
+        verbose_name_plural = "Vote Archives"
+    
+    def __str__(self):
+        return f"Archive Q{self.question_id} ({self.vote_count} votes)"
+    
+    def tally_for(self, choice_index: int) -> int:
+        return self.tallies.get(str(choice_index), 0)
+
+
+class BlockchainJob(models.Model):
+    """
+    Background run of an admin bulk action over a set of questions
+    
+    Per-question outcomes accumulate in ``results`` while the job runs. The
+    ``fingerprint`` (kind + sorted question ids) is unique among active jobs,
+    so re-submitting the same selection joins the running job. See
+    ``polls.blockchain.jobs``.
+    """
+    KIND_SYNC_TO = 'sync_to'
+    KIND_SYNC_FROM = 'sync_from'
+    KIND_CHOICES = [
+        (KIND_SYNC_TO, 'Sync to blockchain'),
+        (KIND_SYNC_FROM, 'Sync from blockchain'),
+    ]
+    
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    ACTIVE_STATUSES = (STATUS_PENDING, STATUS_RUNNING)
+    
+    kind = models.CharField(max_length=12, choices=KIND_CHOICES)
+    status = models.CharField(max_length=12, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    fingerprint = models.CharField(max_length=64, help_text="sha256 of kind and sorted question ids")
+    question_ids = models.JSONField(default=list)
+    results = models.JSONField(default=dict, help_text="Outcome per question id")
+    total = models.IntegerField(default=0)
+    processed = models.IntegerField(default=0)
+    succeeded = models.IntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        verbose_name = "Blockchain Job"
+        verbose_name_plural = "Blockchain Jobs"
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['fingerprint'],
+                condition=models.Q(status__in=['pending', 'running']),
+                name='uniq_active_job_fingerprint'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"Job #{self.pk} {self.get_kind_display()} ({self.processed}/{self.total}, {self.status})"
+    
+    @property
+    def is_active(self) -> bool:
+        return self.status in self.ACTIVE_STATUSES
+
+
+class SyncCheckpoint(models.Model):
+    """
+    Progress of a chain-to-database sync stream
+    
+    ``run_reconciliation`` resumes after ``last_block`` and keeps running
+    totals here, so metrics read one row instead of counting votes. See
+    ``polls.blockchain.checkpoint``.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    last_block = models.BigIntegerField(default=-1, help_text="Last block fully synced (-1: none)")
+    head_block = models.BigIntegerField(default=0, help_text="Chain head seen by the last run")
+    votes_ingested = models.BigIntegerField(default=0, help_text="Votes inserted by all runs")
+    last_run_votes = models.IntegerField(default=0)
+    last_run_seconds = models.FloatField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Sync Checkpoint"
+        verbose_name_plural = "Sync Checkpoints"
+    
+    def __str__(self):
+        return f"{self.name} @ block {self.last_block}"
+
+
+class BlockchainAccountNonce(models.Model):
+    """
+    Next transaction nonce per sending account
+    
+    Shared by every process sending from the account; see
+    ``polls.blockchain.nonces``.
+    """
+    address = models.CharField(max_length=42, unique=True, help_text="Sending account address")
+    next_nonce = models.BigIntegerField(help_text="Next nonce to hand out")
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = "Blockchain Account Nonce"
+        verbose_name_plural = "Blockchain Account Nonces"
+    
+    def __str__(self):
+        return f"{self.address} → {self.next_nonce}"
+
+
+class BlockchainNonceLease(models.Model):
+    """
+    Nonce handed out below ``BlockchainAccountNonce.next_nonce`` and not yet
+    accepted by the node
+
+    ``leased`` rows are held by a sender between allocation and send;
+    ``released`` rows are gaps any process may hand out again. See
+    ``polls.blockchain.nonces``.
+    """
+    STATUS_LEASED = 'leased'
+    STATUS_RELEASED = 'released'
+    STATUS_CHOICES = [
+        (STATUS_LEASED, 'Leased'),
+        (STATUS_RELEASED, 'Released'),
+    ]
+
+    address = models.CharField(max_length=42, help_text="Sending account address")
+    nonce = models.BigIntegerField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_LEASED)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Blockchain Nonce Lease"
+        verbose_name_plural = "Blockchain Nonce Leases"
+        constraints = [
+            models.UniqueConstraint(fields=['address', 'nonce'], name='uniq_nonce_lease'),
+        ]
+
+    def __str__(self):
+        return f"{self.address} #{self.nonce} ({self.status})"
 
 
 # Manager for easier access
@@ -310,7 +592,7 @@ class BlockchainQuestionManager(models.Manager):
     def create_with_blockchain(self, question_text: str, choices: List[str], 
                               pub_date=None, use_blockchain=True):
         """
-        Create a question with choices and optionally put it on blockchain
+        Create a question with choices and optionally queue it for blockchain
         
         Args:
             question_text (str): The question text
@@ -324,24 +606,20 @@ class BlockchainQuestionManager(models.Manager):
         if pub_date is None:
             pub_date = timezone.now()
         
-        # Create question
-        question = self.create(
-            question_text=question_text,
-            pub_date=pub_date,
-            use_blockchain=use_blockchain
-        )
-        
-        # Create choices
-        for choice_text in choices:
-            BlockchainChoice.objects.create(
-                question=question,
-                choice_text=choice_text
+        # Question, choices and outbox entry commit together; the chain
+        # write happens later in the outbox worker
+        with transaction.atomic():
+            question = self.create(
+                question_text=question_text,
+                pub_date=pub_date,
+                use_blockchain=use_blockchain
             )
-        
-        # Create on blockchain if enabled
-        if use_blockchain and blockchain_service.is_available():
-            result = question.create_on_blockchain()
-            logger.info(f"Blockchain creation result: {result}")
+            
+            for choice_text in choices:
+                BlockchainChoice.objects.create(
+                    question=question,
+                    choice_text=choice_text
+                )
         
         return question
 
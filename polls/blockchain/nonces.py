@@ -0,0 +1,181 @@
+"""
+Local Nonce Allocation for Transaction Sending
+
+Nonces are handed out from a ``BlockchainAccountNonce`` row instead of asking
+the node before every send. Every change locks that row, so threads and
+processes sharing the database never receive the same nonce and several
+transactions from one account can be in flight at once.
+
+A nonce is *leased* from ``allocate`` until ``mark_sent`` (the node accepted
+it) or ``release`` (it was never sent). Leases and released gaps are
+``BlockchainNonceLease`` rows, not process memory: a gap released by one
+worker is refilled by any other even after the first exits, and a resync
+never moves the account below a nonce another worker leased but has not
+sent yet. Leases older than ``NONCE_LEASE`` belong to a sender that died
+and are handed out again.
+"""
+
+from datetime import timedelta
+from typing import Callable, Optional
+import logging
+
+from django.db import transaction
+from django.db.models import Max, Q
+from django.utils import timezone
+
+from .config import get_web3
+
+logger = logging.getLogger(__name__)
+
+# Leases not sent or released within this window belong to a dead sender
+NONCE_LEASE = timedelta(minutes=10)
+
+# Node error fragments meaning our local view of the nonce is stale
+NONCE_ERROR_MARKERS = (
+    'nonce too low',
+    'nonce too high',
+    'already known',
+    'replacement transaction underpriced',
+    'invalid nonce',
+)
+
+
+def is_nonce_error(error: Exception) -> bool:
+    """Check if a send error was caused by a wrong nonce"""
+    message = str(error).lower()
+    return any(marker in message for marker in NONCE_ERROR_MARKERS)
+
+
+class NonceManager:
+    """
+    Per-account nonce allocator backed by database rows
+    """
+
+    def __init__(self, web3_getter: Callable = get_web3):
+        self._web3_getter = web3_getter
+
+    @staticmethod
+    def _models():
+        from .models import BlockchainAccountNonce, BlockchainNonceLease
+        return BlockchainAccountNonce, BlockchainNonceLease
+
+    def _node_nonce(self, address: str) -> int:
+        web3 = self._web3_getter()
+        if web3 is None:
+            raise ConnectionError("Blockchain not available")
+        return web3.eth.get_transaction_count(address, 'pending')
+
+    def _lock_account(self, address: str):
+        """The account row, locked until the surrounding transaction ends"""
+        account_model, _ = self._models()
+        if not account_model.objects.filter(address=address).exists():
+            # Only the first use of an account talks to the node
+            account_model.objects.get_or_create(
+                address=address, defaults={'next_nonce': self._node_nonce(address)}
+            )
+        # The UPDATE takes the lock on SQLite too, which ignores FOR UPDATE
+        account_model.objects.filter(address=address).update(updated_at=timezone.now())
+        return account_model.objects.select_for_update().get(address=address)
+
+    def allocate(self, address: str) -> int:
+        """
+        Lease the next nonce for ``address``
+
+        Released gaps (and expired leases) below the account's next nonce
+        are handed out first, lowest first.
+        """
+        account_model, lease_model = self._models()
+        with transaction.atomic():
+            account = self._lock_account(address)
+            gap = lease_model.objects.select_for_update().filter(
+                Q(status=lease_model.STATUS_RELEASED)
+                | Q(status=lease_model.STATUS_LEASED, updated_at__lt=timezone.now() - NONCE_LEASE),
+                address=address,
+                nonce__lt=account.next_nonce,
+            ).order_by('nonce').first()
+            if gap is not None:
+                gap.status = lease_model.STATUS_LEASED
+                gap.save(update_fields=['status', 'updated_at'])
+                return gap.nonce
+
+            nonce = account.next_nonce
+            account_model.objects.filter(pk=account.pk).update(next_nonce=nonce + 1)
+            lease_model.objects.update_or_create(
+                address=address, nonce=nonce, defaults={'status': lease_model.STATUS_LEASED}
+            )
+            return nonce
+
+    def mark_sent(self, address: str, nonce: int) -> None:
+        """Record that the node accepted the transaction using ``nonce``"""
+        _, lease_model = self._models()
+        lease_model.objects.filter(address=address, nonce=nonce).delete()
+
+    def release(self, address: str, nonce: int, error: Optional[Exception] = None) -> None:
+        """
+        Give back a nonce whose transaction was never accepted
+
+        If it is the highest nonce handed out, the account rolls back to it
+        (and past any released gaps right below); otherwise it stays as a
+        gap for the next allocation in any process. Nonce errors from the
+        node resynchronise the account instead.
+        """
+        account_model, lease_model = self._models()
+        leases = lease_model.objects.filter(address=address)
+        if error is not None and is_nonce_error(error):
+            leases.filter(nonce=nonce).delete()
+            self.resync(address)
+            return
+
+        with transaction.atomic():
+            account = self._lock_account(address)
+            if account.next_nonce != nonce + 1:
+                leases.filter(nonce=nonce).update(status=lease_model.STATUS_RELEASED, updated_at=timezone.now())
+                return
+            leases.filter(nonce=nonce).delete()
+            next_nonce = nonce
+            while leases.filter(nonce=next_nonce - 1, status=lease_model.STATUS_RELEASED).delete()[0]:
+                next_nonce -= 1
+            account_model.objects.filter(pk=account.pk).update(next_nonce=next_nonce)
+
+    def resync(self, address: str) -> Optional[int]:
+        """
+        Reset the local nonce to the node's pending transaction count
+
+        The account never moves below a live lease: its transaction has not
+        reached the node yet, so the node's count does not include it.
+        Nonces between the node's count and the new next nonce that nobody
+        holds become gaps, so the account is left without holes.
+
+        Returns:
+            Optional[int]: The new next nonce, or None if the node is unreachable
+        """
+        try:
+            node_nonce = self._node_nonce(address)
+        except Exception as e:
+            logger.error(f"Cannot resync nonce for {address}: {e}")
+            return None
+
+        account_model, lease_model = self._models()
+        with transaction.atomic():
+            account = self._lock_account(address)
+            leases = lease_model.objects.filter(address=address)
+            # The node has used these already
+            leases.filter(status=lease_model.STATUS_RELEASED, nonce__lt=node_nonce).delete()
+            highest_leased = leases.filter(
+                status=lease_model.STATUS_LEASED, updated_at__gte=timezone.now() - NONCE_LEASE
+            ).aggregate(highest=Max('nonce'))['highest']
+            next_nonce = node_nonce if highest_leased is None else max(node_nonce, highest_leased + 1)
+
+            leases.filter(nonce__gte=next_nonce).delete()
+            held = set(leases.filter(nonce__gte=node_nonce).values_list('nonce', flat=True))
+            lease_model.objects.bulk_create([
+                lease_model(address=address, nonce=n, status=lease_model.STATUS_RELEASED)
+                for n in range(node_nonce, next_nonce) if n not in held
+            ], ignore_conflicts=True)
+            account_model.objects.filter(pk=account.pk).update(next_nonce=next_nonce)
+        logger.info(f"Resynced nonce for {address} to {next_nonce}")
+        return next_nonce
+
+
+# Global nonce manager
+nonce_manager = NonceManager()
@@ -0,0 +1,213 @@
+"""
+Outbox Worker for On-Chain Question Creation
+
+Question saves only record intent (a ``BlockchainOutbox`` row committed with
+the question). This module drains those rows with bounded concurrency,
+retrying failures with exponential backoff until ``max_attempts``.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional
+import logging
+
+from django.db import connection
+from django.db.models import F
+from django.utils import timezone
+
+from .models import BlockchainOutbox
+from .services import blockchain_service
+
+logger = logging.getLogger(__name__)
+
+# Retry schedule: base * 2^(attempt-1), capped
+RETRY_BASE_SECONDS = 5
+RETRY_MAX_SECONDS = 600
+
+# Entries stuck in "processing" longer than this are considered abandoned
+PROCESSING_LEASE = timedelta(minutes=10)
+
+
+def enqueue_question_creation(question) -> BlockchainOutbox:
+    """Record creation intent for an existing question (idempotent while pending)"""
+    entry = BlockchainOutbox.objects.filter(
+        question=question,
+        status__in=[BlockchainOutbox.STATUS_PENDING, BlockchainOutbox.STATUS_PROCESSING]
+    ).first()
+    if entry is None:
+        entry = BlockchainOutbox.objects.create(question=question)
+    return entry
+
+
+def pending_count() -> int:
+    """Number of entries still waiting to be sent"""
+    return BlockchainOutbox.objects.filter(status=BlockchainOutbox.STATUS_PENDING).count()
+
+
+def complete_entries_for(question_ids) -> int:
+    """Mark open entries done for questions created on chain outside the worker"""
+    return BlockchainOutbox.objects.filter(
+        question_id__in=list(question_ids),
+        status__in=[BlockchainOutbox.STATUS_PENDING, BlockchainOutbox.STATUS_PROCESSING]
+    ).update(status=BlockchainOutbox.STATUS_DONE, last_error='', updated_at=timezone.now())
+
+
+def release_stale_entries() -> int:
+    """Return abandoned "processing" entries to the pending queue"""
+    cutoff = timezone.now() - PROCESSING_LEASE
+    return BlockchainOutbox.objects.filter(
+        status=BlockchainOutbox.STATUS_PROCESSING,
+        updated_at__lt=cutoff
+    ).update(status=BlockchainOutbox.STATUS_PENDING, updated_at=timezone.now())
+
+
+def claim_due_entries(limit: int) -> List[int]:
+    """
+    Atomically claim up to ``limit`` due entries
+
+    Each claim is a conditional UPDATE on the pending status, so concurrent
+    workers never process the same entry twice.
+    """
+    now = timezone.now()
+    candidates = list(
+        BlockchainOutbox.objects.filter(
+            status=BlockchainOutbox.STATUS_PENDING,
+            next_attempt_at__lte=now
+        ).order_by('next_attempt_at', 'pk').values_list('pk', flat=True)[:limit]
+    )
+
+    claimed = []
+    for pk in candidates:
+        updated = BlockchainOutbox.objects.filter(
+            pk=pk, status=BlockchainOutbox.STATUS_PENDING
+        ).update(
+            status=BlockchainOutbox.STATUS_PROCESSING,
+            attempts=F('attempts') + 1,
+            updated_at=now
+        )
+        if updated:
+            claimed.append(pk)
+    return claimed
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    seconds = RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0))
+    return timedelta(seconds=min(seconds, RETRY_MAX_SECONDS))
+
+
+def _mark_failed_attempt(entry: BlockchainOutbox, error: str, max_attempts: int) -> str:
+    if entry.attempts >= max_attempts:
+        status = BlockchainOutbox.STATUS_FAILED
+        next_attempt_at = entry.next_attempt_at
+    else:
+        status = BlockchainOutbox.STATUS_PENDING
+        next_attempt_at = timezone.now() + _retry_delay(entry.attempts)
+
+    BlockchainOutbox.objects.filter(pk=entry.pk).update(
+        status=status,
+        last_error=error[:1000],
+        next_attempt_at=next_attempt_at,
+        updated_at=timezone.now()
+    )
+    return status
+
+
+def process_entry(entry_id: int, max_attempts: int = 5) -> Dict[str, Any]:
+    """
+    Send a single claimed entry to the blockchain
+
+    Returns:
+        Dict[str, Any]: Outcome with entry/question ids, status and error
+    """
+    outcome = {"entry_id": entry_id, "question_id": None, "status": None, "error": None}
+    try:
+        entry = BlockchainOutbox.objects.select_related('question').get(pk=entry_id)
+        question = entry.question
+        outcome["question_id"] = question.pk
+
+        if question.is_blockchain_synced:
+            result = {"success": True}
+        else:
+            result = question.create_on_blockchain()
+
+        if result.get("success"):
+            BlockchainOutbox.objects.filter(pk=entry.pk).update(
+                status=BlockchainOutbox.STATUS_DONE,
+                last_error='',
+                updated_at=timezone.now()
+            )
+            outcome["status"] = BlockchainOutbox.STATUS_DONE
+            outcome["transaction_hash"] = question.blockchain_tx_hash
+        else:
+            error = result.get("error", "Unknown error")
+            outcome["status"] = _mark_failed_attempt(entry, error, max_attempts)
+            outcome["error"] = error
+    except BlockchainOutbox.DoesNotExist:
+        outcome["status"] = "missing"
+    except Exception as e:
+        logger.error(f"Error processing outbox entry {entry_id}: {e}")
+        outcome["error"] = str(e)
+        try:
+            entry = BlockchainOutbox.objects.get(pk=entry_id)
+            outcome["status"] = _mark_failed_attempt(entry, str(e), max_attempts)
+        except BlockchainOutbox.DoesNotExist:
+            outcome["status"] = "missing"
+    return outcome
+
+
+def _process_in_thread(entry_id: int, max_attempts: int) -> Dict[str, Any]:
+    try:
+        return process_entry(entry_id, max_attempts)
+    finally:
+        # Worker threads own their DB connection
+        connection.close()
+
+
+def drain_outbox(batch_size: int = 50, concurrency: int = 4, max_attempts: int = 5,
+                 force: bool = False,
+                 on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, int]:
+    """
+    Process one batch of due outbox entries
+
+    Args:
+        batch_size (int): Maximum entries to claim
+        concurrency (int): Maximum chain writes in flight
+        max_attempts (int): Attempts before an entry is marked failed
+        force (bool): Process even if the blockchain is not connected (mock mode)
+        on_result (callable, optional): Called with each entry outcome
+
+    Returns:
+        Dict[str, int]: Counts per outcome status
+    """
+    counts = {"claimed": 0, BlockchainOutbox.STATUS_DONE: 0,
+              BlockchainOutbox.STATUS_PENDING: 0, BlockchainOutbox.STATUS_FAILED: 0}
+
+    if not force and not blockchain_service.is_available():
+        logger.warning("Blockchain not available; outbox left untouched")
+        return counts
+
+    release_stale_entries()
+    entry_ids = claim_due_entries(batch_size)
+    counts["claimed"] = len(entry_ids)
+    if not entry_ids:
+        return counts
+
+    if concurrency <= 1:
+        outcomes = (process_entry(pk, max_attempts) for pk in entry_ids)
+        for outcome in outcomes:
+            _count_outcome(counts, outcome, on_result)
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            futures = [executor.submit(_process_in_thread, pk, max_attempts) for pk in entry_ids]
+            for future in futures:
+                _count_outcome(counts, future.result(), on_result)
+
+    return counts
+
+
+def _count_outcome(counts, outcome, on_result):
+    status = outcome.get("status")
+    if status in counts:
+        counts[status] += 1
+    if on_result:
+        on_result(outcome)
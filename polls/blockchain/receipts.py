@@ -0,0 +1,237 @@
+"""
+Shared Receipt Tracking for Pending Transactions
+
+Instead of one ``wait_for_transaction_receipt`` polling loop per transaction,
+a single poller follows new blocks and resolves every pending hash found in
+them. Waiters get a ``concurrent.futures.Future`` (or a callback), so polling
+cost grows with the number of blocks, not with pending transactions.
+"""
+
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import logging
+import threading
+
+from web3.exceptions import TimeExhausted, TransactionNotFound
+
+from .config import get_web3
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL_SECONDS = 1.0
+RECEIPT_TIMEOUT_SECONDS = 120
+
+
+def normalize_tx_hash(tx_hash) -> str:
+    """Lowercase 0x-prefixed hex string for bytes/HexBytes/str hashes"""
+    if isinstance(tx_hash, (bytes, bytearray)):
+        return '0x' + bytes(tx_hash).hex()
+    tx_hash = str(tx_hash).lower()
+    return tx_hash if tx_hash.startswith('0x') else '0x' + tx_hash
+
+
+class ReceiptTracker:
+    """
+    Resolves many pending transaction hashes from one block poller
+    """
+
+    def __init__(self, web3_getter: Callable = get_web3,
+                 poll_interval: float = POLL_INTERVAL_SECONDS, background: bool = True):
+        self._web3_getter = web3_getter
+        self.poll_interval = poll_interval
+        self.background = background
+        self._pending: Dict[str, Future] = {}
+        self._last_block: Optional[int] = None
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def track(self, tx_hash, on_receipt: Optional[Callable[[Any], None]] = None) -> Future:
+        """
+        Start watching a transaction
+
+        Args:
+            tx_hash: Hash returned by ``send_raw_transaction``
+            on_receipt (callable, optional): Called with the receipt once mined
+
+        Returns:
+            Future: Resolves to the receipt
+        """
+        key = normalize_tx_hash(tx_hash)
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None:
+                future = Future()
+                self._pending[key] = future
+        if on_receipt is not None:
+            future.add_done_callback(
+                lambda f: not f.cancelled() and f.exception() is None and on_receipt(f.result())
+            )
+
+        # An idle poller restarts just above the head seen *before* the
+        # direct lookup, so a block mined in between is still scanned
+        anchor = self._current_block() if self._last_block is None else None
+
+        # One direct lookup covers transactions mined before registration
+        # (e.g. Hardhat automine); afterwards only the block poller looks
+        receipt = self._fetch_receipt(key)
+        if receipt is not None:
+            self._resolve(key, receipt)
+        else:
+            with self._lock:
+                if self._last_block is None and anchor is not None:
+                    self._last_block = anchor
+            self._ensure_started()
+        return future
+
+    def track_many(self, tx_hashes: Iterable) -> List[Future]:
+        return [self.track(tx_hash) for tx_hash in tx_hashes]
+
+    def untrack(self, tx_hash, future: Optional[Future] = None) -> bool:
+        """
+        Stop watching a transaction the caller gave up on
+
+        Its future is cancelled, so other waiters of the same hash stop too.
+        With ``future``, only that registration is dropped (a newer ``track``
+        of the same hash is kept).
+
+        Returns:
+            bool: True if the hash was still pending
+        """
+        key = normalize_tx_hash(tx_hash)
+        with self._lock:
+            current = self._pending.get(key)
+            if current is None or (future is not None and current is not future):
+                return False
+            del self._pending[key]
+        current.cancel()
+        return True
+
+    def wait(self, tx_hash, timeout: float = RECEIPT_TIMEOUT_SECONDS):
+        """
+        Block until the transaction is mined
+
+        Raises:
+            TimeExhausted: If no receipt arrives within ``timeout`` seconds
+        """
+        key = normalize_tx_hash(tx_hash)
+        future = self.track(key)
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            self.untrack(key, future)
+            raise TimeExhausted(f"Transaction {key} not mined after {timeout} seconds")
+
+    # ------------------------------------------------------------------
+    # Polling
+    # ------------------------------------------------------------------
+
+    def poll_once(self) -> int:
+        """
+        Scan blocks mined since the last poll and resolve matching hashes
+
+        Returns:
+            int: Number of receipts resolved
+        """
+        web3 = self._web3_getter()
+        if web3 is None or not self._pending:
+            return 0
+
+        head = web3.eth.block_number
+        if self._last_block is None:
+            self._last_block = head - 1
+
+        resolved = 0
+        for number in range(self._last_block + 1, head + 1):
+            block = web3.eth.get_block(number)
+            with self._lock:
+                matches = [
+                    key for key in map(normalize_tx_hash, block['transactions'])
+                    if key in self._pending
+                ]
+            missed = False
+            for key, receipt in zip(matches, self._fetch_receipts(web3, matches)):
+                if receipt is None:
+                    missed = True
+                    continue
+                self._resolve(key, receipt)
+                resolved += 1
+            if missed:
+                # A transient RPC miss: scan this block again on the next poll
+                break
+            self._last_block = number
+        return resolved
+
+    def _current_block(self) -> Optional[int]:
+        web3 = self._web3_getter()
+        if web3 is None:
+            return None
+        try:
+            return web3.eth.block_number
+        except Exception:
+            return None
+
+    def _fetch_receipt(self, key: str):
+        web3 = self._web3_getter()
+        if web3 is None:
+            return None
+        try:
+            return web3.eth.get_transaction_receipt(key)
+        except TransactionNotFound:
+            return None
+        except Exception as e:
+            logger.warning(f"Receipt lookup failed for {key}: {e}")
+            return None
+
+    def _fetch_receipts(self, web3, keys: List[str]) -> List[Any]:
+        """Fetch receipts for several hashes, batched when web3 supports it"""
+        if len(keys) > 1 and hasattr(web3, 'batch_requests'):
+            try:
+                with web3.batch_requests() as batch:
+                    for key in keys:
+                        batch.add(web3.eth.get_transaction_receipt(key))
+                    return list(batch.execute())
+            except Exception as e:
+                logger.debug(f"Batched receipt request failed, falling back: {e}")
+        return [self._fetch_receipt(key) for key in keys]
+
+    def _resolve(self, key: str, receipt) -> None:
+        with self._lock:
+            future = self._pending.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(receipt)
+
+    def _ensure_started(self) -> None:
+        if not self.background:
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                self._wakeup.set()
+                return
+            self._thread = threading.Thread(
+                target=self._run, name='receipt-tracker', daemon=True
+            )
+            self._thread.start()
+
+    def _run(self):
+        # The poller exits when idle; the next track() starts it again
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._thread = None
+                    self._last_block = None
+                    return
+            try:
+                self.poll_once()
+            except Exception as e:
+                logger.warning(f"Receipt poll failed: {e}")
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+
+
+# Global receipt tracker
+receipt_tracker = ReceiptTracker()
@@ -2,13 +2,58 @@
 Web3 Services for VotingContract Integration
 """
 
+from django.conf import settings
+
 from .config import get_web3, get_contract, is_web3_connected, web3_manager
-from web3.exceptions import ContractLogicError, Web3Exception
+from .nonces import nonce_manager
+from .fees import fee_oracle, create_question_gas_key
+from .receipts import normalize_tx_hash, receipt_tracker
+from web3.exceptions import ContractLogicError, TransactionNotFound, Web3Exception
 from typing import List, Tuple, Optional, Dict, Any
 import logging
 
 logger = logging.getLogger(__name__)
 
+# VotingContract rejects questions with more options than this
+MAX_CHOICES = 10
+
+
+def send_contract_transaction(web3, function_call, sender: str, gas: int):
+    """
+    Build, sign and send a contract transaction with a locally allocated nonce
+    
+    Every sender goes through here, so a failed send always hands its nonce
+    back (or resyncs on a nonce error) and an accepted one is marked sent.
+    
+    Args:
+        web3: Connected Web3 instance
+        function_call: Bound contract function (e.g. ``contract.functions.vote(...)``)
+        sender (str): Sending account
+        gas (int): Gas limit (see ``fee_oracle.gas_limit``)
+        
+    Returns:
+        HexBytes: Transaction hash
+    """
+    nonce = nonce_manager.allocate(sender)
+    try:
+        transaction = function_call.build_transaction({
+            'from': sender,
+            'gas': gas,
+            'nonce': nonce,
+            **fee_oracle.fee_params(),
+        })
+        
+        # Note: In production, you'd use a proper private key management
+        signed_txn = web3.eth.account.sign_transaction(transaction, private_key=settings.BLOCKCHAIN_PRIVATE_KEY)
+        
+        tx_hash = web3.eth.send_raw_transaction(signed_txn.rawTransaction)
+    except Exception as e:
+        # The nonce was not consumed; reuse it or resync with the node
+        nonce_manager.release(sender, nonce, e)
+        raise
+    nonce_manager.mark_sent(sender, nonce)
+    return tx_hash
+
 
 class BlockchainVotingService:
     """
@@ -24,6 +69,10 @@ class BlockchainVotingService:
         """Check if blockchain service is available"""
         return is_web3_connected() and self.contract is not None
     
+    def _send_transaction(self, function_call, sender: str, gas: int):
+        """Send a contract transaction (see ``send_contract_transaction``)"""
+        return send_contract_transaction(self.web3, function_call, sender, gas)
+    
     def get_contract_info(self) -> Dict[str, Any]:
         """Get basic contract information"""
         if not self.is_available():
@@ -54,49 +103,44 @@ class BlockchainVotingService:
         Returns:
             Dict[str, Any]: Transaction result and question ID
         """
+        submitted = self.submit_question_creation(question_text, choices)
+        if not submitted.get("success"):
+            return submitted
+        
+        try:
+            receipt = receipt_tracker.wait(submitted["transaction_hash"])
+        except Exception as e:
+            logger.error(f"Error creating question on blockchain: {e}")
+            return {"success": False, "error": str(e), "transaction_hash": submitted["transaction_hash"]}
+        return self.question_creation_result(receipt, submitted["gas_key"])
+    
+    def submit_question_creation(self, question_text: str, choices: List[str]) -> Dict[str, Any]:
+        """
+        Send a ``createQuestion`` transaction without waiting for it to be mined
+        
+        Pair with ``receipt_tracker.track`` and ``question_creation_result`` to
+        keep several creations in flight.
+        
+        Returns:
+            Dict[str, Any]: Transaction hash and the gas key to report usage under
+        """
         if not self.is_available():
             return {"success": False, "error": "Blockchain not available"}
         
         if len(choices) < 2:
             return {"success": False, "error": "Minimum 2 choices required"}
         
-        if len(choices) > 10:
-            return {"success": False, "error": "Maximum 10 choices allowed"}
+        if len(choices) > MAX_CHOICES:
+            return {"success": False, "error": f"Maximum {MAX_CHOICES} choices allowed"}
         
         try:
-            # Build transaction
-            transaction = self.contract.functions.createQuestion(
-                question_text, 
-                choices
-            ).build_transaction({
-                'from': self.default_account,
-                'gas': 2000000,  # Sufficient gas limit
-                'gasPrice': self.web3.eth.gas_price,
-                'nonce': self.web3.eth.get_transaction_count(self.default_account),
-            })
-            
-            # Sign and send transaction
-            # Note: In production, you'd use a proper private key management
-            signed_txn = self.web3.eth.account.sign_transaction(
-                transaction, 
-                private_key="0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"  # Hardhat account #0 private key
+            gas_key = create_question_gas_key(question_text, choices)
+            tx_hash = self._send_transaction(
+                self.contract.functions.createQuestion(question_text, choices),
+                self.default_account,
+                gas=fee_oracle.gas_limit(gas_key)
             )
-            
-            tx_hash = self.web3.eth.send_raw_transaction(signed_txn.rawTransaction)
-            receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
-            
-            # Extract question ID from events
-            question_created_events = self.contract.events.QuestionCreated().process_receipt(receipt)
-            question_id = None
-            if question_created_events:
-                question_id = question_created_events[0]['args']['questionId']
-            
-            return {
-                "success": True,
-                "transaction_hash": tx_hash.hex(),
-                "question_id": question_id,
-                "gas_used": receipt['gasUsed']
-            }
+            return {"success": True, "transaction_hash": tx_hash.hex(), "gas_key": gas_key}
             
         except ContractLogicError as e:
             logger.error(f"Contract logic error: {e}")
@@ -105,6 +149,45 @@ class BlockchainVotingService:
             logger.error(f"Error creating question on blockchain: {e}")
             return {"success": False, "error": str(e)}
     
+    def question_creation_result(self, receipt, gas_key: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Read the outcome of a mined ``createQuestion`` transaction
+        
+        Args:
+            receipt: Transaction receipt
+            gas_key (str, optional): Fee oracle key to record the gas used under
+            
+        Returns:
+            Dict[str, Any]: Transaction hash and the ``QuestionCreated`` question ID
+        """
+        tx_hash = normalize_tx_hash(receipt['transactionHash'])
+        if receipt.get('status') == 0:
+            return {"success": False, "error": "Transaction reverted", "transaction_hash": tx_hash}
+        
+        if gas_key:
+            fee_oracle.record_gas_used(gas_key, receipt['gasUsed'], receipt.get('status', 1))
+        
+        # Extract question ID from events
+        question_created_events = self.contract.events.QuestionCreated().process_receipt(receipt)
+        question_id = None
+        if question_created_events:
+            question_id = question_created_events[0]['args']['questionId']
+        
+        return {
+            "success": True,
+            "transaction_hash": tx_hash,
+            "question_id": question_id,
+            "gas_used": receipt['gasUsed']
+        }
+    
+    def is_transaction_known(self, tx_hash: str) -> bool:
+        """Check if the node still knows a transaction (pending or mined)"""
+        try:
+            self.web3.eth.get_transaction(tx_hash)
+            return True
+        except TransactionNotFound:
+            return False
+    
     def get_question_from_blockchain(self, question_id: int) -> Dict[str, Any]:
         """
         Get question details from blockchain
@@ -156,25 +239,13 @@ class BlockchainVotingService:
             if has_voted:
                 return {"success": False, "error": "User has already voted on this question"}
             
-            # Build transaction
-            transaction = self.contract.functions.vote(
-                question_id, 
-                choice_index
-            ).build_transaction({
-                'from': voter,
-                'gas': 200000,
-                'gasPrice': self.web3.eth.gas_price,
-                'nonce': self.web3.eth.get_transaction_count(voter),
-            })
-            
-            # Sign and send transaction
-            signed_txn = self.web3.eth.account.sign_transaction(
-                transaction, 
-                private_key="0xac0974bec39a17e36ba4a6b4d238ff944bacb478cbed5efcae784d7bf4f2ff80"  # Hardhat account #0
+            tx_hash = self._send_transaction(
+                self.contract.functions.vote(question_id, choice_index),
+                voter,
+                gas=fee_oracle.gas_limit('vote')
             )
-            
-            tx_hash = self.web3.eth.send_raw_transaction(signed_txn.rawTransaction)
-            receipt = self.web3.eth.wait_for_transaction_receipt(tx_hash)
+            receipt = receipt_tracker.wait(tx_hash)
+            fee_oracle.record_gas_used('vote', receipt['gasUsed'], receipt.get('status', 1))
             
             return {
                 "success": True,
@@ -235,6 +306,76 @@ class BlockchainVotingService:
             logger.error(f"Error getting vote results from blockchain: {e}")
             return {"success": False, "error": str(e)}
     
+    def get_vote_tallies(self, questions: Dict[int, int]) -> Dict[str, Any]:
+        """
+        Get the votes per choice of several questions in one JSON-RPC batch
+
+        Args:
+            questions (Dict[int, int]): Number of choices by question ID
+
+        Returns:
+            Dict[str, Any]: ``tallies`` as ``{question_id: [votes per choice]}``
+        """
+        if not self.is_available():
+            return {"success": False, "error": "Blockchain not available"}
+
+        try:
+            calls = [(question_id, index) for question_id, count in questions.items() for index in range(count)]
+            with self.web3.batch_requests() as batch:
+                for question_id, index in calls:
+                    batch.add(self.contract.functions.getVotes(question_id, index))
+                votes = batch.execute()
+
+            tallies = {question_id: [0] * count for question_id, count in questions.items()}
+            for (question_id, index), count in zip(calls, votes):
+                tallies[question_id][index] = count
+            return {"success": True, "tallies": tallies}
+
+        except Exception as e:
+            logger.error(f"Error getting vote tallies from blockchain: {e}")
+            return {"success": False, "error": str(e)}
+
+    def get_question_vote_events(self, question_id: int, from_block: int, to_block: int) -> Dict[str, Any]:
+        """
+        Get the VoteCast events of one question (filtered by its indexed ID)
+
+        Returns:
+            Dict[str, Any]: ``events`` in the gateway's event format
+        """
+        if not self.is_available():
+            return {"success": False, "error": "Blockchain not available"}
+
+        try:
+            logs = self.contract.events.VoteCast().get_logs(
+                argument_filters={'questionId': question_id}, from_block=from_block, to_block=to_block
+            )
+            return {"success": True, "events": [{
+                'question_id': log['args']['questionId'],
+                'choice_index': log['args']['choiceIndex'],
+                'voter': log['args']['voter'],
+                'tx_hash': log['transactionHash'].hex(),
+                'block_number': log['blockNumber'],
+                'log_index': log['logIndex'],
+            } for log in logs]}
+
+        except Exception as e:
+            logger.error(f"Error getting vote events of question {question_id}: {e}")
+            return {"success": False, "error": str(e)}
+
+    def get_transaction_block(self, tx_hash: str) -> Optional[int]:
+        """Block that mined ``tx_hash``, or None if unknown or not mined"""
+        if not self.is_available() or not tx_hash:
+            return None
+        try:
+            return self.web3.eth.get_transaction_receipt(tx_hash)['blockNumber']
+        except (TransactionNotFound, Web3Exception, ValueError):
+            return None
+
+    def get_current_block(self) -> int:
+        if not self.is_available():
+            return 0
+        return self.web3.eth.block_number
+
     def get_all_questions_from_blockchain(self) -> Dict[str, Any]:
         """
         Get all questions from blockchain
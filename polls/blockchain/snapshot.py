@@ -0,0 +1,328 @@
+"""
+Snapshots of the Chain Mirror for Fast Bootstrap
+
+A new deployment used to replay the VoteCast history from block 0. Instead,
+``export_snapshot`` writes the synced questions (with choices and tallies),
+every vote up to the sync checkpoint (archived ones included) and the
+checkpoint itself into one gzip JSONL file, read inside one transaction so
+the file is consistent at the checkpoint block. ``import_snapshot``
+bulk-loads it into an empty database and sets the checkpoint, so
+``run_reconciliation`` continues from the next block. Votes archived in the
+source are written back to cold storage (``VoteArchive`` rows and their gzip
+JSONL files), not into the hot ``BlockchainVote`` table.
+
+File layout, one JSON object per line::
+
+    {"type": "snapshot", "version": 1, "block": ..., "head_block": ..., ...}
+    {"type": "question", "blockchain_id": ..., "choices": [...], "tallies": {...}, ...}
+    {"type": "vote", "question": <blockchain id>, "choice_index": ..., ...}
+    {"type": "vote", "question": <blockchain id>, "archived": true, ...}
+    {"type": "end", "questions": ..., "votes": ...}
+
+Questions are referenced by blockchain id, so local primary keys do not
+need to match between deployments. A file without its ``end`` line is
+rejected as truncated.
+"""
+
+from collections import Counter, defaultdict
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import gzip
+import json
+import logging
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from polls.listing import refresh_question_listings
+from polls.routing import primary_only
+from .archive import _vote_record, append_archived_records, iter_archived_votes
+from .bulk import bulk_create_inherited, insert_rows
+from .checkpoint import VOTES_STREAM, get_checkpoint
+from .models import BlockchainChoice, BlockchainQuestion, BlockchainVote, SyncCheckpoint, VoteArchive
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_BATCH_SIZE = 5000
+
+
+class SnapshotError(ValueError):
+    """The snapshot file is invalid or cannot be loaded into this database"""
+
+
+def _datetime(value) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _parse_datetime(value):
+    return parse_datetime(value) if value else None
+
+
+# ----------------------------------------------------------------------
+# Export
+# ----------------------------------------------------------------------
+
+def _repeatable_read(using: str) -> None:
+    """Make the current transaction's reads all see one point in time"""
+    connection = connections[using]
+    # SQLite and InnoDB already read from one snapshot per transaction
+    if connection.vendor == 'postgresql':
+        # Must be the first statement of the transaction
+        with connection.cursor() as cursor:
+            cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ")
+
+
+def _question_records(questions, block: int, using: str) -> Iterator[Dict[str, Any]]:
+    for start in range(0, len(questions), SNAPSHOT_BATCH_SIZE):
+        chunk = questions[start:start + SNAPSHOT_BATCH_SIZE]
+        ids = [q.pk for q in chunk]
+        choices = defaultdict(list)
+        for choice in BlockchainChoice.objects.using(using).filter(question_id__in=ids).order_by('ordinal', 'pk'):
+            choices[choice.question_id].append(
+                {'text': choice.choice_text, 'ordinal': choice.ordinal, 'votes': choice.votes}
+            )
+        tallies = defaultdict(Counter)
+        for row in _snapshot_votes(using, block).filter(question_id__in=ids).values(
+            'question_id', 'choice_index'
+        ).annotate(n=Count('pk')).order_by():
+            tallies[row['question_id']][row['choice_index']] += row['n']
+        for archive in VoteArchive.objects.using(using).filter(question_id__in=ids):
+            for index, n in archive.tallies.items():
+                tallies[archive.question_id][int(index)] += n
+
+        for question in chunk:
+            yield {
+                'type': 'question',
+                'blockchain_id': question.blockchain_id,
+                'question_text': question.question_text,
+                'pub_date': _datetime(question.pub_date),
+                'blockchain_tx_hash': question.blockchain_tx_hash,
+                'blockchain_created_at': _datetime(question.blockchain_created_at),
+                'closed_at': _datetime(question.closed_at),
+                'choices': choices[question.pk],
+                'tallies': {str(index): n for index, n in sorted(tallies[question.pk].items())},
+            }
+
+
+def _snapshot_votes(using: str, block: int):
+    # Votes past the checkpoint are fetched again after the import
+    return BlockchainVote.objects.using(using).filter(
+        Q(block_number__lte=block) | Q(block_number__isnull=True)
+    )
+
+
+def export_snapshot(path, on_progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Write the chain mirror, consistent at the sync checkpoint, to ``path``
+
+    Returns:
+        Dict[str, Any]: The snapshot block and the questions/votes written
+    """
+    stats = {'block': -1, 'questions': 0, 'votes': 0}
+    using = router.db_for_write(BlockchainVote)
+    with primary_only(), transaction.atomic(using=using):
+        _repeatable_read(using)
+        checkpoint = get_checkpoint()
+        block = checkpoint.last_block if checkpoint else -1
+        stats['block'] = block
+        questions = list(
+            BlockchainQuestion.objects.using(using).filter(blockchain_id__isnull=False).order_by('pk')
+        )
+        blockchain_ids = {q.pk: q.blockchain_id for q in questions}
+
+        with gzip.open(path, 'wt', encoding='utf-8') as handle:
+            def write(record):
+                handle.write(json.dumps(record, separators=(',', ':')) + '\n')
+
+            write({
+                'type': 'snapshot',
+                'version': SNAPSHOT_VERSION,
+                'block': block,
+                'head_block': checkpoint.head_block if checkpoint else 0,
+                'contract': getattr(settings, 'BLOCKCHAIN_CONTRACT_ADDRESS', ''),
+                'created_at': timezone.now().isoformat(),
+            })
+            for record in _question_records(questions, block, using):
+                write(record)
+                stats['questions'] += 1
+
+            votes = _snapshot_votes(using, block).filter(
+                question_id__in=blockchain_ids.keys()
+            ).order_by('pk').iterator(chunk_size=SNAPSHOT_BATCH_SIZE)
+            for vote in votes:
+                write({'type': 'vote', 'question': blockchain_ids[vote.question_id], **_vote_record(vote)})
+                stats['votes'] += 1
+                if on_progress and stats['votes'] % SNAPSHOT_BATCH_SIZE == 0:
+                    on_progress(stats)
+            for archive in VoteArchive.objects.using(using).filter(question_id__in=blockchain_ids.keys()):
+                for record in iter_archived_votes(archive.question_id, archive):
+                    del record['question_id']
+                    record['timestamp'] = _datetime(record['timestamp'])
+                    write({'type': 'vote', 'question': blockchain_ids[archive.question_id], 'archived': True,
+                           **record})
+                    stats['votes'] += 1
+
+            write({'type': 'end', 'questions': stats['questions'], 'votes': stats['votes']})
+
+    logger.info(f"Exported snapshot at block {stats['block']}: {stats}")
+    return stats
+
+
+# ----------------------------------------------------------------------
+# Import
+# ----------------------------------------------------------------------
+
+def _read_records(path) -> Iterator[Dict[str, Any]]:
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as handle:
+            for line in handle:
+                yield json.loads(line)
+    except (OSError, EOFError, ValueError) as e:
+        raise SnapshotError(f"Unreadable snapshot: {e}")
+
+
+def _load_questions(records: List[Dict[str, Any]], using: str) -> Dict[int, int]:
+    questions = bulk_create_inherited([
+        BlockchainQuestion(
+            question_text=r['question_text'],
+            pub_date=_parse_datetime(r['pub_date']),
+            blockchain_id=r['blockchain_id'],
+            blockchain_tx_hash=r['blockchain_tx_hash'],
+            is_blockchain_synced=True,
+            use_blockchain=True,
+            blockchain_created_at=_parse_datetime(r['blockchain_created_at']),
+            closed_at=_parse_datetime(r['closed_at']),
+        ) for r in records
+    ], using)
+    bulk_create_inherited([
+        BlockchainChoice(question_id=question.pk, choice_text=c['text'], ordinal=c['ordinal'], votes=c['votes'])
+        for question, record in zip(questions, records)
+        for c in record['choices']
+    ], using)
+    refresh_question_listings([q.pk for q in questions])
+    return {q.blockchain_id: q.pk for q in questions}
+
+
+def _load_archived_votes(records: List[Dict[str, Any]], question_ids: Dict[int, int], using: str) -> None:
+    by_question = defaultdict(list)
+    for record in records:
+        by_question[question_ids[record['question']]].append({
+            key: record[key] for key in
+            ('choice_index', 'voter_address', 'transaction_hash', 'block_number', 'log_index', 'timestamp')
+        })
+    for question_id, archived in by_question.items():
+        # One gzip member per batch, as archive_votes writes them
+        append_archived_records(question_id, archived, using)
+
+
+def _load_votes(records: List[Dict[str, Any]], question_ids: Dict[int, int], using: str) -> None:
+    connection = connections[using]
+    fields = [f for f in BlockchainVote._meta.concrete_fields if not f.primary_key]
+    rows = []
+    _load_archived_votes([r for r in records if r.get('archived')], question_ids, using)
+    for record in records:
+        if record.get('archived'):
+            continue
+        vote = BlockchainVote(
+            question_id=question_ids[record['question']],
+            choice_index=record['choice_index'],
+            voter_address=record['voter_address'],
+            transaction_hash=record['transaction_hash'],
+            block_number=record['block_number'],
+            log_index=record['log_index'],
+            timestamp=_parse_datetime(record['timestamp']) or timezone.now(),
+        )
+        rows.append(tuple(f.get_db_prep_save(getattr(vote, f.attname), connection) for f in fields))
+    insert_rows(BlockchainVote, fields, rows, using)
+
+
+def import_snapshot(path, batch_size: int = SNAPSHOT_BATCH_SIZE,
+                    on_progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+    """
+    Bulk-load a snapshot into a database without synced questions or votes
+
+    Everything loads in one transaction: a truncated file, tallies that do
+    not match the votes or an unknown question roll the whole import back
+    (archive members already written then lie past the committed size).
+    The votes sync checkpoint is then set to the snapshot block.
+
+    Returns:
+        Dict[str, Any]: The snapshot block and the questions/votes loaded
+
+    Raises:
+        SnapshotError: If the file is invalid or the database is not empty
+    """
+    using = router.db_for_write(BlockchainVote)
+    records = _read_records(path)
+    header = next(records, None)
+    if not header or header.get('type') != 'snapshot':
+        raise SnapshotError("Not a snapshot file")
+    if header.get('version') != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {header.get('version')}")
+    if (BlockchainQuestion.objects.using(using).filter(blockchain_id__isnull=False).exists()
+            or BlockchainVote.objects.using(using).exists()
+            or VoteArchive.objects.using(using).exists()):
+        raise SnapshotError("The database already has synced questions or votes; import into an empty one")
+
+    stats = {'block': header['block'], 'questions': 0, 'votes': 0}
+    question_ids: Dict[int, int] = {}
+    expected: Dict[int, Dict[str, int]] = {}
+    loaded: Dict[int, Counter] = defaultdict(Counter)
+    batch: List[Dict[str, Any]] = []
+    batch_type = None
+    finished = False
+
+    def flush():
+        if not batch:
+            return
+        if batch_type == 'question':
+            question_ids.update(_load_questions(batch, using))
+            stats['questions'] += len(batch)
+        elif batch_type == 'vote':
+            _load_votes(batch, question_ids, using)
+            stats['votes'] += len(batch)
+        batch.clear()
+        if on_progress:
+            on_progress(stats)
+
+    with transaction.atomic(using=using):
+        for record in records:
+            kind = record.get('type')
+            if kind != batch_type or len(batch) >= batch_size:
+                flush()
+                batch_type = kind
+            if kind == 'question':
+                expected[record['blockchain_id']] = record['tallies']
+            elif kind == 'vote':
+                if record['question'] not in expected:
+                    raise SnapshotError(f"Vote {record['transaction_hash']} of unknown question {record['question']}")
+                loaded[record['question']][str(record['choice_index'])] += 1
+            elif kind == 'end':
+                finished = (record['questions'], record['votes']) == (len(expected), sum(
+                    sum(counts.values()) for counts in loaded.values()
+                ))
+                break
+            else:
+                raise SnapshotError(f"Unknown record type {kind!r}")
+            batch.append(record)
+        if not finished:
+            raise SnapshotError("Truncated snapshot: missing or inconsistent end record")
+        flush()
+
+        for blockchain_id, tallies in expected.items():
+            if dict(loaded[blockchain_id]) != tallies:
+                raise SnapshotError(f"Votes of question {blockchain_id} do not match its tallies")
+
+        SyncCheckpoint.objects.using(using).update_or_create(name=VOTES_STREAM, defaults={
+            'last_block': header['block'],
+            'head_block': header['head_block'],
+            'votes_ingested': stats['votes'],
+            'last_run_votes': 0,
+            'last_run_seconds': 0,
+        })
+
+    logger.info(f"Imported snapshot at block {stats['block']}: {stats}")
+    return stats
@@ -13,8 +13,11 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.utils import timezone
 from django.core.paginator import Paginator
+from django.contrib.admin.views.decorators import staff_member_required
 
-from polls.models import Question as BaseQuestion, Choice as BaseChoice
+from polls.models import Question as BaseQuestion, Choice as BaseChoice, QuestionListing
+from polls.pagination import keyset_page
+from polls.routing import read_only_view
 from .models import BlockchainQuestion, BlockchainChoice, BlockchainVote
 from .services import blockchain_service
 from .config import is_web3_connected
@@ -25,45 +28,28 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+@read_only_view
 def hybrid_index(request):
     """
     Enhanced index view that shows both regular and blockchain questions
     """
-    # Get all questions (both regular and blockchain)
-    all_questions = []
-    
-    # Get regular Django questions
-    regular_questions = BaseQuestion.objects.order_by('-pub_date')[:5]
-    for q in regular_questions:
-        all_questions.append({
-            'question': q,
-            'type': 'django',
-            'is_blockchain': False,
-            'is_synced': False,
-            'blockchain_available': False
-        })
-    
-    # Get blockchain questions
-    blockchain_questions = BlockchainQuestion.objects.order_by('-pub_date')[:5]
-    for q in blockchain_questions:
-        all_questions.append({
+    # Both question kinds come from the flat listing table in one query
+    service_available = blockchain_service.is_available()
+    latest_questions = [
+        {
             'question': q,
-            'type': 'blockchain',
+            'type': q.question_type,
             'is_blockchain': q.use_blockchain,
-            'is_synced': q.is_blockchain_synced,
-            'blockchain_available': q.is_blockchain_available()
-        })
-    
-    # Sort all questions by publication date
-    all_questions.sort(key=lambda x: x['question'].pub_date, reverse=True)
-    
-    # Take only the latest 10
-    latest_questions = all_questions[:10]
+            'is_synced': q.is_synced,
+            'blockchain_available': q.use_blockchain and service_available
+        }
+        for q in QuestionListing.objects.order_by('-pub_date')[:10]
+    ]
     
     context = {
         'latest_question_list': latest_questions,
         'blockchain_connected': is_web3_connected(),
-        'blockchain_service_available': blockchain_service.is_available()
+        'blockchain_service_available': service_available
     }
     
     return render(request, 'polls/hybrid_index.html', context)
@@ -159,6 +145,10 @@ def hybrid_vote(request, question_id, question_type='auto'):
     # Handle voting based on question type
     vote_method = request.POST.get('vote_method', 'django')  # Default to Django voting
     
+    if is_blockchain and question.is_closed:
+        messages.error(request, 'La votación de esta pregunta está cerrada.')
+        return HttpResponseRedirect(reverse('polls:hybrid_results', args=(question.id,)))
+    
     if is_blockchain and vote_method == 'blockchain' and hasattr(question, 'use_blockchain'):
         # Blockchain voting
         success = handle_blockchain_vote(request, question, selected_choice)
@@ -167,13 +157,11 @@ def hybrid_vote(request, question_id, question_type='auto'):
         else:
             messages.error(request, 'Error al registrar el voto en blockchain. Se registró en Django.')
             # Fall back to Django voting
-            selected_choice.votes += 1
-            selected_choice.save()
+            selected_choice.add_vote()
             messages.info(request, 'Voto registrado en Django como respaldo.')
     else:
         # Traditional Django voting
-        selected_choice.votes += 1
-        selected_choice.save()
+        selected_choice.add_vote()
         messages.success(request, '¡Tu voto ha sido registrado correctamente! 💾')
     
     return HttpResponseRedirect(reverse('polls:hybrid_results', args=(question.id,)))
@@ -191,14 +179,8 @@ def handle_blockchain_vote(request, question, selected_choice):
             logger.warning("Blockchain not available for voting")
             return False
         
-        # Find choice index
-        choices = list(question.choice_set.all())
-        choice_index = None
-        
-        for i, choice in enumerate(choices):
-            if choice.id == selected_choice.id:
-                choice_index = i
-                break
+        # The stored ordinal is the on-chain choice index
+        choice_index = selected_choice.ordinal
         
         if choice_index is None:
             logger.error("Could not find choice index for blockchain voting")
@@ -229,6 +211,7 @@ def handle_blockchain_vote(request, question, selected_choice):
         return False
 
 
+@read_only_view
 def hybrid_results(request, question_id, question_type='auto'):
     """
     Enhanced results view that shows both Django and blockchain results
@@ -316,7 +299,8 @@ def create_blockchain_question(request):
             'success': True,
             'question_id': question.id,
             'blockchain_id': question.blockchain_id,
-            'is_synced': question.is_blockchain_synced
+            'is_synced': question.is_blockchain_synced,
+            'queued': question.use_blockchain and not question.is_blockchain_synced
         })
         
     except Exception as e:
@@ -346,6 +330,53 @@ def blockchain_status(request):
         })
 
 
+EXPORT_PAGE_SIZE = 500
+EXPORT_MAX_PAGE_SIZE = 1000
+
+
+@staff_member_required
+@read_only_view
+def vote_export(request):
+    """
+    API endpoint exporting votes newest first, one keyset page per call
+    
+    Query params: ``question`` (local id), ``cursor`` (from the previous
+    page's ``next_cursor``) and ``limit``. Votes moved to cold storage are
+    not included; see ``archive_votes --restore``.
+    """
+    votes = BlockchainVote.objects.all()
+    
+    question_id = request.GET.get('question')
+    if question_id:
+        if not question_id.isdigit():
+            return JsonResponse({'success': False, 'error': 'Invalid question'}, status=400)
+        votes = votes.filter(question_id=int(question_id))
+    
+    try:
+        limit = min(int(request.GET.get('limit', EXPORT_PAGE_SIZE)), EXPORT_MAX_PAGE_SIZE)
+        rows, next_cursor = keyset_page(votes, request.GET.get('cursor'), max(limit, 1))
+    except ValueError:
+        return JsonResponse({'success': False, 'error': 'Invalid cursor or limit'}, status=400)
+    
+    return JsonResponse({
+        'success': True,
+        'votes': [
+            {
+                'id': vote.pk,
+                'question_id': vote.question_id,
+                'choice_index': vote.choice_index,
+                'voter_address': vote.voter_address,
+                'transaction_hash': vote.transaction_hash,
+                'block_number': vote.block_number,
+                'log_index': vote.log_index,
+                'timestamp': vote.timestamp.isoformat(),
+            }
+            for vote in rows
+        ],
+        'next_cursor': next_cursor
+    })
+
+
 def sync_question_to_blockchain(request, question_id):
     """
     Manual sync of existing question to blockchain
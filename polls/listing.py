@@ -0,0 +1,116 @@
+"""
+Maintenance of the ``QuestionListing`` read model
+
+Every save/delete of a question, choice or blockchain question refreshes the
+affected listing row through signals, except votes-only choice saves:
+``Choice.add_vote`` increments ``total_votes`` in place. Bulk ``update()``/raw paths call
+``refresh_question_listings`` or ``rebuild_question_listings`` explicitly.
+"""
+
+from typing import Iterable, Optional
+import logging
+
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import Count, Sum
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Question, Choice, QuestionListing
+
+logger = logging.getLogger(__name__)
+
+
+def _listing_queryset(using=None):
+    return Question.objects.db_manager(using).select_related('blockchainquestion').annotate(
+        listing_choice_count=Count('choice'),
+        listing_total_votes=Sum('choice__votes'),
+    ).order_by()
+
+
+def _listing_from_question(question) -> QuestionListing:
+    try:
+        bq = question.blockchainquestion
+    except ObjectDoesNotExist:
+        bq = None
+
+    return QuestionListing(
+        id=question.pk,
+        question_type=QuestionListing.TYPE_BLOCKCHAIN if bq else QuestionListing.TYPE_DJANGO,
+        question_text=question.question_text,
+        pub_date=question.pub_date,
+        use_blockchain=bq.use_blockchain if bq else False,
+        is_synced=bq.is_blockchain_synced if bq else False,
+        blockchain_id=bq.blockchain_id if bq else None,
+        choice_count=question.listing_choice_count or 0,
+        total_votes=question.listing_total_votes or 0,
+    )
+
+
+def refresh_question_listing(question_id: int, using: Optional[str] = None) -> Optional[QuestionListing]:
+    """Recompute one listing row (or drop it if the question is gone)"""
+    question = _listing_queryset(using).filter(pk=question_id).first()
+    if question is None:
+        QuestionListing.objects.db_manager(using).filter(pk=question_id).delete()
+        return None
+    listing = _listing_from_question(question)
+    listing.save(using=using)
+    return listing
+
+
+def refresh_question_listings(question_ids: Iterable[int], batch_size: int = 500) -> int:
+    """Recompute listing rows for several questions in bulk"""
+    ids = list(set(question_ids))
+    refreshed = 0
+    for start in range(0, len(ids), batch_size):
+        chunk = ids[start:start + batch_size]
+        listings = [_listing_from_question(q) for q in _listing_queryset().filter(pk__in=chunk)]
+        found = {listing.id for listing in listings}
+        QuestionListing.objects.filter(pk__in=set(chunk) - found).delete()
+        QuestionListing.objects.bulk_create(
+            listings,
+            update_conflicts=True,
+            unique_fields=['id'],
+            update_fields=[
+                'question_type', 'question_text', 'pub_date', 'use_blockchain',
+                'is_synced', 'blockchain_id', 'choice_count', 'total_votes', 'updated_at'
+            ],
+        )
+        refreshed += len(listings)
+    return refreshed
+
+
+def rebuild_question_listings(batch_size: int = 500) -> int:
+    """Rebuild the whole read model from the source tables"""
+    ids = Question.objects.values_list('pk', flat=True)
+    QuestionListing.objects.exclude(pk__in=ids).delete()
+    return refresh_question_listings(ids, batch_size=batch_size)
+
+
+# ----------------------------------------------------------------------
+# Signal handlers
+# ----------------------------------------------------------------------
+
+@receiver(post_save, sender=Question)
+@receiver(post_delete, sender=Question)
+def question_changed(sender, instance, using=None, **kwargs):
+    refresh_question_listing(instance.pk, using=using)
+
+
+@receiver(post_save, sender=Choice)
+@receiver(post_delete, sender=Choice)
+def choice_changed(sender, instance, using=None, **kwargs):
+    # Choice.add_vote updates the listing's total itself, without the aggregate
+    if kwargs.get('update_fields') == frozenset({'votes'}):
+        return
+    if instance.question_id:
+        refresh_question_listing(instance.question_id, using=using)
+
+
+def connect_blockchain_handlers():
+    """Subclass models send signals with their own sender; hook them too"""
+    from .blockchain.models import BlockchainQuestion, BlockchainChoice
+
+    post_save.connect(question_changed, sender=BlockchainQuestion, dispatch_uid='listing_bq_save')
+    post_delete.connect(question_changed, sender=BlockchainQuestion, dispatch_uid='listing_bq_delete')
+    post_save.connect(choice_changed, sender=BlockchainChoice, dispatch_uid='listing_bc_save')
+    post_delete.connect(choice_changed, sender=BlockchainChoice, dispatch_uid='listing_bc_delete')
@@ -0,0 +1,317 @@
+"""
+HTTP Load-Test Harness for the Vote and Results Endpoints
+
+``run_load_test`` drives a weighted mix of ``polls:vote``,
+``polls:hybrid_vote``, ``polls:results`` and ``polls:web3_results``
+requests from N concurrent clients, each with its own session, against:
+
+- the WSGI app in this process (``WSGITransport``, the default): the full
+  middleware stack through ``django.test.Client``, without CSRF checks;
+- a running server (``HTTPTransport``), e.g. ``runserver`` on this checkout:
+  every client fetches a CSRF token from the detail page before voting.
+
+The questions under test are created (and purged afterwards) in this
+process's default database, so an HTTP target must share that database.
+With the mock blockchain, hybrid votes fall back to ``Choice.votes``; with a
+node they become ``BlockchainVote`` rows. The lost-vote check compares the
+votes the server accepted (302 redirects) with the growth of both counts.
+"""
+
+from collections import defaultdict
+from http.cookiejar import CookieJar
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlencode
+import logging
+import random
+import threading
+import time
+import urllib.request
+
+from django.db import connections
+from django.db.models import Count, Sum
+from django.test import Client
+from django.urls import reverse
+
+from polls.benchmarks import latency_summary
+from polls.blockchain.maintenance import purge_question
+from polls.blockchain.models import BlockchainQuestion, BlockchainVote
+from polls.models import Choice
+
+logger = logging.getLogger(__name__)
+
+ENDPOINTS = ('vote', 'hybrid_vote', 'results', 'web3_results')
+VOTE_ENDPOINTS = ('vote', 'hybrid_vote')
+DEFAULT_MIX = {'vote': 1, 'hybrid_vote': 1, 'results': 4, 'web3_results': 4}
+REQUEST_TIMEOUT = 30
+
+Operation = Tuple[str, int, int]
+
+
+def parse_mix(spec: str) -> Dict[str, int]:
+    """
+    Parse a mix like ``vote=1,results=4`` into endpoint weights
+
+    Raises:
+        ValueError: On unknown endpoints, bad weights or an all-zero mix
+    """
+    mix = {}
+    for part in filter(None, (p.strip() for p in spec.split(','))):
+        name, _, weight = part.partition('=')
+        if name not in ENDPOINTS:
+            raise ValueError(f"Unknown endpoint {name!r}; choose from {', '.join(ENDPOINTS)}")
+        try:
+            mix[name] = int(weight or 1)
+        except ValueError:
+            raise ValueError(f"Invalid weight for {name}: {weight!r}")
+        if mix[name] < 0:
+            raise ValueError(f"Negative weight for {name}")
+    if not any(mix.values()):
+        raise ValueError("The mix needs at least one endpoint with a positive weight")
+    return mix
+
+
+# ----------------------------------------------------------------------
+# Transports
+# ----------------------------------------------------------------------
+
+class WSGITransport:
+    """Requests through this process's WSGI handler"""
+
+    name = 'wsgi'
+    target = 'wsgi'
+
+    def session(self) -> 'WSGISession':
+        return WSGISession()
+
+
+class WSGISession:
+    def __init__(self):
+        # A failing view is a 500 for the report, not an exception in the client thread
+        self.client = Client(raise_request_exception=False)
+
+    def request(self, method: str, path: str, data: Optional[Dict[str, Any]] = None) -> int:
+        if method == 'POST':
+            return self.client.post(path, data).status_code
+        return self.client.get(path).status_code
+
+    def close(self):
+        # Worker threads each open their own connections
+        connections.close_all()
+
+
+class HTTPTransport:
+    """Requests to a running server at ``base_url``"""
+
+    name = 'http'
+
+    def __init__(self, base_url: str):
+        self.target = base_url.rstrip('/')
+
+    def session(self) -> 'HTTPSession':
+        return HTTPSession(self.target)
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        # Report the 302 itself; following it would time the results page too
+        return None
+
+
+class HTTPSession:
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self.cookies = CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.cookies), _NoRedirect)
+
+    def _csrf_token(self) -> Optional[str]:
+        return next((c.value for c in self.cookies if c.name == 'csrftoken'), None)
+
+    def prepare(self, question_id: int) -> None:
+        """Get the CSRF cookie from a page that renders the vote form"""
+        if self._csrf_token() is None:
+            self.request('GET', reverse('polls:detail', args=(question_id,)))
+
+    def request(self, method: str, path: str, data: Optional[Dict[str, Any]] = None) -> int:
+        url = self.base_url + path
+        body, headers = None, {}
+        if method == 'POST':
+            body = urlencode(data or {}).encode()
+            headers = {'X-CSRFToken': self._csrf_token() or '', 'Referer': url}
+        try:
+            with self.opener.open(urllib.request.Request(url, body, headers, method=method),
+                                  timeout=REQUEST_TIMEOUT) as response:
+                response.read()
+                return response.status
+        except HTTPError as e:
+            return e.code
+
+    def close(self):
+        pass
+
+
+# ----------------------------------------------------------------------
+# Fixtures and vote accounting
+# ----------------------------------------------------------------------
+
+def create_fixtures(questions: int, choices: int) -> Dict[int, List[int]]:
+    """Synced blockchain questions (valid for every endpoint): ``{question_id: [choice ids]}``"""
+    fixtures = {}
+    for number in range(questions):
+        question = BlockchainQuestion.objects.create_with_blockchain(
+            question_text=f"Load test Q{number + 1}",
+            choices=[f"Option {i}" for i in range(choices)],
+            use_blockchain=True,
+        )
+        question.create_on_blockchain()
+        fixtures[question.pk] = list(question.choice_set.order_by('ordinal').values_list('pk', flat=True))
+    return fixtures
+
+
+def recorded_votes(question_ids: List[int]) -> Dict[int, int]:
+    """``Choice.votes`` plus ``BlockchainVote`` rows, per question"""
+    counts = defaultdict(int)
+    for row in Choice.objects.filter(question_id__in=question_ids).values('question_id').annotate(
+        n=Sum('votes')
+    ).order_by():
+        counts[row['question_id']] += row['n'] or 0
+    for row in BlockchainVote.objects.filter(question_id__in=question_ids).values('question_id').annotate(
+        n=Count('pk')
+    ).order_by():
+        counts[row['question_id']] += row['n']
+    return counts
+
+
+# ----------------------------------------------------------------------
+# Run
+# ----------------------------------------------------------------------
+
+def _plan(fixtures: Dict[int, List[int]], mix: Dict[str, int], requests: int, seed: int) -> List[Operation]:
+    rng = random.Random(seed)
+    endpoints = [name for name in ENDPOINTS if mix.get(name)]
+    weights = [mix[name] for name in endpoints]
+    question_ids = list(fixtures)
+    plan = []
+    for endpoint in rng.choices(endpoints, weights, k=requests):
+        question_id = rng.choice(question_ids)
+        plan.append((endpoint, question_id, rng.choice(fixtures[question_id])))
+    return plan
+
+
+def _send(session, operation: Operation) -> bool:
+    endpoint, question_id, choice_id = operation
+    if endpoint == 'vote':
+        data = {'choice': choice_id}
+    elif endpoint == 'hybrid_vote':
+        data = {'choice': choice_id, 'vote_method': 'blockchain'}
+    else:
+        return session.request('GET', reverse(f'polls:{endpoint}', args=(question_id,))) == 200
+    return session.request('POST', reverse(f'polls:{endpoint}', args=(question_id,)), data) == 302
+
+
+def run_load_test(transport=None, mix: Optional[Dict[str, int]] = None, clients: int = 8,
+                  requests: int = 2000, duration: Optional[float] = None, questions: int = 5,
+                  choices: int = 4, seed: int = 0, keep: bool = False,
+                  on_progress: Optional[Callable[[int], None]] = None) -> Dict[str, Any]:
+    """
+    Run ``requests`` planned requests (or until ``duration`` seconds pass)
+
+    Returns:
+        Dict[str, Any]: Throughput, error rate, per-endpoint latency
+        percentiles and the lost-vote check (``votes``)
+    """
+    transport = transport or WSGITransport()
+    fixtures = create_fixtures(questions, choices)
+    question_ids = list(fixtures)
+    try:
+        before = recorded_votes(question_ids)
+        plan = _plan(fixtures, mix or DEFAULT_MIX, requests, seed)
+        samples: Dict[str, List[float]] = defaultdict(list)
+        errors: Dict[str, int] = defaultdict(int)
+        accepted: Dict[int, int] = defaultdict(int)
+        lock = threading.Lock()
+        cursor = iter(range(len(plan)))
+        done = [0]
+        deadline = time.perf_counter() + duration if duration else None
+
+        def client():
+            session = transport.session()
+            latencies, failures, votes = defaultdict(list), defaultdict(int), defaultdict(int)
+            try:
+                while deadline is None or time.perf_counter() < deadline:
+                    with lock:
+                        index = next(cursor, None)
+                    if index is None:
+                        break
+                    operation = plan[index]
+                    if operation[0] in VOTE_ENDPOINTS and hasattr(session, 'prepare'):
+                        session.prepare(operation[1])
+                    started = time.perf_counter()
+                    try:
+                        ok = _send(session, operation)
+                    except (URLError, OSError) as e:
+                        logger.warning(f"Load test request failed: {e}")
+                        ok = False
+                    latencies[operation[0]].append(time.perf_counter() - started)
+                    if not ok:
+                        failures[operation[0]] += 1
+                    elif operation[0] in VOTE_ENDPOINTS:
+                        votes[operation[1]] += 1
+                    with lock:
+                        done[0] += 1
+                        if on_progress and done[0] % 100 == 0:
+                            on_progress(done[0])
+            finally:
+                session.close()
+                with lock:
+                    for name, values in latencies.items():
+                        samples[name].extend(values)
+                    for name, n in failures.items():
+                        errors[name] += n
+                    for question_id, n in votes.items():
+                        accepted[question_id] += n
+
+        workers = [threading.Thread(target=client, name=f'loadtest-{i}') for i in range(clients)]
+        started = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        elapsed = time.perf_counter() - started
+
+        after = recorded_votes(question_ids)
+        lost = {
+            question_id: accepted[question_id] - (after[question_id] - before[question_id])
+            for question_id in question_ids
+        }
+    finally:
+        if not keep:
+            for question_id in question_ids:
+                purge_question(question_id)
+
+    total = sum(len(values) for values in samples.values())
+    failed = sum(errors.values())
+    return {
+        'transport': transport.name,
+        'target': transport.target,
+        'clients': clients,
+        'requests': total,
+        'seconds': round(elapsed, 3),
+        'throughput': round(total / elapsed, 1) if elapsed else 0.0,
+        'errors': failed,
+        'error_rate': round(failed / total, 4) if total else 0.0,
+        'endpoints': {
+            name: {
+                'errors': errors[name],
+                'error_rate': round(errors[name] / len(samples[name]), 4),
+                **latency_summary(samples[name]),
+            }
+            for name in ENDPOINTS if samples.get(name)
+        },
+        'votes': {
+            'accepted': sum(accepted.values()),
+            'recorded': sum(after[q] - before[q] for q in question_ids),
+            'lost': sum(lost.values()),
+            'lost_by_question': {q: n for q, n in lost.items() if n},
+        },
+    }
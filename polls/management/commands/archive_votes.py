@@ -0,0 +1,85 @@
+"""
+Django Management Command to move votes of closed questions to cold storage
+
+Votes of questions closed for longer than the grace period are appended to
+per-question gzip JSONL files under ``VOTE_ARCHIVE_DIR`` and deleted from
+``BlockchainVote``; tallies are kept on ``VoteArchive``.
+
+Usage:
+    python manage.py archive_votes
+    python manage.py archive_votes --inactive-days 90 --dry-run
+    python manage.py archive_votes --question-id 12
+    python manage.py archive_votes --restore 12
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+
+from polls.blockchain.archive import (
+    ARCHIVE_BATCH_SIZE,
+    CLOSED_GRACE_DAYS,
+    archivable_questions,
+    archive_question_votes,
+    inactive_questions,
+    restore_question_votes,
+)
+from polls.blockchain.models import BlockchainQuestion
+
+
+class Command(BaseCommand):
+    help = 'Archive votes of closed questions into compressed per-question files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--question-id', type=int, action='append',
+                            help='Archive this question (repeatable); must be closed')
+        parser.add_argument('--closed-days', type=int, default=CLOSED_GRACE_DAYS,
+                            help='Days after closing before votes are archived')
+        parser.add_argument('--inactive-days', type=int,
+                            help='Also close questions without votes for this many days (archived after the grace period)')
+        parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE, help='Votes per archive batch')
+        parser.add_argument('--dry-run', action='store_true', help='Only report what would be archived')
+        parser.add_argument('--restore', type=int, metavar='QUESTION_ID',
+                            help='Rehydrate an archived question back into the votes table')
+
+    def handle(self, *args, **options):
+        if options['restore']:
+            restored = restore_question_votes(options['restore'])
+            self.stdout.write(self.style.SUCCESS(f"✅ Restored {restored} votes of Q{options['restore']}"))
+            return
+
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be positive")
+
+        if options['question_id']:
+            questions = BlockchainQuestion.objects.filter(pk__in=options['question_id'])
+            open_ids = [q.pk for q in questions if not q.is_closed]
+            if open_ids:
+                raise CommandError(f"Questions still open: {open_ids}")
+        elif options['dry_run']:
+            # Dry runs must not close inactive questions; list the ones a real run would close
+            if options['inactive_days'] is not None:
+                for question in inactive_questions(options['inactive_days']):
+                    self.stdout.write(
+                        f"  Q{question.pk}: inactive, would be closed "
+                        f"(archived after the {options['closed_days']}-day grace period)"
+                    )
+            questions = archivable_questions(closed_days=options['closed_days'])
+        else:
+            questions = archivable_questions(
+                closed_days=options['closed_days'],
+                inactive_days=options['inactive_days'],
+            )
+
+        questions = questions.annotate(hot_votes=Count('blockchainvote'))
+        total = 0
+        for question in questions:
+            if options['dry_run']:
+                self.stdout.write(f"  Q{question.pk}: {question.hot_votes} votes would be archived")
+                total += question.hot_votes
+                continue
+            archived = archive_question_votes(question, batch_size=options['batch_size'])
+            self.stdout.write(f"  🧊 Q{question.pk}: {archived} votes archived")
+            total += archived
+
+        verb = "would be archived" if options['dry_run'] else "archived"
+        self.stdout.write(self.style.SUCCESS(f"✅ {total} votes {verb}"))
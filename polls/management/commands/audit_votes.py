@@ -0,0 +1,98 @@
+"""
+Django Management Command to audit vote consistency
+
+Compares on-chain tallies, local ``BlockchainVote`` rows and ``Choice.votes``
+for every synced question and reports the drift. With ``--repair`` the
+questions whose local votes differ from the chain are re-synced over their
+own block range.
+
+Usage:
+    python manage.py audit_votes
+    python manage.py audit_votes --question-id 12 --question-id 15
+    python manage.py audit_votes --batch-size 200 --concurrency 8 --json
+    python manage.py audit_votes --repair
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from polls.blockchain.audit import (
+    AUDIT_BATCH_SIZE,
+    AUDIT_CONCURRENCY,
+    audit_votes,
+    repair_question_votes,
+)
+from polls.blockchain.services import blockchain_service
+
+
+class Command(BaseCommand):
+    help = 'Audit chain, BlockchainVote and Choice.votes tallies and optionally repair drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--question-id', type=int, action='append',
+                            help='Audit this question (repeatable); all synced by default')
+        parser.add_argument('--batch-size', type=int, default=AUDIT_BATCH_SIZE,
+                            help='Questions per JSON-RPC batch')
+        parser.add_argument('--concurrency', type=int, default=AUDIT_CONCURRENCY,
+                            help='JSON-RPC batches in flight')
+        parser.add_argument('--repair', action='store_true',
+                            help='Re-sync the votes of questions that drifted from the chain')
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1 or options['concurrency'] < 1:
+            raise CommandError("--batch-size and --concurrency must be positive")
+        if not blockchain_service.is_available():
+            raise CommandError("Blockchain not available: on-chain tallies cannot be read")
+
+        report = audit_votes(
+            options['question_id'],
+            batch_size=options['batch_size'],
+            concurrency=options['concurrency'],
+            on_progress=None if options['json'] else self._write_progress,
+        )
+
+        if options['repair']:
+            report['repairs'] = {
+                entry['question_id']: repair_question_votes(entry['question_id'])
+                for entry in report['drift'] if entry['vote_drift']
+            }
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write("")
+        for entry in report['drift']:
+            style = self.style.ERROR if entry['vote_drift'] else self.style.WARNING
+            self.stdout.write(style(
+                f"  Q{entry['question_id']} (chain #{entry['blockchain_id']}) "
+                f"{entry['question_text'][:40]}: chain {entry['chain']} · "
+                f"BlockchainVote {entry['local']} · Choice.votes {entry['django']}"
+            ))
+        for question_id, error in report['errors'].items():
+            self.stdout.write(self.style.ERROR(f"  ❌ Q{question_id}: {error}"))
+        for question_id, result in report.get('repairs', {}).items():
+            if result.get('success'):
+                self.stdout.write(
+                    f"  🔧 Q{question_id}: blocks {result['from_block']}-{result['to_block']} re-synced, "
+                    f"{result['inserted']} inserted, {result['removed']} removed"
+                )
+            else:
+                self.stdout.write(self.style.ERROR(f"  ❌ Q{question_id} repair failed: {result['error']}"))
+
+        self.stdout.write(f"\n=== Audit Summary ===")
+        self.stdout.write(f"✅ In sync: {report['in_sync']}/{report['audited']}")
+        self.stdout.write(f"⛓️  Chain vs BlockchainVote drift: {report['vote_drift']}")
+        self.stdout.write(f"💾 Chain vs Choice.votes drift: {report['choice_drift']}")
+        if report['errors']:
+            self.stdout.write(f"❌ Errors: {len(report['errors'])}")
+
+    def _write_progress(self, report):
+        self.stdout.write(
+            f"\r  ⏳ {report['audited']} audited · {report['vote_drift']} vote drift · "
+            f"{report['choice_drift']} choice drift",
+            ending=''
+        )
+        self.stdout.flush()
@@ -0,0 +1,82 @@
+"""
+Django Management Command to benchmark the core use cases
+
+Syncs synthetic chains of ``VoteCast`` events with ``SyncVotesUseCase`` and
+samples ``GetQuestionResultsUseCase`` reads, on the in-memory repositories
+and on the Django repositories, and prints a JSON report (see
+``polls.benchmarks``) to compare changes to the hot paths.
+
+Usage:
+    python manage.py benchmark_use_cases
+    python manage.py benchmark_use_cases --backend memory --events 1000000
+    python manage.py benchmark_use_cases --events 10000 --events 100000 --output bench.json
+
+Django runs use a throwaway test database (created, migrated and dropped by
+the command); ``--use-default-db`` runs them on the default database
+instead, purging their rows afterwards.
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from polls.benchmarks import (
+    BACKENDS,
+    DEFAULT_CHOICES,
+    DEFAULT_EVENT_COUNTS,
+    DEFAULT_QUESTIONS,
+    RESULTS_SAMPLES,
+    run_suite,
+)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark SyncVotesUseCase and GetQuestionResultsUseCase on synthetic chains'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--backend', action='append', choices=BACKENDS,
+                            help='Repository backend (repeatable); both by default')
+        parser.add_argument('--events', type=int, action='append',
+                            help=f'Chain size in events (repeatable); default {DEFAULT_EVENT_COUNTS}')
+        parser.add_argument('--questions', type=int, default=DEFAULT_QUESTIONS,
+                            help='Questions the votes are spread over')
+        parser.add_argument('--choices', type=int, default=DEFAULT_CHOICES, help='Choices per question')
+        parser.add_argument('--samples', type=int, default=RESULTS_SAMPLES,
+                            help='Questions whose results are read per run')
+        parser.add_argument('--seed', type=int, default=0, help='Synthetic chain seed')
+        parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+        parser.add_argument('--use-default-db', action='store_true',
+                            help='Run Django backends on the default database instead of a throwaway one')
+
+    def handle(self, *args, **options):
+        event_counts = options['events'] or DEFAULT_EVENT_COUNTS
+        if min(event_counts) < 1 or min(options['questions'], options['choices'], options['samples']) < 1:
+            raise CommandError("--events, --questions, --choices and --samples must be positive")
+
+        report = run_suite(
+            backends=options['backend'] or BACKENDS,
+            event_counts=event_counts,
+            questions=options['questions'],
+            choices=options['choices'],
+            samples=options['samples'],
+            seed=options['seed'],
+            use_default_db=options['use_default_db'],
+            on_run=self._write_run,
+        )
+
+        output = json.dumps(report, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as handle:
+                handle.write(output + '\n')
+            self.stderr.write(f"✅ Report written to {options['output']}")
+        else:
+            self.stdout.write(output)
+
+    def _write_run(self, run):
+        # Progress goes to stderr so stdout stays valid JSON
+        self.stderr.write(
+            f"⏱️  {run['backend']:<6} {run['events']:>9} events: "
+            f"{run['sync']['events_per_second']:>10.1f} events/s, "
+            f"peak {run['sync']['peak_memory_bytes'] / 2**20:.1f} MiB, "
+            f"results p95 {run['results']['p95_ms']:.2f} ms"
+        )
@@ -8,12 +8,23 @@ Usage:
     python manage.py blockchain_sync --help
     python manage.py blockchain_sync status
     python manage.py blockchain_sync sync_all
+    python manage.py blockchain_sync sync_all --batch-size 200 --concurrency 32
     python manage.py blockchain_sync sync_question <id>
+
+Large deletes (purging questions or vote ranges) live in ``maintenance``.
 """
 
 from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
+from polls.blockchain.bulk_sync import (
+    SYNC_BATCH_SIZE,
+    SYNC_CONCURRENCY,
+    pending_question_ids,
+    sync_pending_questions,
+)
+from polls.blockchain.maintenance import reset_sync_state
 from polls.blockchain.models import BlockchainQuestion, BlockchainVote
+from polls.blockchain.outbox import pending_count as outbox_pending_count
 from polls.blockchain.services import blockchain_service
 from polls.blockchain.config import is_web3_connected
 from polls.models import Question
@@ -44,6 +55,20 @@ class Command(BaseCommand):
             help='Force operation even if blockchain is not connected'
         )
         
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=SYNC_BATCH_SIZE,
+            help='Questions loaded per batch for sync_all'
+        )
+        
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=SYNC_CONCURRENCY,
+            help='Maximum unconfirmed creations in flight for sync_all'
+        )
+        
         parser.add_argument(
             '--verbose',
             action='store_true',
@@ -59,7 +84,11 @@ class Command(BaseCommand):
             if action == 'status':
                 self.show_status()
             elif action == 'sync_all':
-                self.sync_all_questions(force=options['force'])
+                self.sync_all_questions(
+                    force=options['force'],
+                    batch_size=options['batch_size'],
+                    concurrency=options['concurrency']
+                )
             elif action == 'sync_question':
                 question_id = options.get('question_id')
                 if not question_id:
@@ -125,63 +154,63 @@ class Command(BaseCommand):
             self.stdout.write(
                 self.style.WARNING(f"⏳ Pending Sync: {pending} questions")
             )
+        
+        queued = outbox_pending_count()
+        if queued:
+            self.stdout.write(f"📬 Outbox: {queued} creations queued (run process_outbox)")
     
-    def sync_all_questions(self, force=False):
-        """Sync all blockchain questions"""
+    def sync_all_questions(self, force=False, batch_size=SYNC_BATCH_SIZE, concurrency=SYNC_CONCURRENCY):
+        """Sync all blockchain questions, keeping several creations in flight"""
         if not force and not is_web3_connected():
             raise CommandError(
                 "Blockchain not connected. Use --force to sync anyway (mock mode)"
             )
+        if batch_size < 1 or concurrency < 1:
+            raise CommandError("--batch-size and --concurrency must be positive")
         
         self.stdout.write("🔄 Starting bulk synchronization...")
         
-        questions = BlockchainQuestion.objects.filter(
-            use_blockchain=True,
-            is_blockchain_synced=False
-        )
-        
-        if not questions.exists():
+        question_ids = pending_question_ids()
+        if not question_ids:
             self.stdout.write(
                 self.style.SUCCESS("✅ All questions are already synced")
             )
             return
         
-        success_count = 0
-        error_count = 0
+        stats = sync_pending_questions(
+            question_ids,
+            batch_size=batch_size,
+            concurrency=concurrency,
+            on_progress=self._write_progress
+        )
+        self.stdout.write("")
         
-        for question in questions:
-            try:
-                self.stdout.write(f"  Syncing: {question.question_text[:50]}...")
-                result = question.create_on_blockchain()
-                
-                if result.get('success'):
-                    success_count += 1
-                    if self.verbosity > 1:
-                        tx_hash = result.get('transaction_hash', 'N/A')
-                        self.stdout.write(f"    ✅ Success: {tx_hash}")
-                else:
-                    error_count += 1
-                    error_msg = result.get('error', 'Unknown error')
-                    self.stdout.write(
-                        self.style.ERROR(f"    ❌ Failed: {error_msg}")
-                    )
-                    
-            except Exception as e:
-                error_count += 1
-                self.stdout.write(
-                    self.style.ERROR(f"    ❌ Exception: {str(e)}")
-                )
+        for question_id, error_msg in stats["errors"].items():
+            self.stdout.write(
+                self.style.ERROR(f"    ❌ Q{question_id} failed: {error_msg}")
+            )
         
         # Summary
         self.stdout.write(f"\n=== Sync Summary ===")
-        self.stdout.write(f"✅ Success: {success_count}")
-        self.stdout.write(f"❌ Errors: {error_count}")
+        self.stdout.write(f"✅ Success: {stats['synced']}")
+        if stats["resumed"]:
+            self.stdout.write(f"↩️  Resumed in-flight transactions: {stats['resumed']}")
+        self.stdout.write(f"❌ Errors: {stats['failed']}")
         
-        if success_count > 0:
+        if stats["synced"] > 0:
             self.stdout.write(
-                self.style.SUCCESS(f"🎉 Successfully synced {success_count} questions")
+                self.style.SUCCESS(f"🎉 Successfully synced {stats['synced']} questions")
             )
     
+    def _write_progress(self, stats):
+        done = stats["synced"] + stats["failed"]
+        self.stdout.write(
+            f"\r  ⏳ {done}/{stats['total']} done · {stats['synced']} synced · "
+            f"{stats['failed']} failed · {stats['in_flight']} in flight",
+            ending=''
+        )
+        self.stdout.flush()
+    
     def sync_single_question(self, question_id):
         """Sync a single question by ID"""
         try:
@@ -270,20 +299,14 @@ class Command(BaseCommand):
         
         self.stdout.write("🔄 Resetting sync status...")
         
-        updated = BlockchainQuestion.objects.filter(
-            is_blockchain_synced=True
-        ).update(
-            is_blockchain_synced=False,
-            blockchain_id=None,
-            blockchain_tx_hash='',
-            blockchain_created_at=None
-        )
-        
-        # Also clear blockchain votes
-        deleted_votes = BlockchainVote.objects.all().delete()[0]
+        # Chunked: never one statement over the whole votes table
+        stats = reset_sync_state()
+        updated = stats['questions']
+        deleted_votes = stats['votes']
         
         self.stdout.write(f"✅ Reset {updated} questions")
         self.stdout.write(f"✅ Deleted {deleted_votes} blockchain votes")
+        self.stdout.write(f"✅ Deleted {stats['archives']} vote archives and the sync checkpoint")
         self.stdout.write(
             self.style.SUCCESS("🎉 Sync status reset complete")
         )
\ No newline at end of file
@@ -0,0 +1,68 @@
+"""
+Django Management Command to bulk import questions from CSV or JSONL
+
+Questions and choices are inserted in batches of multi-row INSERTs, one
+transaction per batch. Blockchain questions are not written on chain here:
+run ``blockchain_sync sync_all`` afterwards, or pass ``--queue`` so the
+``process_outbox`` worker creates them.
+
+Usage:
+    python manage.py import_questions questions.csv
+    python manage.py import_questions questions.jsonl --blockchain --queue
+    python manage.py import_questions export.txt --format jsonl --batch-size 5000
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from polls.blockchain.bulk import IMPORT_BATCH_SIZE, import_questions, read_import_file
+
+
+class Command(BaseCommand):
+    help = 'Bulk import questions and choices from a CSV or JSONL file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV (question_text, choices separated by |) or JSONL file')
+        parser.add_argument('--format', choices=['csv', 'jsonl'],
+                            help='File format (default: from the file extension)')
+        parser.add_argument('--blockchain', action='store_true',
+                            help='Import as blockchain questions pending chain creation')
+        parser.add_argument('--queue', action='store_true',
+                            help='With --blockchain: queue chain creation in the outbox')
+        parser.add_argument('--batch-size', type=int, default=IMPORT_BATCH_SIZE,
+                            help='Questions inserted per transaction')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be positive")
+        if options['queue'] and not options['blockchain']:
+            raise CommandError("--queue requires --blockchain")
+
+        try:
+            rows = read_import_file(options['path'], options['format'])
+            stats = import_questions(
+                rows,
+                blockchain=options['blockchain'],
+                queue=options['queue'],
+                batch_size=options['batch_size'],
+                on_progress=self._write_progress,
+            )
+        except OSError as e:
+            raise CommandError(f"Cannot read {options['path']}: {e}")
+        except UnicodeDecodeError as e:
+            raise CommandError(f"{options['path']} is not UTF-8: {e}")
+        self.stdout.write("")
+
+        for line, error in stats["errors"].items():
+            self.stdout.write(self.style.WARNING(f"    ⚠️  Line {line} skipped: {error}"))
+
+        self.stdout.write(f"✅ Imported {stats['imported']} questions with {stats['choices']} choices")
+        if stats["skipped"]:
+            self.stdout.write(f"⚠️  Skipped: {stats['skipped']}")
+        if options['blockchain'] and stats["imported"]:
+            follow_up = ("queued in the outbox" if options['queue']
+                         else "pending; run `blockchain_sync sync_all`")
+            self.stdout.write(f"🔗 Chain creation {follow_up}")
+
+    def _write_progress(self, stats):
+        self.stdout.write(f"\r  ⏳ {stats['imported']} imported · {stats['skipped']} skipped", ending='')
+        self.stdout.flush()
@@ -0,0 +1,99 @@
+"""
+Django Management Command to load-test the vote and results endpoints
+
+Creates a few synced questions, drives a weighted mix of votes and result
+reads from concurrent clients (see ``polls.loadtest``) and reports
+throughput, p50/p95/p99 latency per endpoint, the error rate and whether
+every accepted vote was recorded. Works with the mock blockchain.
+
+Usage:
+    python manage.py loadtest
+    python manage.py loadtest --clients 32 --requests 10000 --mix vote=2,results=3,web3_results=3
+    python manage.py loadtest --url http://127.0.0.1:8000 --duration 60 --json
+
+With ``--url`` the server must use this checkout's database (e.g. a local
+``runserver``). Exits with an error if any accepted vote was lost.
+"""
+
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from polls.loadtest import DEFAULT_MIX, HTTPTransport, WSGITransport, parse_mix, run_load_test
+
+
+class Command(BaseCommand):
+    help = 'Load-test vote and results endpoints with concurrent clients'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', help='Base URL of a running server (default: the in-process WSGI app)')
+        parser.add_argument('--clients', type=int, default=8, help='Concurrent clients')
+        parser.add_argument('--requests', type=int, default=2000, help='Total requests')
+        parser.add_argument('--duration', type=float, help='Stop after this many seconds')
+        parser.add_argument('--mix', default=','.join(f'{k}={v}' for k, v in DEFAULT_MIX.items()),
+                            help='Endpoint weights, e.g. vote=1,hybrid_vote=1,results=4,web3_results=4')
+        parser.add_argument('--questions', type=int, default=5, help='Questions to spread the load over')
+        parser.add_argument('--choices', type=int, default=4, help='Choices per question')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the request plan')
+        parser.add_argument('--keep', action='store_true', help='Keep the test questions afterwards')
+        parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options['mix'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        if min(options['clients'], options['requests'], options['questions'], options['choices']) < 1:
+            raise CommandError("--clients, --requests, --questions and --choices must be positive")
+
+        transport = HTTPTransport(options['url']) if options['url'] else WSGITransport()
+        if not options['json']:
+            self.stdout.write(
+                f"🚀 {options['requests']} requests, {options['clients']} clients against {transport.target}..."
+            )
+        report = run_load_test(
+            transport,
+            mix=mix,
+            clients=options['clients'],
+            requests=options['requests'],
+            duration=options['duration'],
+            questions=options['questions'],
+            choices=options['choices'],
+            seed=options['seed'],
+            keep=options['keep'],
+            on_progress=None if options['json'] else self._write_progress,
+        )
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self._write_report(report)
+
+        if report['votes']['lost']:
+            raise CommandError(f"{report['votes']['lost']} accepted votes were not recorded")
+
+    def _write_progress(self, done):
+        self.stdout.write(f"\r  ⏳ {done} requests", ending='')
+        self.stdout.flush()
+
+    def _write_report(self, report):
+        self.stdout.write("")
+        self.stdout.write(
+            f"{'endpoint':<14} {'requests':>9} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+        )
+        for name, stats in report['endpoints'].items():
+            self.stdout.write(
+                f"{name:<14} {stats['samples']:>9} {stats['errors']:>7} {stats['p50_ms']:>8.2f} "
+                f"{stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f} {stats['max_ms']:>8.2f}"
+            )
+
+        votes = report['votes']
+        self.stdout.write(f"\n=== Load Test Summary ===")
+        self.stdout.write(f"⚡ Throughput: {report['throughput']:.1f} req/s over {report['seconds']:.1f} s")
+        self.stdout.write(f"❌ Error rate: {report['error_rate']:.2%} ({report['errors']}/{report['requests']})")
+        self.stdout.write(f"🗳️  Votes accepted: {votes['accepted']}, recorded: {votes['recorded']}")
+        if votes['lost']:
+            for question_id, lost in votes['lost_by_question'].items():
+                self.stdout.write(self.style.ERROR(f"  Q{question_id}: {lost} votes lost"))
+        else:
+            self.stdout.write(self.style.SUCCESS("✅ No lost votes"))
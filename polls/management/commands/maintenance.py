@@ -0,0 +1,97 @@
+"""
+Django Management Command for chunked maintenance deletes
+
+Large deletes run in bounded chunks, each committed on its own, so the
+database stays responsive and an interrupted run can simply be repeated.
+
+Usage:
+    python manage.py maintenance reset_sync --force
+    python manage.py maintenance purge_question --question-id 12
+    python manage.py maintenance purge_votes --question-id 12 --from-block 100 --to-block 200
+    python manage.py maintenance purge_votes --to-block 5000000 --chunk-size 2000 --sleep 0.5
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from polls.blockchain.maintenance import (
+    MAINTENANCE_CHUNK_SIZE,
+    purge_question,
+    purge_votes,
+    reset_sync_state,
+)
+from polls.models import Question
+
+
+class Command(BaseCommand):
+    help = 'Run large maintenance deletes in resumable, throttled chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=['reset_sync', 'purge_question', 'purge_votes'],
+                            help='Operation to run')
+        parser.add_argument('--question-id', type=int, help='Question to purge (or whose votes to purge)')
+        parser.add_argument('--from-block', type=int, help='purge_votes: first block (inclusive)')
+        parser.add_argument('--to-block', type=int, help='purge_votes: last block (inclusive)')
+        parser.add_argument('--chunk-size', type=int, default=MAINTENANCE_CHUNK_SIZE,
+                            help='Rows deleted per transaction')
+        parser.add_argument('--sleep', type=float, default=0,
+                            help='Seconds to pause between chunks')
+        parser.add_argument('--force', action='store_true', help='Do not ask for confirmation')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError("--chunk-size must be positive")
+        if options['sleep'] < 0:
+            raise CommandError("--sleep cannot be negative")
+
+        action = options['action']
+        question_id = options['question_id']
+        chunking = {'chunk_size': options['chunk_size'], 'pause': options['sleep'],
+                    'on_progress': self._write_progress}
+
+        if action == 'purge_question':
+            if question_id is None:
+                raise CommandError("--question-id is required for purge_question")
+            if not Question.objects.filter(pk=question_id).exists():
+                raise CommandError(f"Question {question_id} not found")
+            if not self._confirm(f"This will delete question {question_id} and all its votes.", options):
+                return
+            stats = purge_question(question_id, **chunking)
+            self.stdout.write("")
+            self.stdout.write(f"✅ Deleted {stats['votes']} votes and {stats['outbox']} outbox entries")
+            self.stdout.write(self.style.SUCCESS(f"🎉 Question {question_id} purged"))
+
+        elif action == 'purge_votes':
+            scope = ', '.join(
+                f"{name} {options[key]}" for name, key in
+                [('question', 'question_id'), ('from block', 'from_block'), ('to block', 'to_block')]
+                if options[key] is not None
+            ) or 'ALL votes'
+            if not self._confirm(f"This will delete blockchain votes ({scope}).", options):
+                return
+            deleted = purge_votes(question_id=question_id, from_block=options['from_block'],
+                                  to_block=options['to_block'], **chunking)
+            self.stdout.write("")
+            self.stdout.write(self.style.SUCCESS(f"✅ Deleted {deleted} blockchain votes"))
+
+        else:
+            if not self._confirm("This will reset sync status for ALL blockchain questions.", options):
+                return
+            stats = reset_sync_state(**chunking)
+            self.stdout.write("")
+            self.stdout.write(f"✅ Reset {stats['questions']} questions")
+            self.stdout.write(f"✅ Deleted {stats['votes']} blockchain votes")
+            self.stdout.write(f"✅ Deleted {stats['archives']} vote archives and the sync checkpoint")
+            self.stdout.write(self.style.SUCCESS("🎉 Sync status reset complete"))
+
+    def _confirm(self, message, options):
+        if options['force']:
+            return True
+        response = input(f"⚠️  {message} Are you sure? [y/N]: ")
+        if response.lower() in ['y', 'yes']:
+            return True
+        self.stdout.write("Operation cancelled.")
+        return False
+
+    def _write_progress(self, label, count):
+        self.stdout.write(f"\r  ⏳ {count} {label} done", ending='')
+        self.stdout.flush()
@@ -0,0 +1,79 @@
+"""
+Django Management Command to drain the blockchain outbox
+
+Question creations are recorded as outbox entries in the same transaction as
+the question. This worker sends them to the blockchain with bounded
+concurrency and retries, then updates ``blockchain_id``/``blockchain_tx_hash``.
+
+Usage:
+    python manage.py process_outbox
+    python manage.py process_outbox --loop --interval 5
+    python manage.py process_outbox --concurrency 8 --batch-size 100
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from polls.blockchain.models import BlockchainOutbox
+from polls.blockchain.outbox import drain_outbox, pending_count
+
+
+class Command(BaseCommand):
+    help = 'Send queued question creations to the blockchain'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50, help='Entries claimed per batch')
+        parser.add_argument('--concurrency', type=int, default=4, help='Maximum chain writes in flight')
+        parser.add_argument('--max-attempts', type=int, default=5, help='Attempts before an entry is marked failed')
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new entries')
+        parser.add_argument('--interval', type=float, default=5.0, help='Seconds between polls with --loop')
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Process even if blockchain is not connected (mock mode)'
+        )
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1 or options['concurrency'] < 1:
+            raise CommandError("--batch-size and --concurrency must be positive")
+
+        self.stdout.write(f"📬 Pending outbox entries: {pending_count()}")
+
+        try:
+            while True:
+                counts = drain_outbox(
+                    batch_size=options['batch_size'],
+                    concurrency=options['concurrency'],
+                    max_attempts=options['max_attempts'],
+                    force=options['force'],
+                    on_result=self.report,
+                )
+
+                if counts['claimed']:
+                    self.stdout.write(
+                        f"Batch: {counts[BlockchainOutbox.STATUS_DONE]} done, "
+                        f"{counts[BlockchainOutbox.STATUS_PENDING]} retrying, "
+                        f"{counts[BlockchainOutbox.STATUS_FAILED]} failed"
+                    )
+
+                # Drain continuously while there is work; otherwise wait or stop
+                if counts['claimed'] == options['batch_size']:
+                    continue
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write("Interrupted; unfinished entries stay queued")
+
+        self.stdout.write(self.style.SUCCESS(f"✅ Outbox drained. Still pending: {pending_count()}"))
+
+    def report(self, outcome):
+        status = outcome.get('status')
+        label = f"Q{outcome.get('question_id')} (entry {outcome.get('entry_id')})"
+        if status == BlockchainOutbox.STATUS_DONE:
+            self.stdout.write(f"  ✅ {label}: {outcome.get('transaction_hash') or 'synced'}")
+        elif status == BlockchainOutbox.STATUS_FAILED:
+            self.stdout.write(self.style.ERROR(f"  ❌ {label}: {outcome.get('error')}"))
+        else:
+            self.stdout.write(self.style.WARNING(f"  ⏳ {label}: {outcome.get('error')} (will retry)"))
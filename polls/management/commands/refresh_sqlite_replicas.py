@@ -0,0 +1,60 @@
+"""
+Django Management Command to refresh local SQLite read replicas
+
+Copies the primary SQLite database into every alias listed in
+``settings.DATABASE_REPLICAS`` using SQLite's online backup API, so replica
+routing can be exercised on a single machine.
+
+Usage:
+    DATABASE_REPLICA_PATHS=/tmp/replica1.sqlite3 python manage.py refresh_sqlite_replicas
+    python manage.py refresh_sqlite_replicas --loop --interval 2
+"""
+
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = 'Copy the primary SQLite database into the configured replicas'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep refreshing replicas')
+        parser.add_argument('--interval', type=float, default=2.0, help='Seconds between refreshes with --loop')
+
+    def handle(self, *args, **options):
+        primary = settings.DATABASES[DEFAULT_DB_ALIAS]
+        replicas = list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+        if not replicas:
+            raise CommandError("No replicas configured (set DATABASE_REPLICA_PATHS)")
+        for alias in [DEFAULT_DB_ALIAS, *replicas]:
+            if connections[alias].vendor != 'sqlite':
+                raise CommandError(f"'{alias}' is not a SQLite database; use native replication")
+
+        try:
+            while True:
+                for alias in replicas:
+                    self.copy_database(primary['NAME'], settings.DATABASES[alias]['NAME'])
+                    self.stdout.write(f"🔁 {alias} refreshed from primary")
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write("Interrupted")
+
+        self.stdout.write(self.style.SUCCESS("✅ Replicas up to date"))
+
+    @staticmethod
+    def copy_database(source_path, target_path):
+        """Consistent snapshot of the primary, even while it is being written"""
+        source = sqlite3.connect(str(source_path))
+        target = sqlite3.connect(str(target_path))
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
@@ -1,13 +1,18 @@
+import time
+
 from django.core.management.base import BaseCommand
 from polls.adapters.repositories import DjangoVoteRepository, DjangoQuestionRepository
 from polls.adapters.blockchain import Web3BlockchainGateway
+from polls.blockchain.checkpoint import next_from_block, record_sync_run, skipped_block_to_hold
 from core.use_cases.sync import SyncVotesUseCase
+from polls.routing import primary_only
 
 class Command(BaseCommand):
     help = 'Reconciles votes from blockchain to local database'
 
     def add_arguments(self, parser):
-        parser.add_argument('--from-block', type=int, default=0, help='Block number to start syncing from')
+        parser.add_argument('--from-block', type=int, default=None,
+                            help='Block number to start syncing from (default: after the last checkpoint)')
 
     def handle(self, *args, **options):
         vote_repo = DjangoVoteRepository()
@@ -18,9 +23,32 @@ class Command(BaseCommand):
 
         from_block = options['from_block']
 
-        self.stdout.write(f"Starting sync from block {from_block}...")
         try:
-            count = use_case.execute(from_block=from_block)
-            self.stdout.write(self.style.SUCCESS(f'Successfully synced {count} votes'))
+            # The sync engine must never read lagging replica data
+            with primary_only():
+                if from_block is None:
+                    from_block = next_from_block()
+                self.stdout.write(f"Starting sync from block {from_block}...")
+                # Read before fetching: every event up to this head is ingested below
+                head = gateway.get_current_block_number()
+                started = time.monotonic()
+                count = use_case.execute(from_block=from_block)
+                held_block = skipped_block_to_hold(use_case.first_skipped_block)
+                checkpoint = record_sync_run(
+                    head, count, time.monotonic() - started, first_skipped_block=held_block
+                )
+            if held_block is not None:
+                self.stdout.write(self.style.WARNING(
+                    f'Votes for questions not mirrored locally yet from block '
+                    f'{held_block}; the next run reads them again'
+                ))
+            elif use_case.first_skipped_block is not None:
+                self.stdout.write(self.style.WARNING(
+                    f'Skipped votes for unknown questions from block '
+                    f'{use_case.first_skipped_block}; no local question awaits its blockchain id'
+                ))
+            self.stdout.write(self.style.SUCCESS(
+                f'Successfully synced {count} votes (checkpoint at block {checkpoint.last_block})'
+            ))
         except Exception as e:
             self.stdout.write(self.style.ERROR(f'Error syncing votes: {e}'))
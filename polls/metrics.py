@@ -0,0 +1,335 @@
+"""
+In-process metrics in the Prometheus text exposition format
+
+Counters, gauges and histograms live in memory and are updated on the hot
+paths (vote ingestion, RPC calls, view queries, caches). Values that live in
+the database are read at scrape time from maintained rows: the sync
+checkpoint is one primary-key lookup and the outbox depth a capped count
+over its status index, cached for a few seconds. No scrape runs a full-table
+``COUNT(*)`` or talks to the node.
+
+``/metrics`` serves ``REGISTRY.render()``; set ``METRICS_TOKEN`` to require
+``Authorization: Bearer <token>``.
+"""
+
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextlib import ExitStack, contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils import timezone
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Scrape-time database reads are reused for this long
+SCRAPE_CACHE_SECONDS = 15
+OUTBOX_DEPTH_CAP = 10000
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels: Iterable[Tuple[str, str]]) -> str:
+    pairs = ','.join(f'{name}="{_escape(value)}"' for name, value in labels)
+    return '{' + pairs + '}' if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric(ABC):
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], object] = {}
+
+    def labels(self, **labels):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        with self._lock:
+            child = self._children.get(key)
+            if child is None:
+                child = self._children[key] = self._new_child()
+        return child
+
+    def _default(self):
+        return self.labels() if not self.labelnames else None
+
+    @abstractmethod
+    def _new_child(self):
+        """Fresh value holder for one label combination"""
+
+    def samples(self) -> List[Tuple[str, Tuple[Tuple[str, str], ...], float]]:
+        with self._lock:
+            children = list(self._children.items())
+        rows = []
+        for key, child in children:
+            labels = tuple(zip(self.labelnames, key))
+            rows.extend(child.samples(self.name, labels))
+        return rows
+
+    def clear(self):
+        with self._lock:
+            self._children.clear()
+
+
+class _Value:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1):
+        with self._lock:
+            self.value += amount
+
+    def set(self, value: float):
+        with self._lock:
+            self.value = float(value)
+
+    def samples(self, name, labels):
+        return [(name, labels, self.value)]
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def _new_child(self):
+        return _Value()
+
+    def inc(self, amount: float = 1):
+        self._default().inc(amount)
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _Value()
+
+    def set(self, value: float):
+        self._default().set(value)
+
+
+class _HistogramValue:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            if index < len(self.counts):
+                self.counts[index] += 1
+            self.total += value
+            self.count += 1
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+    def samples(self, name, labels):
+        with self._lock:
+            counts, total, count = list(self.counts), self.total, self.count
+        rows, cumulative = [], 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            rows.append((f'{name}_bucket', labels + (('le', _format_value(bound)),), cumulative))
+        rows.append((f'{name}_bucket', labels + (('le', '+Inf'),), count))
+        rows.append((f'{name}_sum', labels, total))
+        rows.append((f'{name}_count', labels, count))
+        return rows
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, value: float):
+        self._default().observe(value)
+
+    def time(self):
+        return self._default().time()
+
+
+class Registry:
+    """Metrics of this process plus collectors that refresh gauges at scrape time"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            self._metrics.setdefault(metric.name, metric)
+            return self._metrics[metric.name]
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], None]) -> Callable[[], None]:
+        self._collectors.append(collector)
+        return collector
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            collector()
+        lines = []
+        for metric in sorted(self._metrics.values(), key=lambda m: m.name):
+            lines.append(f'# HELP {metric.name} {_escape(metric.documentation)}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{_format_labels(labels)} {_format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+VOTES_INGESTED = REGISTRY.counter(
+    'polls_votes_ingested_total', 'Blockchain votes inserted by this process')
+RPC_LATENCY = REGISTRY.histogram(
+    'polls_rpc_duration_seconds', 'Blockchain JSON-RPC latency', ['method'])
+VIEW_DB_TIME = REGISTRY.histogram(
+    'polls_view_db_seconds', 'Database time spent per request', ['view'])
+CACHE_REQUESTS = REGISTRY.counter(
+    'polls_cache_requests_total', 'Cache lookups by cache and result', ['cache', 'result'])
+
+SYNC_CURSOR = REGISTRY.gauge(
+    'polls_sync_cursor_block', 'Last block covered by vote reconciliation')
+CHAIN_HEAD = REGISTRY.gauge(
+    'polls_chain_head_block', 'Chain head seen by the last reconciliation run')
+SYNC_LAG = REGISTRY.gauge(
+    'polls_sync_lag_blocks', 'Blocks between the chain head and the sync cursor')
+SYNC_AGE = REGISTRY.gauge(
+    'polls_sync_checkpoint_age_seconds', 'Seconds since the last reconciliation run')
+SYNC_TOTAL_VOTES = REGISTRY.gauge(
+    'polls_sync_votes_total', 'Votes ingested by all reconciliation runs')
+SYNC_RATE = REGISTRY.gauge(
+    'polls_sync_votes_per_second', 'Ingestion rate of the last reconciliation run')
+OUTBOX_DEPTH = REGISTRY.gauge(
+    'polls_outbox_pending', 'Outbox entries waiting to be sent (capped)')
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.labels(cache=cache, result='hit' if hit else 'miss').inc()
+
+
+# ----------------------------------------------------------------------
+# Scrape-time collectors
+# ----------------------------------------------------------------------
+
+_scrape_cache: Dict[str, Tuple[float, object]] = {}
+
+
+def _cached(key: str, loader: Callable[[], object]):
+    now = time.monotonic()
+    cached = _scrape_cache.get(key)
+    if cached and now - cached[0] < SCRAPE_CACHE_SECONDS:
+        return cached[1]
+    value = loader()
+    _scrape_cache[key] = (now, value)
+    return value
+
+
+@REGISTRY.register_collector
+def _collect_sync_checkpoint():
+    from polls.blockchain.checkpoint import get_checkpoint
+
+    checkpoint = _cached('checkpoint', get_checkpoint)
+    if checkpoint is None:
+        return
+    SYNC_CURSOR.set(checkpoint.last_block)
+    CHAIN_HEAD.set(checkpoint.head_block)
+    SYNC_LAG.set(max(checkpoint.head_block - checkpoint.last_block, 0))
+    SYNC_AGE.set((timezone.now() - checkpoint.updated_at).total_seconds())
+    SYNC_TOTAL_VOTES.set(checkpoint.votes_ingested)
+    if checkpoint.last_run_seconds:
+        SYNC_RATE.set(checkpoint.last_run_votes / checkpoint.last_run_seconds)
+
+
+@REGISTRY.register_collector
+def _collect_outbox_depth():
+    from polls.blockchain.models import BlockchainOutbox
+
+    OUTBOX_DEPTH.set(_cached('outbox', lambda: BlockchainOutbox.objects.filter(
+        status=BlockchainOutbox.STATUS_PENDING
+    ).order_by()[:OUTBOX_DEPTH_CAP].count()))
+
+
+@REGISTRY.register_collector
+def _collect_fee_cache():
+    from polls.blockchain.fees import fee_oracle
+
+    CACHE_REQUESTS.labels(cache='fees', result='hit').set(fee_oracle.hits)
+    CACHE_REQUESTS.labels(cache='fees', result='miss').set(fee_oracle.misses)
+
+
+# ----------------------------------------------------------------------
+# Request instrumentation and endpoint
+# ----------------------------------------------------------------------
+
+class QueryTimingMiddleware:
+    """Observe the database time of each request, labelled by view name"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        elapsed = [0.0]
+
+        def timed(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                elapsed[0] += time.perf_counter() - start
+
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timed))
+            response = self.get_response(request)
+
+        match = getattr(request, 'resolver_match', None)
+        if match is not None and match.view_name != 'metrics':
+            VIEW_DB_TIME.labels(view=match.view_name).observe(elapsed[0])
+        return response
+
+
+def metrics_view(request):
+    token: Optional[str] = getattr(settings, 'METRICS_TOKEN', '')
+    if token and request.headers.get('Authorization') != f'Bearer {token}':
+        return HttpResponseForbidden('Forbidden')
+    return HttpResponse(REGISTRY.render(), content_type=CONTENT_TYPE)
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:46
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('polls', '0003_blockchainvote_log_index_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlockchainOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=12)),
+                ('attempts', models.IntegerField(default=0)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now, help_text='Earliest time for the next attempt')),
+                ('last_error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('question', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='outbox_entries', to='polls.blockchainquestion')),
+            ],
+            options={
+                'verbose_name': 'Blockchain Outbox Entry',
+                'verbose_name_plural': 'Blockchain Outbox',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['status', 'next_attempt_at'], name='outbox_status_due_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('polls', '0004_blockchainoutbox'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlockchainAccountNonce',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('address', models.CharField(help_text='Sending account address', max_length=42, unique=True)),
+                ('next_nonce', models.BigIntegerField(help_text='Next nonce to hand out')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Blockchain Account Nonce',
+                'verbose_name_plural': 'Blockchain Account Nonces',
+            },
+        ),
+    ]
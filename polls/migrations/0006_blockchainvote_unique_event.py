@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:50
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def dedupe_vote_events(apps, schema_editor):
+    """Keep the oldest row of each (transaction_hash, log_index) pair"""
+    BlockchainVote = apps.get_model('polls', 'BlockchainVote')
+    db_alias = schema_editor.connection.alias
+    duplicates = (
+        BlockchainVote.objects.using(db_alias)
+        .values('transaction_hash', 'log_index')
+        .annotate(keep_id=Min('id'), rows=Count('id'))
+        .filter(rows__gt=1)
+    )
+    for group in duplicates.iterator():
+        BlockchainVote.objects.using(db_alias).filter(
+            transaction_hash=group['transaction_hash'],
+            log_index=group['log_index'],
+        ).exclude(pk=group['keep_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('polls', '0005_blockchainaccountnonce'),
+    ]
+
+    operations = [
+        migrations.RunPython(dedupe_vote_events, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='blockchainvote',
+            name='tx_log_index_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='blockchainvote',
+            constraint=models.UniqueConstraint(fields=('transaction_hash', 'log_index'), name='uniq_vote_event'),
+        ),
+    ]
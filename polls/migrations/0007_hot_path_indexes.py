@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:50
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def clear_duplicate_blockchain_ids(apps, schema_editor):
+    """
+    Keep blockchain_id on the oldest question of each duplicate group; the
+    others (mock-mode collisions) go back to pending sync.
+    """
+    BlockchainQuestion = apps.get_model('polls', 'BlockchainQuestion')
+    db_alias = schema_editor.connection.alias
+    duplicates = (
+        BlockchainQuestion.objects.using(db_alias)
+        .filter(blockchain_id__isnull=False)
+        .values('blockchain_id')
+        .annotate(rows=Count('pk'))
+        .filter(rows__gt=1)
+    )
+    for group in duplicates:
+        rows = BlockchainQuestion.objects.using(db_alias).filter(
+            blockchain_id=group['blockchain_id']
+        ).order_by('pk')
+        keep = rows.first()
+        rows.exclude(pk=keep.pk).update(blockchain_id=None, is_blockchain_synced=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('polls', '0006_blockchainvote_unique_event'),
+    ]
+
+    operations = [
+        migrations.RunPython(clear_duplicate_blockchain_ids, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='blockchainquestion',
+            name='blockchain_id',
+            field=models.IntegerField(blank=True, help_text='Question ID on blockchain', null=True, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='question',
+            name='pub_date',
+            field=models.DateTimeField(db_index=True, verbose_name='date published'),
+        ),
+        migrations.AddIndex(
+            model_name='blockchainquestion',
+            index=models.Index(condition=models.Q(('is_blockchain_synced', False), ('use_blockchain', True)), fields=['use_blockchain', 'is_blockchain_synced'], name='bq_sync_state_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blockchainvote',
+            index=models.Index(fields=['question', 'choice_index'], name='vote_question_choice_idx'),
+        ),
+    ]
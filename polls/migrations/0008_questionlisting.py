@@ -0,0 +1,66 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:52
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def backfill_question_listings(apps, schema_editor):
+    Question = apps.get_model('polls', 'Question')
+    BlockchainQuestion = apps.get_model('polls', 'BlockchainQuestion')
+    QuestionListing = apps.get_model('polls', 'QuestionListing')
+    db_alias = schema_editor.connection.alias
+
+    blockchain = {
+        bq.pk: bq for bq in BlockchainQuestion.objects.using(db_alias).only(
+            'use_blockchain', 'is_blockchain_synced', 'blockchain_id'
+        )
+    }
+    questions = Question.objects.using(db_alias).annotate(
+        n_choices=Count('choice'), n_votes=Sum('choice__votes')
+    ).order_by()
+
+    listings = []
+    for q in questions.iterator():
+        bq = blockchain.get(q.pk)
+        listings.append(QuestionListing(
+            id=q.pk,
+            question_type='blockchain' if bq else 'django',
+            question_text=q.question_text,
+            pub_date=q.pub_date,
+            use_blockchain=bq.use_blockchain if bq else False,
+            is_synced=bq.is_blockchain_synced if bq else False,
+            blockchain_id=bq.blockchain_id if bq else None,
+            choice_count=q.n_choices or 0,
+            total_votes=q.n_votes or 0,
+        ))
+    QuestionListing.objects.using(db_alias).bulk_create(listings, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('polls', '0007_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuestionListing',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('question_type', models.CharField(choices=[('django', 'Django'), ('blockchain', 'Blockchain')], default='django', max_length=10)),
+                ('question_text', models.CharField(max_length=200)),
+                ('pub_date', models.DateTimeField(verbose_name='date published')),
+                ('use_blockchain', models.BooleanField(default=False)),
+                ('is_synced', models.BooleanField(default=False)),
+                ('blockchain_id', models.IntegerField(blank=True, null=True)),
+                ('choice_count', models.IntegerField(default=0)),
+                ('total_votes', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-pub_date'],
+                'indexes': [models.Index(fields=['-pub_date'], name='listing_pub_date_idx'), models.Index(fields=['question_type', '-pub_date'], name='listing_type_pub_date_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_question_listings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-19 06:54
+
+from django.db import migrations, models
+
+
+BACKFILL_BATCH_SIZE = 1000
+
+
+def backfill_choice_ordinals(apps, schema_editor):
+    """Number existing choices per question in primary key order"""
+    Choice = apps.get_model('polls', 'Choice')
+    db_alias = schema_editor.connection.alias
+    current_question, position = None, 0
+    batch = []
+    rows = Choice.objects.using(db_alias).order_by('question_id', 'pk').values_list('pk', 'question_id')
+    for pk, question_id in list(rows):
+        if question_id != current_question:
+            current_question, position = question_id, 0
+        batch.append(Choice(pk=pk, ordinal=position))
+        position += 1
+        if len(batch) >= BACKFILL_BATCH_SIZE:
+            # One UPDATE per batch instead of one per row
+            Choice.objects.using(db_alias).bulk_update(batch, ['ordinal'])
+            batch = []
+    if batch:
+        Choice.objects.using(db_alias).bulk_update(batch, ['ordinal'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('polls', '0008_questionlisting'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='choice',
+            options={'ordering': ['ordinal', 'pk']},
+        ),
+        migrations.AddField(
+            model_name='choice',
+            name='ordinal',
+            field=models.PositiveIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_choice_ordinals, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='choice',
+            constraint=models.UniqueConstraint(fields=('question', 'ordinal'), name='uniq_choice_ordinal'),
+        ),
+    ]
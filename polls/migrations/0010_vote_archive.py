@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('polls', '0009_choice_ordinal'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blockchainquestion',
+            name='closed_at',
+            field=models.DateTimeField(blank=True, help_text='When voting closed (votes may then be archived)', null=True),
+        ),
+        migrations.CreateModel(
+            name='VoteArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(help_text='File path relative to VOTE_ARCHIVE_DIR', max_length=255)),
+                ('vote_count', models.IntegerField(default=0)),
+                ('tallies', models.JSONField(default=dict, help_text='Archived votes per choice index')),
+                ('last_block', models.BigIntegerField(blank=True, help_text='Highest archived block number', null=True)),
+                ('size_bytes', models.BigIntegerField(default=0, help_text='Committed file length; anything after it is discarded')),
+                ('archived_at', models.DateTimeField(auto_now=True)),
+                ('question', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='vote_archive', to='polls.blockchainquestion')),
+            ],
+            options={
+                'verbose_name': 'Vote Archive',
+                'verbose_name_plural': 'Vote Archives',
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('polls', '0010_vote_archive'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blockchainvote',
+            index=models.Index(fields=['-timestamp', '-id'], name='vote_timestamp_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blockchainvote',
+            index=models.Index(fields=['question', '-timestamp', '-id'], name='vote_question_ts_idx'),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-19 07:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('polls', '0012_blockchainjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SyncCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('last_block', models.BigIntegerField(default=-1, help_text='Last block fully synced (-1: none)')),
+                ('head_block', models.BigIntegerField(default=0, help_text='Chain head seen by the last run')),
+                ('votes_ingested', models.BigIntegerField(default=0, help_text='Votes inserted by all runs')),
+                ('last_run_votes', models.IntegerField(default=0)),
+                ('last_run_seconds', models.FloatField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Sync Checkpoint',
+                'verbose_name_plural': 'Sync Checkpoints',
+            },
+        ),
+    ]
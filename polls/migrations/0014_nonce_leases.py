@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 08:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('polls', '0013_sync_checkpoint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlockchainNonceLease',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('address', models.CharField(help_text='Sending account address', max_length=42)),
+                ('nonce', models.BigIntegerField()),
+                ('status', models.CharField(choices=[('leased', 'Leased'), ('released', 'Released')], default='leased', max_length=10)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Blockchain Nonce Lease',
+                'verbose_name_plural': 'Blockchain Nonce Leases',
+                'constraints': [models.UniqueConstraint(fields=('address', 'nonce'), name='uniq_nonce_lease')],
+            },
+        ),
+    ]
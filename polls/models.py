@@ -1,10 +1,12 @@
-from django.db import models
+from django.db import models, router, transaction
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
 from django.utils import timezone
 import datetime
 
 class Question(models.Model):
     question_text = models.CharField(max_length=200)
-    pub_date = models.DateTimeField('date published')
+    pub_date = models.DateTimeField('date published', db_index=True)
     
     def __str__(self):
         return self.question_text
@@ -17,6 +19,115 @@ class Choice(models.Model):
     question = models.ForeignKey(Question, on_delete=models.CASCADE)
     choice_text = models.CharField(max_length=200)
     votes = models.IntegerField(default=0)
+    # Position within the question; equals the on-chain choice index
+    ordinal = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    
+    class Meta:
+        ordering = ['ordinal', 'pk']
+        constraints = [
+            # Also serves (question, ordinal) lookups and ordered choice_set reads
+            models.UniqueConstraint(fields=['question', 'ordinal'], name='uniq_choice_ordinal'),
+        ]
     
     def __str__(self):
         return self.choice_text
+    
+    def save(self, *args, **kwargs):
+        if self.ordinal is not None or self.question_id is None:
+            super().save(*args, **kwargs)
+            return
+        # New choices are appended after the question's current last ordinal.
+        # The question row lock makes concurrent appends take turns.
+        using = kwargs.get('using') or router.db_for_write(Choice, instance=self)
+        with transaction.atomic(using=using):
+            _lock_question(self.question_id, using)
+            last = Choice.objects.using(using).filter(question_id=self.question_id).aggregate(
+                last=models.Max('ordinal')
+            )['last']
+            self.ordinal = 0 if last is None else last + 1
+            super().save(*args, **kwargs)
+
+    def add_vote(self):
+        """Count one vote in a single UPDATE, so concurrent votes are never lost"""
+        using = router.db_for_write(Choice, instance=self)
+        with transaction.atomic(using=using):
+            self.votes = models.F('votes') + 1
+            # Votes-only saves skip the listing signal; bump its total the same way
+            self.save(using=using, update_fields=['votes'])
+            QuestionListing.objects.using(using).filter(pk=self.question_id).update(
+                total_votes=models.F('total_votes') + 1
+            )
+        self.refresh_from_db(fields=['votes'])
+
+
+def _lock_question(question_id, using=None):
+    """Lock a question row for the rest of the transaction (serialises ordinal changes)"""
+    list(Question.objects.using(using).select_for_update().filter(pk=question_id).values_list('pk'))
+
+
+def renumber_choice_ordinals(question_id, using=None):
+    """
+    Make a question's ordinals dense (0..n-1), keeping their current order
+    
+    Runs whenever a choice is deleted, so the choices written on-chain (where
+    the index is the position in the submitted list) never have gaps.
+    """
+    changed = 0
+    with transaction.atomic(using=using):
+        _lock_question(question_id, using)
+        choices = Choice.objects.using(using).filter(question_id=question_id).order_by(
+            models.F('ordinal').asc(nulls_last=True), 'pk'
+        ).values_list('pk', 'ordinal')
+        # Ascending order never moves a row onto an ordinal still held by another
+        for position, (pk, ordinal) in enumerate(list(choices)):
+            if ordinal != position:
+                Choice.objects.using(using).filter(pk=pk).update(ordinal=position)
+                changed += 1
+    return changed
+
+
+@receiver(post_delete, sender=Choice)
+def close_ordinal_gap(sender, instance, using=None, **kwargs):
+    if instance.question_id:
+        renumber_choice_ordinals(instance.question_id, using=using)
+
+
+class QuestionListing(models.Model):
+    """
+    Flat read model with one row per question (Django or blockchain)
+    
+    Listing and search pages read only this table instead of joining the
+    multi-table-inheritance pair. Rows are maintained by ``polls.listing``.
+    """
+    TYPE_DJANGO = 'django'
+    TYPE_BLOCKCHAIN = 'blockchain'
+    TYPE_CHOICES = [
+        (TYPE_DJANGO, 'Django'),
+        (TYPE_BLOCKCHAIN, 'Blockchain'),
+    ]
+    
+    # Same value as the question's primary key; no FK so reads never join
+    id = models.BigIntegerField(primary_key=True)
+    question_type = models.CharField(max_length=10, choices=TYPE_CHOICES, default=TYPE_DJANGO)
+    question_text = models.CharField(max_length=200)
+    pub_date = models.DateTimeField('date published')
+    use_blockchain = models.BooleanField(default=False)
+    is_synced = models.BooleanField(default=False)
+    blockchain_id = models.IntegerField(null=True, blank=True)
+    choice_count = models.IntegerField(default=0)
+    total_votes = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['-pub_date']
+        indexes = [
+            models.Index(fields=['-pub_date'], name='listing_pub_date_idx'),
+            models.Index(fields=['question_type', '-pub_date'], name='listing_type_pub_date_idx'),
+        ]
+    
+    def __str__(self):
+        return self.question_text
+    
+    @property
+    def is_blockchain(self):
+        return self.question_type == self.TYPE_BLOCKCHAIN
@@ -0,0 +1,117 @@
+"""
+Pagination helpers for large tables
+
+``EstimatedCountPaginator`` counts exactly only up to a threshold and falls
+back to a catalogue estimate above it, so a page never costs a full
+``COUNT(*)``. Keyset cursors page through ``(timestamp, id)`` ordered
+listings with an index seek instead of an ever-growing OFFSET.
+"""
+
+from datetime import datetime
+from typing import Optional, Tuple
+import base64
+
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max, Q
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+
+COUNT_THRESHOLD = 10000
+
+
+def estimate_table_rows(model, using: str) -> Optional[int]:
+    """Approximate row count from the database catalogue (no table scan)"""
+    connection = connections[using]
+    table = model._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute("SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass", [table])
+        elif connection.vendor == 'mysql':
+            cursor.execute(
+                "SELECT table_rows FROM information_schema.tables "
+                "WHERE table_schema = DATABASE() AND table_name = %s", [table]
+            )
+        else:
+            # SQLite keeps no statistics; the highest id is an O(1) upper bound
+            return model._default_manager.using(using).aggregate(top=Max('pk'))['top']
+        row = cursor.fetchone()
+    return int(row[0]) if row and row[0] is not None and row[0] >= 0 else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator whose ``count`` is exact up to ``threshold`` rows
+
+    Above it, unfiltered querysets report the catalogue estimate and
+    filtered ones report ``threshold + 1`` ("more than threshold").
+    """
+
+    threshold = COUNT_THRESHOLD
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, 'query'):
+            return super().count
+
+        # COUNT over a LIMITed subquery stops reading after threshold + 1 rows
+        capped = queryset.order_by()[:self.threshold + 1].count()
+        if capped <= self.threshold:
+            return capped
+        if not queryset.query.where:
+            estimate = estimate_table_rows(queryset.model, queryset.db)
+            if estimate:
+                return max(estimate, capped)
+        return capped
+
+
+# ----------------------------------------------------------------------
+# Keyset cursors over (timestamp, id), newest first
+# ----------------------------------------------------------------------
+
+def encode_cursor(timestamp: datetime, pk: int) -> str:
+    raw = f"{timestamp.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[datetime, int]]:
+    """Parse a cursor; None if it is malformed"""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        timestamp, pk = base64.urlsafe_b64decode(padded.encode()).decode().split('|')
+        parsed = parse_datetime(timestamp)
+        return (parsed, int(pk)) if parsed else None
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def keyset_filter(queryset, cursor: Optional[str], field: str = 'timestamp'):
+    """
+    Rows strictly after ``cursor`` in ``(-field, -id)`` order
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    if not cursor:
+        return queryset
+    position = decode_cursor(cursor)
+    if position is None:
+        raise ValueError("Invalid cursor")
+    timestamp, pk = position
+    return queryset.filter(Q(**{f'{field}__lt': timestamp}) | Q(**{field: timestamp, 'pk__lt': pk}))
+
+
+def keyset_page(queryset, cursor: Optional[str], limit: int, field: str = 'timestamp'):
+    """
+    One page of a ``(-field, -id)`` keyset listing
+
+    Returns:
+        Tuple[list, Optional[str]]: The rows and the cursor of the next page
+    """
+    rows = list(keyset_filter(queryset, cursor, field).order_by(f'-{field}', '-pk')[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(getattr(rows[-1], field), rows[-1].pk)
+    return rows, next_cursor
@@ -0,0 +1,145 @@
+"""
+Primary/Replica Database Routing
+
+Writes always go to ``default`` (the primary). Reads go to the primary too,
+unless code runs inside ``replica_reads()`` (or a ``read_only_view``), in
+which case they are spread over ``settings.DATABASE_REPLICAS``.
+
+``primary_only()`` overrides any replica context; the sync engine uses it so
+it never reads lagging data, and ``ReadYourWritesMiddleware`` uses it to pin
+a client to the primary for a short window after it writes (e.g. votes).
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+import random
+import time
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+ROUTE_PRIMARY = 'primary'
+ROUTE_REPLICA = 'replica'
+
+# Apps whose reads must see their own writes immediately (logins, sessions)
+PRIMARY_ONLY_APPS = {'admin', 'auth', 'contenttypes', 'sessions'}
+
+PIN_COOKIE_NAME = 'db_primary_until'
+
+_route: ContextVar = ContextVar('polls_db_route', default=None)
+
+
+def replica_aliases():
+    """Configured replica aliases"""
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+def replicas_configured() -> bool:
+    return bool(replica_aliases())
+
+
+@contextmanager
+def replica_reads():
+    """Route reads to a replica, unless an outer ``primary_only()`` is active"""
+    token = _route.set(ROUTE_PRIMARY if _route.get() == ROUTE_PRIMARY else ROUTE_REPLICA)
+    try:
+        yield
+    finally:
+        _route.reset(token)
+
+
+@contextmanager
+def primary_only():
+    """Route every read to the primary, including nested ``replica_reads()``"""
+    token = _route.set(ROUTE_PRIMARY)
+    try:
+        yield
+    finally:
+        _route.reset(token)
+
+
+def read_only_view(view_func):
+    """Decorator for views that only read; their queries go to replicas"""
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        with replica_reads():
+            return view_func(request, *args, **kwargs)
+    return wrapper
+
+
+class PrimaryReplicaRouter:
+    """
+    Database router sending opted-in reads to replicas
+    """
+
+    def __init__(self, replicas=None):
+        self._replicas = replicas
+
+    @property
+    def replicas(self):
+        return list(self._replicas) if self._replicas is not None else replica_aliases()
+
+    def db_for_read(self, model, **hints):
+        replicas = self.replicas
+        if not replicas or _route.get() != ROUTE_REPLICA:
+            return DEFAULT_DB_ALIAS
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold copies of the primary's rows
+        pool = {DEFAULT_DB_ALIAS, *self.replicas}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive schema changes from the primary, never directly
+        if db in self.replicas:
+            return False
+        return None
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pin a client to the primary for a while after it writes
+
+    Successful non-GET requests set a short-lived cookie; while it is valid,
+    the client's requests run inside ``primary_only()``, so e.g. the results
+    page right after voting never reads from a lagging replica.
+    """
+
+    SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replicas_configured():
+            return self.get_response(request)
+
+        if self.is_pinned(request):
+            with primary_only():
+                response = self.get_response(request)
+        else:
+            response = self.get_response(request)
+
+        if request.method not in self.SAFE_METHODS and response.status_code < 400:
+            window = getattr(settings, 'READ_YOUR_WRITES_SECONDS', 10)
+            response.set_cookie(
+                PIN_COOKIE_NAME, str(int(time.time() + window)),
+                max_age=window, httponly=True, samesite='Lax'
+            )
+        return response
+
+    @staticmethod
+    def is_pinned(request) -> bool:
+        try:
+            return float(request.COOKIES.get(PIN_COOKIE_NAME, 0)) > time.time()
+        except ValueError:
+            return False
@@ -2,15 +2,17 @@ from django.http import HttpResponse, HttpResponseRedirect
 from django.shortcuts import render, get_object_or_404
 from django.urls import reverse
 from django.contrib import messages
-from .models import Question, Choice
+from .models import Question, Choice, QuestionListing
+from .routing import read_only_view
 
 from django.conf import settings
 # Architecture imports
 from polls.adapters.repositories import DjangoQuestionRepository, DjangoVoteRepository
 from core.use_cases.voting import GetQuestionResultsUseCase
 
+@read_only_view
 def index(request):
-    latest_question_list = Question.objects.order_by('-pub_date')[:5]
+    latest_question_list = QuestionListing.objects.order_by('-pub_date')[:5]
     context = {'latest_question_list': latest_question_list}
     return render(request, 'polls/index.html', context)
 
@@ -18,17 +20,12 @@ def detail(request, question_id):
     question = get_object_or_404(Question, pk=question_id)
     return render(request, 'polls/detail.html', {'question': question})
 
+@read_only_view
 def results(request, question_id):
     question = get_object_or_404(Question, pk=question_id)
     choices = question.choice_set.all()
     total_votes = sum(choice.votes for choice in choices)
     
-    # Debug: imprimir información
-    print(f"DEBUG - Question ID: {question_id}")
-    print(f"DEBUG - Total votes: {total_votes}")
-    for choice in choices:
-        print(f"DEBUG - {choice.choice_text}: {choice.votes} votes")
-    
     # Calcular porcentajes
     choices_with_percentage = []
     for choice in choices:
@@ -59,8 +56,7 @@ def vote(request, question_id):
             'error_message': "No seleccionaste una opción válida.",
         })
     else:
-        selected_choice.votes += 1
-        selected_choice.save()
+        selected_choice.add_vote()
         messages.success(request, '¡Tu voto ha sido registrado correctamente!')
         # Always return an HttpResponseRedirect after successfully dealing
         # with POST data. This prevents data from being posted twice if a
@@ -69,6 +65,7 @@ def vote(request, question_id):
 
 # Web3 Views using Clean Architecture
 
+@read_only_view
 def web3_detail(request, question_id):
     repo = DjangoQuestionRepository()
     question_entity = repo.get_by_id(question_id)
@@ -83,6 +80,7 @@ def web3_detail(request, question_id):
         'contract_address': contract_address
     })
 
+@read_only_view
 def web3_results(request, question_id):
     question_repo = DjangoQuestionRepository()
     vote_repo = DjangoVoteRepository()